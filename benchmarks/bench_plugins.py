@@ -0,0 +1,98 @@
+"""插件与 EtcdMock 热路径的微基准（pytest-benchmark）。
+
+运行：make bench，或
+    python -m pytest benchmarks -o python_files='bench_*.py' --benchmark-only
+"""
+from benchmarks.workloads import make_workload
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.frag import Fragment
+from simulator.models.resource import NodeResource, PodResource, get_target_pod_list_from_pods
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.plugins.score.binpack import ScoreBinPack
+from simulator.plugins.score.drift import ScoreDrift
+import pytest
+
+NODES = 1000
+PODS = 2000
+
+@pytest.fixture(scope="module")
+def cluster():
+    """NODES 个节点、已绑定约一半 Pod 的集群，以及一个待调度的 GPU Pod"""
+    nodes, pods = make_workload(NODES, PODS)
+    e = EtcdMock()
+    e.add_nodes(nodes)
+    e.add_pods(pods)
+    for pod in pods[:PODS // 2]:
+        feasible = e.feasible_nodes(pod.name)
+        if feasible:
+            e.bind(pod.name, feasible[len(feasible) // 2].name, 0)
+    pending = next(p for p in pods[PODS // 2:] if p.num_gpu == 1 and e.feasible_nodes(p.name))
+    return e, pods, pending
+
+
+def test_etcd_bind_unbind(benchmark, cluster):
+    e, _, pod = cluster
+    node = e.feasible_nodes(pod.name)[0]
+
+    def bind_unbind():
+        e.bind(pod.name, node.name, 0)
+        e.unbind(pod.name)
+        # unbind 把 Pod 记为 Completed，恢复为待调度以便下一轮
+        e.completed_pods.discard(pod.name)
+        e.pending_pods.add(pod.name)
+
+    benchmark(bind_unbind)
+
+
+def test_etcd_check_bindable(benchmark, cluster):
+    e, _, pod = cluster
+    names = list(e.nodes)
+    benchmark(lambda: [e.check_bindable(pod.name, name) for name in names])
+
+
+@pytest.mark.parametrize("use_index", [True, False], ids=["index", "scan"])
+def test_filter_resource_fit(benchmark, cluster, use_index):
+    e, _, pod = cluster
+    plugin = FilterResourceFit(use_index=use_index)
+    assert benchmark(plugin.filter, pod, e)
+
+
+@pytest.mark.parametrize("name", ["k8s", "binpack", "drift"])
+def test_score_nodes(benchmark, cluster, name):
+    e, pods, pod = cluster
+    if name == "k8s":
+        plugin = ScoreKubernetes()
+    elif name == "binpack":
+        plugin = ScoreBinPack()
+    else:
+        # 关闭碎片缓存，测量真实的碎片计算开销
+        plugin = ScoreDrift(get_target_pod_list_from_pods(pods), frag_cache_size=0)
+    feasible = e.feasible_nodes(pod.name)
+    benchmark(plugin.score_nodes, pod, feasible, e)
+
+
+@pytest.mark.parametrize("name", ["k8s", "binpack", "drift"])
+def test_score_single_node(benchmark, cluster, name):
+    e, pods, pod = cluster
+    if name == "k8s":
+        plugin = ScoreKubernetes()
+    elif name == "binpack":
+        plugin = ScoreBinPack()
+    else:
+        plugin = ScoreDrift(get_target_pod_list_from_pods(pods), frag_cache_size=0)
+    node = e.feasible_nodes(pod.name)[0]
+    benchmark(plugin.score, pod, node, e)
+
+
+def test_fragment_amount(benchmark, cluster):
+    e, pods, pod = cluster
+    typical = get_target_pod_list_from_pods(pods)
+    node_res = NodeResource(e.feasible_nodes(pod.name)[0])
+    benchmark(lambda: Fragment(node_res, typical).get_frag_amount_sum_except_q3())
+
+
+def test_fragment_gpu_points(benchmark, cluster):
+    e, pods, pod = cluster
+    node_res = NodeResource(e.feasible_nodes(pod.name)[0])
+    benchmark(Fragment(node_res, get_target_pod_list_from_pods(pods)).get_gpu_frag_points_by_pod_res, PodResource(pod))
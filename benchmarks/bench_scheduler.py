@@ -0,0 +1,37 @@
+"""Scheduler.run 端到端基准：{10, 100, 1000} 节点 × {1k, 10k} Pod（pytest-benchmark）。
+
+每轮重新构造节点与 Pod（不计入耗时），只测量 run()。1k Pod 的用例跑 GATED_ROUNDS 轮，
+参与 make bench 的回归判定；10k Pod 的用例只跑一轮，单轮耗时受机器负载影响大，只作参考
+（extra_info["gate"] = False，compare 只报告不判定回归）。
+"""
+from benchmarks.workloads import make_workload
+from simulator.core.scheduler import Scheduler
+from simulator.models.resource import get_target_pod_list_from_pods
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.plugins.score.drift import ScoreDrift
+import pytest
+import random
+
+GATED_ROUNDS = 5
+
+@pytest.mark.parametrize("pods_count", [1000, 10000], ids=["1k", "10k"])
+@pytest.mark.parametrize("nodes_count", [10, 100, 1000])
+@pytest.mark.parametrize("score", ["k8s", "drift"])
+def test_scheduler_run(benchmark, score, nodes_count, pods_count):
+    def setup():
+        random.seed(0)
+        nodes, pods = make_workload(nodes_count, pods_count, allow_gpu_share=(score == "drift"))
+        if score == "drift":
+            plugin = ScoreDrift(get_target_pod_list_from_pods(pods))
+        else:
+            plugin = ScoreKubernetes()
+        scheduler = Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), plugin)
+        return (scheduler,), {}
+
+    gated = pods_count <= 1000
+    benchmark.extra_info["gate"] = gated
+    metrics = benchmark.pedantic(lambda s: s.run(report=False), setup=setup,
+                                 rounds=GATED_ROUNDS if gated else 1, iterations=1)
+    assert metrics.completed_pods == pods_count
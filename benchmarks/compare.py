@@ -0,0 +1,81 @@
+"""比较两份 pytest-benchmark JSON 结果，任一基准变慢超过阈值时以非零状态退出。
+当前结果中 extra_info["gate"] 为 False 的基准（单轮的宏观用例）只报告，不判定回归；
+绝对差值小于 --min-delta 秒的变化（微秒级基准的计时噪声）也不算回归。
+
+用法（在仓库根目录）：
+    python -m benchmarks.compare benchmarks/baseline.json bench.json --threshold 0.25
+    python -m benchmarks.compare --strip benchmarks/baseline.json   # 去掉逐轮原始数据，缩小基线文件
+"""
+from typing import Dict, List, Set, Tuple
+import argparse
+import json
+import sys
+
+def load_stats(path: str, stat: str) -> Dict[str, float]:
+    with open(path) as f:
+        data = json.load(f)
+    return {b["fullname"]: b["stats"][stat] for b in data["benchmarks"]}
+
+def load_ungated(path: str) -> Set[str]:
+    """只作参考、不参与回归判定的基准"""
+    with open(path) as f:
+        data = json.load(f)
+    return {b["fullname"] for b in data["benchmarks"] if b.get("extra_info", {}).get("gate") is False}
+
+def strip_raw_data(path: str) -> None:
+    with open(path) as f:
+        data = json.load(f)
+    for b in data["benchmarks"]:
+        b["stats"].pop("data", None)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+def compare(baseline: Dict[str, float], current: Dict[str, float], threshold: float,
+            ungated: Set[str] = frozenset(),
+            min_delta: float = 0.0) -> Tuple[List[Tuple[str, float, float, float]], List[str]]:
+    """返回 ([(名称, 基线, 当前, 相对变化)], 回归的基准名称)；ungated 中的基准与绝对差值
+    不超过 min_delta 秒的变化不判定回归"""
+    rows = []
+    regressions = []
+    for name in sorted(baseline.keys() & current.keys()):
+        change = current[name] / baseline[name] - 1 if baseline[name] > 0 else 0.0
+        rows.append((name, baseline[name], current[name], change))
+        if change > threshold and current[name] - baseline[name] > min_delta and name not in ungated:
+            regressions.append(name)
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+", help="baseline.json current.json；--strip 时为要处理的文件")
+    parser.add_argument("--strip", action="store_true", help="只去掉文件中的逐轮原始数据")
+    parser.add_argument("--threshold", type=float, default=0.25, help="允许的相对变慢比例")
+    parser.add_argument("--min-delta", type=float, default=0.0, help="判定回归所需的最小绝对差值（秒）")
+    parser.add_argument("--stat", choices=["min", "median", "mean"], default="median")
+    args = parser.parse_args()
+
+    if args.strip:
+        for path in args.files:
+            strip_raw_data(path)
+        return
+    if len(args.files) != 2:
+        parser.error("expected: baseline.json current.json")
+
+    baseline = load_stats(args.files[0], args.stat)
+    current = load_stats(args.files[1], args.stat)
+    ungated = load_ungated(args.files[1])
+    rows, regressions = compare(baseline, current, args.threshold, ungated, args.min_delta)
+    width = max((len(name) for name, *_ in rows), default=10)
+    print(f"{'benchmark':<{width}}  {'baseline(ms)':>13}{'current(ms)':>13}{'change':>9}")
+    for name, base, cur, change in rows:
+        flag = "  REGRESSION" if name in regressions else "  (info)" if name in ungated else ""
+        print(f"{name:<{width}}  {base*1e3:>13.3f}{cur*1e3:>13.3f}{change*100:>8.1f}%{flag}")
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f"missing in current: {name}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold*100:.0f}% ({args.stat})")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
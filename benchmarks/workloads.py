@@ -0,0 +1,33 @@
+"""benchmarks/bench_*.py 与基准脚本共用的负载构造。
+
+默认读取 data/H 下的 openb trace（Pod 数超过 trace 长度时循环复用并改名）；
+CSV 不存在或设置 BENCH_SOURCE=synthetic 时使用 simulator.utils.synthetic 生成的离线负载。
+"""
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.utils.reader import get_h_nodes, get_h_pods, h_nodes_csv_path, h_pods_csv_path
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+from typing import List, Tuple
+import os
+
+def workload_source() -> str:
+    source = os.environ.get("BENCH_SOURCE")
+    if source:
+        return source
+    if os.path.exists(h_nodes_csv_path) and os.path.exists(h_pods_csv_path):
+        return "openb"
+    return "synthetic"
+
+def make_workload(nodes_count: int, pods_count: int, allow_gpu_share: bool = True) -> Tuple[List[Node], List[Pod]]:
+    if workload_source() == "synthetic":
+        return (synthetic_nodes(nodes_count, allow_gpu_share), list(synthetic_pods(pods_count)))
+    nodes = get_h_nodes(count=nodes_count, allow_gpu_share=allow_gpu_share)
+    pods = get_h_pods(count=pods_count)
+    base = list(pods)
+    k = 1
+    while len(pods) < pods_count:
+        pods.extend(Pod(name=f"{p.name}-r{k}", cpu_milli=p.cpu_milli, memory_mib=p.memory_mib, num_gpu=p.num_gpu,
+                        gpu_milli=p.gpu_milli, creation_time=p.creation_time, duration=p.duration)
+                    for p in base[:pods_count - len(pods)])
+        k += 1
+    return nodes, pods
@@ -0,0 +1,96 @@
+from simulator.core.scheduler import Scheduler
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.plugins.interface import CycleState, QueueSortPlugin, FilterPlugin, ScorePlugin
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+import random
+
+class BatchScheduler(Scheduler):
+    """批量放置：一轮调度在 ClusterArrays 上一次处理整个 activeQ，不经过逐节点的插件调用、
+    CycleState 与缓存。
+
+    - 轮开始时用 filter 插件的向量化核（FilterPlugin.feasible_matrix）一次求出
+      activeQ 中所有等价类对所有节点的可行性矩阵；
+    - 之后按队列顺序逐个放置：可行节点取矩阵的一行，分数由 ScorePlugin.score_vector 计算，
+      平局用与 select_best 相同的随机数生成器在按节点加入顺序排列的候选中选取；
+    - bind 只改变一个节点，只对该节点重算矩阵的一列（所有等价类一次算完）。
+
+    矩阵的每一行在任意时刻都等于该等价类在当前集群状态下的 filter 结果，因此调度结果与
+    逐 Pod 的 Scheduler 逐位一致（相同的运行指纹）。filter 与 score 插件都提供向量化核
+    （vector_kernel=True）且没有开启节点采样时启用，否则回退到逐 Pod 路径；无可行节点时的 postFilter（抢占）仍逐 Pod 执行。
+    """
+
+    def __init__(self, nodes: List[Node], pods: Iterable[Pod], queue_sorter: QueueSortPlugin,
+                 filter_plugin: FilterPlugin, score_plugin: ScorePlugin, **kwargs):
+        kwargs["vectorized"] = True
+        super().__init__(nodes, pods, queue_sorter, filter_plugin, score_plugin, **kwargs)
+
+    @property
+    def batch_enabled(self) -> bool:
+        # 节点采样改变了每个 Pod 的候选节点，走逐 Pod 路径
+        return self.filter_plugin.vector_kernel and self.score_plugin.vector_kernel and self.node_sampler is None
+
+    def _try_schedule_loop(self) -> bool:
+        if not self.batch_enabled:
+            return super()._try_schedule_loop()
+        queue = self.queue
+        heads = queue.active_heads()
+        if not heads:
+            return False
+
+        arrays = self.etcd.arrays
+        nodes = arrays.nodes
+        feasible_matrix = self.filter_plugin.feasible_matrix
+        score_vector = self.score_plugin.score_vector
+        # 与 ScorePlugin.select_best 相同的随机数来源
+        rng = self.score_plugin.rng if self.score_plugin.rng is not None else random
+        preempt = self.post_filter_plugin is not None
+
+        # 每个规格一行（开启抢占时不同优先级的等价类共享同一行）
+        rows: Dict[Tuple, int] = {}
+        reps: List[Pod] = []
+        for pod in heads:
+            if pod.shape not in rows:
+                rows[pod.shape] = len(reps)
+                reps.append(pod)
+        t0 = self.profiler.tic()
+        fit = feasible_matrix(reps, arrays)
+        # 每个规格的可行节点数，无可行节点的 Pod 不必扫描矩阵行
+        counts = fit.sum(axis=1)
+        self.profiler.toc("filter", t0)
+
+        scheduled = 0
+        while True:
+            pod = queue.pop()
+            if pod is None:
+                break
+            k = rows.get(pod.shape)
+            if k is None:
+                # 本轮中途入队的规格（被驱逐的 Pod）
+                k = rows[pod.shape] = len(reps)
+                reps.append(pod)
+                fit = np.vstack([fit, feasible_matrix([pod], arrays)])
+                counts = fit.sum(axis=1)
+            if counts[k] == 0:
+                if preempt and self._preempt(pod, CycleState(pod)):
+                    scheduled += 1
+                    # 驱逐与绑定改变了多个节点，整体重算
+                    fit = feasible_matrix(reps, arrays)
+                    counts = fit.sum(axis=1)
+                    continue
+                queue.mark_unschedulable(pod, whole_class=True)
+                continue
+
+            idx = np.flatnonzero(fit[k])
+            scores = score_vector(pod, arrays, idx)
+            # 只有一个最高分节点时也要调用 choice，保持随机数消耗与 select_best 一致
+            j = int(rng.choice(idx[scores == scores.max()]))
+            self._bind(pod, nodes[j])
+            scheduled += 1
+            column = feasible_matrix(reps, arrays, np.array([j]))[:, 0]
+            counts += column.astype(np.int64) - fit[:, j]
+            fit[:, j] = column
+
+        self.profiler.count("batch.scheduled_pods", scheduled)
+        return scheduled > 0
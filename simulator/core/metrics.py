@@ -0,0 +1,153 @@
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.frag_tracker import FragmentationTracker
+from simulator.models.resource import TargetPod
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+@dataclass
+class SimulationMetrics:
+    """Scheduler.run() 的结果"""
+    makespan: int
+    nodes: int
+    pods: int
+    completed_pods: int
+    cpu_utilization: float
+    gpu_utilization: float
+    events: int = 0
+    # 仿真循环的墙钟时间（秒）
+    wall_time: float = 0.0
+    # 被抢占驱逐的次数
+    evictions: int = 0
+    # 按时间加权的平均集群碎片量（不含 Q3），只在开启 EtcdMock.frag_tracker 时给出
+    mean_fragmentation: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+class TimeSeriesRecorder:
+    """仿真过程中的时间序列采样。
+
+    每个采样点一行：仿真时间、集群 CPU/内存/GPU 分配率、activeQ/unschedulableQ 长度、运行中 Pod 数、
+    集群碎片量（给出 typical_pods 时由注册到 EtcdMock 的 FragmentationTracker 增量维护；
+    否则在 EtcdMock 开启 frag_tracker 时直接读取其合计）
+    以及自上一个采样点以来每个事件的调度延迟（墙钟秒）的汇总：事件数、平均值、最大值。
+    每个事件的延迟由 observe_latency 计入运行中的汇总，采样时写入该行后清零，
+    因此 interval > 0 时也不会丢失采样点之间的事件。
+
+    样本写入预分配的 NumPy 环形缓冲区：
+    - 未指定 path 时缓冲区写满后覆盖最旧的样本，内存固定为 capacity 行；
+    - 指定 path 时缓冲区写满即追加写入 CSV 文件后清空，完整保留整条曲线。
+    interval > 0 时每隔 interval 仿真秒最多采样一次，否则每个事件都采样。
+    """
+    COLUMNS: Tuple[str, ...] = (
+        "time", "cpu_allocation", "memory_allocation", "gpu_allocation",
+        "active_pods", "unschedulable_pods", "running_pods", "fragmentation",
+        "latency_events", "latency_mean", "latency_max",
+    )
+
+    def __init__(self, capacity: int = 65536, interval: int = 0, path: Optional[str] = None,
+                 typical_pods: Optional[List[TargetPod]] = None):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.interval = interval
+        self.path = path
+        self._buffer = np.full((capacity, len(self.COLUMNS)), np.nan, dtype=np.float64)
+        self._written = 0  # 写入缓冲区的样本总数
+        self._flushed = 0  # 已写入文件的样本数
+        self._next_time: Optional[int] = None
+        # 自上一个采样点以来的事件延迟汇总
+        self._latency_count = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._typical_pods = typical_pods
+        # 第一次采样时注册到 EtcdMock 的碎片量账本，bind/unbind 时只更新该节点
+        self._frag_tracker: Optional[FragmentationTracker] = None
+        self._frag_etcd: Optional[EtcdMock] = None
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(",".join(self.COLUMNS) + "\n")
+
+    def __len__(self) -> int:
+        """当前可以从内存中读出的样本数"""
+        return min(self._written - self._flushed, self.capacity)
+
+    @property
+    def total_samples(self) -> int:
+        return self._written
+
+    def due(self, time: int) -> bool:
+        return self._next_time is None or time >= self._next_time
+
+    def observe_latency(self, latency: float) -> None:
+        """计入一个事件的调度延迟（每个事件调用一次）"""
+        self._latency_count += 1
+        self._latency_sum += latency
+        if latency > self._latency_max:
+            self._latency_max = latency
+
+    @property
+    def pending_latency_events(self) -> int:
+        """自上一个采样点以来已计入、尚未写入样本的事件数"""
+        return self._latency_count
+
+    def cluster_fragmentation(self, e: EtcdMock) -> float:
+        """全集群碎片量之和（get_frag_amount_sum_except_q3），读取增量维护的合计，O(1)"""
+        if not self._typical_pods:
+            return e.frag_tracker.total_except_q3() if e.frag_tracker is not None else float("nan")
+        if self._frag_etcd is not e:
+            self._frag_tracker = e.add_fragmentation_tracker(FragmentationTracker(self._typical_pods))
+            self._frag_etcd = e
+        return self._frag_tracker.total_except_q3()
+
+    def sample(self, time: int, e: EtcdMock, active: int, unschedulable: int) -> None:
+        if self.interval > 0:
+            self._next_time = time + self.interval
+        if self.path is not None and self._written - self._flushed == self.capacity:
+            self.flush()
+        cpu_total, mem_total, gpu_total = e.get_total_cpu_milli(), e.get_total_memory_mib(), e.get_total_gpu_milli()
+        row = self._buffer[self._written % self.capacity]
+        row[0] = time
+        row[1] = e.allocated_cpu_milli / cpu_total if cpu_total else 0.0
+        row[2] = e.allocated_memory_mib / mem_total if mem_total else 0.0
+        row[3] = e.allocated_gpu_milli / gpu_total if gpu_total else 0.0
+        row[4] = active
+        row[5] = unschedulable
+        row[6] = len(e.running_pods)
+        row[7] = self.cluster_fragmentation(e)
+        row[8] = self._latency_count
+        row[9] = self._latency_sum / self._latency_count if self._latency_count else 0.0
+        row[10] = self._latency_max
+        self._latency_count = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._written += 1
+
+    def _ordered_rows(self) -> np.ndarray:
+        n = len(self)
+        start = (self._written - n) % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            return self._buffer[start:end]
+        return np.concatenate((self._buffer[start:], self._buffer[:end - self.capacity]))
+
+    def flush(self) -> None:
+        """把缓冲区中的样本追加写入 CSV（仅 path 模式）"""
+        if self.path is None:
+            return
+        rows = self._ordered_rows()
+        if len(rows):
+            with open(self.path, "a") as f:
+                np.savetxt(f, rows, delimiter=",", fmt="%.10g")
+        self._flushed = self._written
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """内存中的样本（按时间顺序），每列一个数组"""
+        rows = self._ordered_rows()
+        return {name: rows[:, i].copy() for i, name in enumerate(self.COLUMNS)}
+
+    def save(self, path: str) -> None:
+        """把内存中的样本保存为 .npz"""
+        np.savez(path, **self.to_arrays())
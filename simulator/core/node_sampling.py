@@ -0,0 +1,48 @@
+from simulator.models.node import Node
+from bisect import bisect_left
+from typing import Dict, List
+
+# kube-scheduler 的默认值
+MIN_FEASIBLE_NODES_TO_FIND = 100
+MIN_FEASIBLE_NODES_PERCENTAGE_TO_FIND = 5
+
+def num_feasible_nodes_to_find(num_all_nodes: int, percentage: int,
+                               min_feasible: int = MIN_FEASIBLE_NODES_TO_FIND) -> int:
+    """kube-scheduler 的 numFeasibleNodesToFind：percentage=0 时按集群规模自适应（50 - N/125，不低于 5%），
+    结果不少于 min_feasible；集群小于 min_feasible 或 percentage >= 100 时为全部节点
+    """
+    if num_all_nodes < min_feasible or percentage >= 100:
+        return num_all_nodes
+    if percentage <= 0:
+        percentage = max(50 - num_all_nodes // 125, MIN_FEASIBLE_NODES_PERCENTAGE_TO_FIND)
+    return max(num_all_nodes * percentage // 100, min_feasible)
+
+
+class NodeSampler:
+    """percentageOfNodesToScore：每个 Pod 从上一个 Pod 停止的位置开始按节点加入顺序轮转查找，
+    找到 num_feasible_nodes_to_find 个可行节点即停止，只对这些节点打分。
+
+    与 kube-scheduler 相同，下一个 Pod 的起点前移“本次检查过的节点数”；可行节点列表由调度器
+    的 filter（含等价类缓存）给出，这里按轮转顺序截取，等价于从起点逐个检查后提前停止。
+    """
+
+    def __init__(self, node_names: List[str], percentage: int, min_feasible: int = MIN_FEASIBLE_NODES_TO_FIND):
+        self.percentage = percentage
+        self.min_feasible = min_feasible
+        self._position: Dict[str, int] = {name: i for i, name in enumerate(node_names)}
+        self.num_nodes = len(node_names)
+        self.num_to_find = num_feasible_nodes_to_find(self.num_nodes, percentage, min_feasible)
+        self.next_start = 0
+
+    def sample(self, feasible: List[Node]) -> List[Node]:
+        """feasible 按节点加入顺序给出；返回按检查顺序排列的采样节点（可行节点不多于目标数时原样返回）"""
+        if len(feasible) <= self.num_to_find:
+            # 检查了全部节点（起点不变），对全部可行节点打分，与不采样时完全相同
+            return feasible
+        n = self.num_nodes
+        positions = [self._position[node.name] for node in feasible]
+        start = bisect_left(positions, self.next_start)
+        sampled = (feasible[start:] + feasible[:start])[:self.num_to_find]
+        processed = (self._position[sampled[-1].name] - self.next_start) % n + 1
+        self.next_start = (self.next_start + processed) % n
+        return sampled
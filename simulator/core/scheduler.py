@@ -2,99 +2,466 @@ from simulator.models.etcd_mock import EtcdMock
 from simulator.models.pod import Pod, PodStatus
 from simulator.models.node import Node
 from simulator.models.event import Event, EventType
-from simulator.plugins.interface import QueueSortPlugin, FilterPlugin, ScorePlugin
+from simulator.models.resource import TargetPod
+from simulator.plugins.interface import CycleState, QueueSortPlugin, FilterPlugin, ScorePlugin, PostFilterPlugin
+from simulator.core.scheduling_queue import SchedulingQueue
+from simulator.core.score_cache import ScoreCache
+from simulator.core.node_sampling import NodeSampler, MIN_FEASIBLE_NODES_TO_FIND
+from simulator.core.metrics import SimulationMetrics, TimeSeriesRecorder
 from simulator.utils.logger import logger
+from simulator.utils.profiler import NullProfiler, NULL_PROFILER
+import hashlib
 import heapq
-from typing import List
+import json
+import pickle
+import random
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 class Scheduler:
     def __init__(
         self,
         nodes: List[Node],
-        pods: List[Pod],
+        pods: Iterable[Pod],
         queue_sorter: QueueSortPlugin,
         filter_plugin: FilterPlugin,
         score_plugin: ScorePlugin,
+        vectorized: bool = False,
+        lazy_arrivals: bool = False,
+        retain_completed: bool = True,
+        recorder: Optional[TimeSeriesRecorder] = None,
+        profiler: Optional[NullProfiler] = None,
+        seed: Optional[int] = None,
+        cache_scores: bool = True,
+        cache_feasible: bool = True,
+        post_filter_plugin: Optional[PostFilterPlugin] = None,
+        percentage_of_nodes_to_score: Optional[int] = None,
+        min_feasible_nodes_to_find: int = MIN_FEASIBLE_NODES_TO_FIND,
+        fragmentation_typical_pods: Optional[List[TargetPod]] = None,
     ):
+        """lazy_arrivals=True 时 pods 必须按 creation_time 非降序给出（可以是任意迭代器，
+        如 reader.iter_h_pods），到达事件逐个从流中读入，事件堆只保存运行中 Pod 的完成事件
+        与下一个到达事件
+        retain_completed=False 时 EtcdMock 不保留已完成的 Pod（紧凑模式，配合 lazy_arrivals 使用）
+        recorder：可选的时间序列采样器，每个事件处理完后按其采样间隔记录集群状态
+        profiler：可选的 simulator.utils.profiler.Profiler，记录各阶段耗时与插件计数器
+        seed：给定时创建仿真级 random.Random(seed) 并注入所有插件，调度结果只取决于输入与种子；
+        None 时沿用全局 random
+        cache_scores / cache_feasible：关闭分数缓存 / 等价类可行节点缓存（用作对照的参考实现）
+        post_filter_plugin：filter 无可行节点时调用，如 DefaultPreemption（驱逐低优先级 Pod 后直接绑定，
+        被驱逐的 Pod 以剩余运行时间重新入队）
+        percentage_of_nodes_to_score：给定时按 kube-scheduler 的 percentageOfNodesToScore 只对部分可行节点打分
+        （0 表示按集群规模自适应，至少 min_feasible_nodes_to_find 个），起点在 Pod 之间轮转；None 时对全部可行节点打分
+        fragmentation_typical_pods：给定时 EtcdMock 相对这组 typical pods 增量维护集群碎片量，
+        summary() 给出按时间加权的平均碎片量，recorder 未指定 typical_pods 时直接采样其合计
+        """
         self.nodes = nodes
         self.all_pods = pods
+        self.lazy_arrivals = lazy_arrivals
         self.queue_sorter = queue_sorter
         self.filter_plugin = filter_plugin
         self.score_plugin = score_plugin
         
-        self.etcd = EtcdMock()
+        # vectorized=True 时 EtcdMock 额外维护 NumPy 数组形式的集群状态
+        self.etcd = EtcdMock(vectorized=vectorized, retain_completed=retain_completed)
         self.etcd.add_nodes(nodes)
+        if fragmentation_typical_pods is not None:
+            self.etcd.enable_fragmentation_tracker(fragmentation_typical_pods)
+        self.queue = SchedulingQueue(queue_sorter, by_priority=post_filter_plugin is not None)
+        # 纯函数式打分插件：按 (Pod 规格, 节点, 节点版本) 复用分数
+        self.cache_scores = cache_scores
+        self.score_cache: Optional[ScoreCache] = \
+            ScoreCache() if cache_scores and score_plugin.cacheable_scores else None
+        # 等价类：同规格 Pod 的 filter 结果在集群版本不变时可复用
+        self.cache_feasible = cache_feasible
+        self._feasible_cache: Dict[Tuple, List[Node]] = {}
+        self._feasible_cache_version: int = -1
+
+        self.node_sampler: Optional[NodeSampler] = None
+        if percentage_of_nodes_to_score is not None:
+            self.node_sampler = NodeSampler(list(self.etcd.nodes), percentage_of_nodes_to_score,
+                                            min_feasible_nodes_to_find)
+
+        self.post_filter_plugin = post_filter_plugin
+        # 抢占：Pod 当前有效的完成事件序号，被驱逐 Pod 的旧完成事件出堆时作废
+        self._completion_orders: Optional[Dict[str, int]] = None
+        if post_filter_plugin is not None:
+            self.etcd.enable_priority_index()
+            self._completion_orders = {}
 
         self.current_time: int = 0
         self._event_heap: List[Event] = []
         self._event_seq: int = 0  # 保证堆中事件稳定顺序
+        self._arrivals: Optional[Iterator[Pod]] = None
+        self._last_arrival_time: int = 0
+        self._initialized = False
+        self.arrived_pods_count: int = 0
+
+        self.recorder = recorder
+        self.profiler: NullProfiler = NULL_PROFILER
+        if profiler is not None:
+            self.set_profiler(profiler)
+        self.events_processed: int = 0
+        self.wall_time: float = 0.0
+
+        self.seed = seed
+        self.rng: Optional[random.Random] = None
+        if seed is not None:
+            self.rng = random.Random(seed)
+            for plugin in self._plugins():
+                plugin.set_rng(self.rng)
+        # 放置日志的增量摘要：每次 bind 链式追加 (时间, Pod, 节点, GPU 分配)；保存为 bytes 以便快照
+        self._placement_digest = b""
+        self.placements_count: int = 0
+        # 驱逐记为 (时间, Pod, None, ())
+        self.placement_log: Optional[List[Tuple[int, str, Optional[str], Tuple[Tuple[int, int], ...]]]] = None
+
+    def set_profiler(self, profiler: NullProfiler) -> None:
+        """开启埋点：queue_sort / filter / score / bind / event 各阶段计时，可行节点数分布，缓存计数"""
+        self.profiler = profiler
+        self.filter_plugin.set_profiler(profiler)
+        self.score_plugin.set_profiler(profiler)
+        if self.post_filter_plugin is not None:
+            self.post_filter_plugin.set_profiler(profiler)
+        if self.score_cache is not None:
+            profiler.register_counter("score_cache.hits", lambda: self.score_cache.hits)
+            profiler.register_counter("score_cache.misses", lambda: self.score_cache.misses)
+
+    def _plugins(self) -> List:
+        plugins = [self.queue_sorter, self.filter_plugin, self.score_plugin]
+        if self.post_filter_plugin is not None:
+            plugins.append(self.post_filter_plugin)
+        return plugins
+
+    def enable_placement_log(self) -> None:
+        """额外保存完整的放置日志（默认只维护摘要）"""
+        self.placement_log = []
+
+    def _record_placement(self, pod: Pod) -> None:
+        self._record((self.current_time, pod.name, pod.bound_node, tuple(sorted(pod.gpu_alloc.items()))))
+
+    def _record(self, record: Tuple) -> None:
+        self._placement_digest = hashlib.blake2b(self._placement_digest + repr(record).encode(),
+                                                 digest_size=16).digest()
+        self.placements_count += 1
+        if self.placement_log is not None:
+            self.placement_log.append(record)
+
+    def placement_digest(self) -> str:
+        return self._placement_digest.hex()
+
+    def config(self) -> Dict:
+        """影响调度结果的配置：插件类型、种子与节点规格（不含实现层面的开关，如缓存与向量化）"""
+        nodes = hashlib.blake2b(digest_size=16)
+        for node in self.nodes:
+            nodes.update(repr((node.name, node.cpu_milli_total, node.memory_mib_total, node.gpu_count,
+                               node.gpu_share_enabled)).encode())
+        config = {
+            "queue_sort": type(self.queue_sorter).__name__,
+            "filter": type(self.filter_plugin).__name__,
+            "score": type(self.score_plugin).__name__,
+            "post_filter": type(self.post_filter_plugin).__name__ if self.post_filter_plugin is not None else None,
+            "seed": self.seed,
+            "nodes": nodes.hexdigest(),
+        }
+        if self.node_sampler is not None:
+            config["node_sampling"] = [self.node_sampler.percentage, self.node_sampler.min_feasible]
+        return config
+
+    def fingerprint(self) -> str:
+        """运行指纹：配置 + 放置日志摘要。同一配置下不同引擎实现应得到相同指纹"""
+        h = hashlib.sha256(json.dumps(self.config(), sort_keys=True).encode())
+        h.update(self.placement_digest().encode())
+        return h.hexdigest()
+
+    # --- snapshot / restore ---
+    def snapshot(self) -> bytes:
+        """序列化完整的仿真状态：事件堆、EtcdMock（节点空闲资源、GPU 分配、Pod 状态）、调度队列、
+        当前时间、到达流游标与插件。对象之间的共享引用在恢复后保持不变。
+
+        lazy_arrivals 的到达流必须可以 pickle（如 list 迭代器、reader.TracePodIterator），生成器不行；
+        执行策略与 profiler 在快照中退化为串行 / NullProfiler。
+        """
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def restore(data: bytes) -> "Scheduler":
+        return pickle.loads(data)
+
+    def fork(self, n: int) -> List["Scheduler"]:
+        """从当前状态复制出 n 个互相独立的分支"""
+        data = self.snapshot()
+        return [Scheduler.restore(data) for _ in range(n)]
+
+    def save_snapshot(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.snapshot())
+
+    @staticmethod
+    def load_snapshot(path: str) -> "Scheduler":
+        with open(path, "rb") as f:
+            return Scheduler.restore(f.read())
+
+    def replace_plugins(self, queue_sorter: Optional[QueueSortPlugin] = None,
+                        filter_plugin: Optional[FilterPlugin] = None,
+                        score_plugin: Optional[ScorePlugin] = None) -> None:
+        """在恢复的分支上更换调度策略（what-if），缓存随之失效"""
+        if queue_sorter is not None:
+            self.queue_sorter = queue_sorter
+            self.queue.set_queue_sorter(queue_sorter)
+        if filter_plugin is not None:
+            self.filter_plugin = filter_plugin
+        if score_plugin is not None:
+            self.score_plugin = score_plugin
+        self.score_cache = ScoreCache() if self.cache_scores and self.score_plugin.cacheable_scores else None
+        self._feasible_cache.clear()
+        self._feasible_cache_version = -1
+        if self.rng is not None:
+            for plugin in self._plugins():
+                plugin.set_rng(self.rng)
+        if self.profiler.enabled:
+            self.set_profiler(self.profiler)
 
     def _push_event(self, time: int, etype: EventType, pod: Pod):
         self._event_seq += 1
-        heapq.heappush(self._event_heap, Event(time=time, order=self._event_seq, type=etype, pod=pod))
+        heapq.heappush(self._event_heap, Event(time, etype, self._event_seq, pod))
+
+    def _push_next_arrival(self):
+        """惰性模式：从到达流中读入下一个 Pod 的到达事件"""
+        pod = next(self._arrivals, None)
+        if pod is None:
+            self._arrivals = None
+            return
+        if pod.creation_time < self._last_arrival_time:
+            raise ValueError(f"lazy_arrivals 要求 Pod 按 creation_time 排序，"
+                             f"{pod.name} 的 creation_time {pod.creation_time} < {self._last_arrival_time}")
+        self._last_arrival_time = pod.creation_time
+        self._push_event(pod.creation_time, EventType.ARRIVAL, pod)
 
     def initialize_events(self):
+        self._initialized = True
+        self.current_time = 0
+        if self.lazy_arrivals:
+            self._arrivals = iter(self.all_pods)
+            self._push_next_arrival()
+            return
         if not self.all_pods:
             return
         # 将所有 Pod 的到达事件加入堆
         for p in self.all_pods:
             self._push_event(p.creation_time, EventType.ARRIVAL, p)
-        self.current_time = 0
     
+    def _observe_arrival(self, pod: Pod) -> None:
+        self.score_plugin.on_pod_arrival(pod)
+
+    def _pick_node(self, pod: Pod, feasible_nodes: List[Node],
+                   state: CycleState) -> Tuple[Optional[Node], Optional[Tuple[int, ...]]]:
+        """score：只为版本变化过的节点重新打分，其余节点复用缓存。
+        返回 (节点, 打分插件在该节点上选定的 GPU 放置或 None)
+        """
+        if self.score_cache is None:
+            target = self.score_plugin.pick(pod, feasible_nodes, self.etcd, state)
+            return target, None if target is None else state.gpu_placements.get(target.name)
+        if not feasible_nodes:
+            return None, None
+        target = self.score_plugin.select_best(feasible_nodes, self._score_nodes(pod, feasible_nodes, state))
+        if target is None:
+            return None, None
+        return target, self._gpu_placement(pod, target, state)
+
+    def _score_nodes(self, pod: Pod, nodes: List[Node], state: CycleState) -> List[float]:
+        """nodes 的分数，开启分数缓存时只为版本变化过的节点重新打分"""
+        if self.score_cache is None:
+            return self.score_plugin.score_nodes(pod, nodes, self.etcd, state)
+        self.score_cache.set_epoch(self.score_plugin.cache_epoch())
+        shape = pod.shape
+        scores = self.score_cache.lookup(shape, nodes, self.etcd)
+        dirty = [node for node, score in zip(nodes, scores) if score is None]
+        if dirty:
+            fresh = iter(self.score_plugin.score_nodes(pod, dirty, self.etcd, state))
+            for i, score in enumerate(scores):
+                if score is None:
+                    score = next(fresh)
+                    scores[i] = score
+                    node = nodes[i]
+                    self.score_cache.store(shape, node, self.etcd, score, state.gpu_placements.get(node.name))
+        return scores
+
+    def _gpu_placement(self, pod: Pod, node: Node, state: CycleState) -> Optional[Tuple[int, ...]]:
+        """_score_nodes 之后：打分插件在 node 上选定的 GPU 放置（缓存命中时取缓存中的放置）"""
+        if self.score_cache is None:
+            return state.gpu_placements.get(node.name)
+        return self.score_cache.placement(pod.shape, node, self.etcd)
+
+    def _filter(self, pod: Pod, state: CycleState) -> List[Node]:
+        """filter：按 Pod 规格（等价类）缓存可行节点，集群状态变化后失效"""
+        if not self.cache_feasible:
+            return self.filter_plugin.filter(pod, self.etcd, state)
+        if self._feasible_cache_version != self.etcd.cluster_version:
+            self._feasible_cache.clear()
+            self._feasible_cache_version = self.etcd.cluster_version
+        shape = pod.shape
+        feas = self._feasible_cache.get(shape)
+        if feas is None:
+            feas = self.filter_plugin.filter(pod, self.etcd, state)
+            self._feasible_cache[shape] = feas
+        return feas
+
+    def _bind(self, pod: Pod, node: Node, gpu_ids: Optional[Tuple[int, ...]] = None) -> None:
+        """gpu_ids：打分插件选定的 GPU 放置，None 时由 EtcdMock 按 best-fit 分配"""
+        self.etcd.bind(pod.name, node.name, self.current_time, gpu_ids=gpu_ids)
+        self._record_placement(pod)
+        self._push_event(pod.scheduled_time + pod.duration, EventType.COMPLETION, pod)
+        if self._completion_orders is not None:
+            self._completion_orders[pod.name] = self._event_seq
+            # 抢占：更高优先级的不可调度 Pod 可能可以驱逐刚绑定的 Pod
+            self.queue.on_pod_bound(pod, node, self.etcd)
+
+    def _unbind(self, pod: Pod) -> None:
+        self.etcd.unbind(pod.name)
+
+    def _preempt(self, pod: Pod, state: CycleState) -> bool:
+        """驱逐 post_filter_plugin 选出的低优先级 Pod，把 pod 绑定到腾出的节点"""
+        t0 = self.profiler.tic()
+        result = self.post_filter_plugin.post_filter(pod, self.etcd, state)
+        self.profiler.toc("post_filter", t0)
+        if result is None:
+            return False
+
+        node, victims = result
+        for victim in victims:
+            self.etcd.evict(victim.name, self.current_time)
+            self._record((self.current_time, victim.name, None, ()))
+            del self._completion_orders[victim.name]
+            self.queue.push(victim)
+        self._bind(pod, node)
+        # 腾出的资源可能多于 pod 所需
+        self.queue.on_node_released(node, self.etcd)
+        return True
+
     def _try_schedule_loop(self) -> bool:
-        """尝试调度 pending 列表中的 Pod。
+        """按队列顺序尝试调度 activeQ 中的 Pod，失败的 Pod 进入 unschedulableQ。
+        一轮内空闲资源只减不增，失败的 Pod 在本轮不可能再被调度，因此一轮即可。
         返回：本轮是否至少成功调度了一个 Pod。
         """
         scheduled_any = False
+        prof = self.profiler
+
+        # queueSort：activeQ 本身有序
+        while True:
+            t0 = prof.tic()
+            pod = self.queue.pop()
+            prof.toc("queue_sort", t0)
+            if pod is None:
+                break
 
-        # queueSort
-        queue = self.queue_sorter.sort(self.etcd)
+            # 本周期内 filter 与 score 插件共享的状态
+            state = CycleState(pod)
 
-        for pod in queue:
             # filter
-            feas = self.filter_plugin.filter(pod, e=self.etcd)
+            t0 = prof.tic()
+            feas = self._filter(pod, state)
+            prof.toc("filter", t0)
+            prof.observe("feasible_nodes", len(feas))
+            if self.node_sampler is not None:
+                feas = self.node_sampler.sample(feas)
+                prof.observe("scored_nodes", len(feas))
 
             if not feas:
+                # postFilter：抢占成功时 pod 已绑定
+                if self.post_filter_plugin is not None and self._preempt(pod, state):
+                    scheduled_any = True
+                    continue
+                # 本轮空闲资源只减不增（抢占时按 (规格, 优先级) 分组，同组 Pod 也无法抢占），
+                # 同一等价类的其余 Pod 也不可调度，整组移入 unschedulableQ；之后的释放或低优先级
+                # Pod 的绑定带来新的抢占机会时再移回 activeQ
+                self.queue.mark_unschedulable(pod, whole_class=True)
                 continue # 无可行节点，尝试下一个 Pod
             
             # score
-            target = self.score_plugin.pick(pod, feas, self.etcd)
+            t0 = prof.tic()
+            target, gpu_ids = self._pick_node(pod, feas, state)
+            prof.toc("score", t0)
             if target is None:
+                self.queue.mark_unschedulable(pod, whole_class=True)
                 continue # 无法选出节点，尝试下一个 Pod
 
             # bind
-            self.etcd.bind(pod.name, target.name, self.current_time)
-            self._push_event(pod.scheduled_time + pod.duration, EventType.COMPLETION, pod)
-            # logger.info(f'Time {self.current_time}: Pod {pod.name} scheduled to Node {pod.bound_node}.')
+            t0 = prof.tic()
+            self._bind(pod, target, gpu_ids)
+            prof.toc("bind", t0)
+            # logger.info('Time %d: Pod %s scheduled to Node %s.', self.current_time, pod.name, pod.bound_node)
             scheduled_any = True
 
         return scheduled_any
     
-    def run(self):
-        self.initialize_events()
+    def run(self, report: bool = True, until: Optional[int] = None) -> SimulationMetrics:
+        """运行仿真。until 给定时只处理时间不晚于 until 的事件后返回，之后可以再次调用 run 继续
+        （或先 snapshot / fork）。
+        """
+        if not self._initialized:
+            self.initialize_events()
+        recorder = self.recorder
+        prof = self.profiler
+        run_start = perf_counter()
 
-        while self._event_heap:
+        while self._event_heap and (until is None or self._event_heap[0].time <= until):
+            if recorder is not None:
+                event_start = perf_counter()
+            t0 = prof.tic()
             ev = heapq.heappop(self._event_heap)
+            if ev.type == EventType.COMPLETION and self._completion_orders is not None:
+                if self._completion_orders.get(ev.pod.name) != ev.order:
+                    continue  # 被驱逐 Pod 的过期完成事件
+                del self._completion_orders[ev.pod.name]
             self.current_time = ev.time
+            if self.etcd.frag_tracker is not None:
+                self.etcd.frag_tracker.advance(self.current_time)
 
             if ev.type == EventType.ARRIVAL:
                 assert ev.pod.status == PodStatus.Pending
-                # logger.info(f'Time {self.current_time}: Pod {ev.pod.name} arrived.')
+                # logger.info('Time %d: Pod %s arrived.', self.current_time, ev.pod.name)
                 self.etcd.add_pod(ev.pod)
+                self.queue.push(ev.pod)
+                self.arrived_pods_count += 1
+                if self.score_plugin.observes_arrivals:
+                    self._observe_arrival(ev.pod)
+                if self._arrivals is not None:
+                    self._push_next_arrival()
             elif ev.type == EventType.COMPLETION:
                 # Pod 完成：释放资源
                 pod = ev.pod
                 assert pod.status == PodStatus.Running
                 node_name = pod.bound_node
-                self.etcd.unbind(pod.name) # todo: reschedule
-                # logger.info(f'Time {self.current_time}: Pod {pod.name} completed and released from node {node_name}.')
+                self._unbind(pod)
+                # logger.info('Time %d: Pod %s completed and released from node %s.', self.current_time, pod.name, node_name)
+                self.queue.on_node_released(self.etcd.get_node(node_name), self.etcd)
+
+            prof.toc("event", t0)
 
             # 每个事件后尝试调度尽可能多的 Pending Pod
-            scheduled = True
-            while scheduled:
-                scheduled = self._try_schedule_loop()
+            t0 = prof.tic()
+            self._try_schedule_loop()
+            prof.toc("schedule_cycle", t0)
+            self.events_processed += 1
+
+            if recorder is not None:
+                recorder.observe_latency(perf_counter() - event_start)
+                if recorder.due(self.current_time):
+                    recorder.sample(self.current_time, self.etcd, self.queue.active_count(),
+                                    self.queue.unschedulable_count())
 
-        self.report()
+        self.wall_time += perf_counter() - run_start
+        if recorder is not None:
+            # 最后一个采样点之后的事件延迟补一个样本，不丢失
+            if recorder.pending_latency_events:
+                recorder.sample(self.current_time, self.etcd, self.queue.active_count(),
+                                self.queue.unschedulable_count())
+            recorder.flush()
+        metrics = self.summary()
+        if report:
+            self.report()
+        return metrics
 
     def _show_event_heap(self):
         print(f"Event Heap at time {self.current_time}:")
@@ -102,31 +469,37 @@ class Scheduler:
             print(event)
         print("End of Event Heap\n")
 
-    def report(self):
+    def summary(self) -> SimulationMetrics:
+        """仿真结束后的汇总指标（由 EtcdMock 的增量计数得到，无需遍历 Pod）"""
         makespan = self.current_time
-        completed_pods_count = len(self.etcd.completed_pods)
-        cpu_used_time = 0
-        gpu_used_time = 0
-        for pod_name in self.etcd.completed_pods:
-            pod = self.etcd.get_pod(pod_name)
-            cpu_used_time += pod.cpu_milli * pod.duration
-            gpu_used_time += pod.num_gpu * pod.gpu_milli * pod.duration
         total_cpu_used_time = makespan * self.etcd.get_total_cpu_milli()
         total_gpu_used_time = makespan * self.etcd.get_total_gpu_milli()
-        cpu_utilization = cpu_used_time / total_cpu_used_time if total_cpu_used_time > 0 else 0
-        gpu_utilization = gpu_used_time / total_gpu_used_time if total_gpu_used_time > 0 else 0
-        print(f"Total makespan: {makespan} seconds")
-        print(f"Scheduling {len(self.all_pods)} pods in {len(self.nodes)} nodes")
-        print(f"Total completed pods: {completed_pods_count} / {len(self.all_pods)}")
-        print(f"CPU Utilization: {cpu_utilization*100:.2f}%")
-        print(f"GPU Utilization: {gpu_utilization*100:.2f}%")
-        print()
-
-                
-
-                
-
-
-
-
+        cpu_used_time = self.etcd.completed_cpu_milli_time
+        gpu_used_time = self.etcd.completed_gpu_milli_time
+        return SimulationMetrics(
+            makespan=makespan,
+            nodes=len(self.nodes),
+            pods=self.arrived_pods_count,
+            completed_pods=self.etcd.completed_count,
+            cpu_utilization=cpu_used_time / total_cpu_used_time if total_cpu_used_time > 0 else 0,
+            gpu_utilization=gpu_used_time / total_gpu_used_time if total_gpu_used_time > 0 else 0,
+            events=self.events_processed,
+            wall_time=self.wall_time,
+            evictions=self.etcd.evicted_count,
+            mean_fragmentation=self.etcd.frag_tracker.mean_except_q3() if self.etcd.frag_tracker is not None else None,
+        )
 
+    def report(self):
+        summary = self.summary()
+        print(f"Total makespan: {summary.makespan} seconds")
+        print(f"Scheduling {summary.pods} pods in {summary.nodes} nodes")
+        print(f"Total completed pods: {summary.completed_pods} / {summary.pods}")
+        print(f"CPU Utilization: {summary.cpu_utilization*100:.2f}%")
+        print(f"GPU Utilization: {summary.gpu_utilization*100:.2f}%")
+        if summary.evictions:
+            print(f"Evictions: {summary.evictions}")
+        if summary.mean_fragmentation is not None:
+            averages = self.etcd.frag_tracker.report()["time_average"]
+            print(f"Mean fragmentation (except Q3): {summary.mean_fragmentation:.1f}")
+            print("  " + ", ".join(f"{name}={value:.1f}" for name, value in averages.items()))
+        print()
@@ -0,0 +1,163 @@
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.plugins.interface import QueueSortPlugin
+import heapq
+from typing import Dict, List, Optional, Tuple, Any
+
+# 堆元素：(排序键, pod_name, Pod)，pod_name 唯一，比较不会落到 Pod 上
+QueueEntry = Tuple[Any, str, Pod]
+
+class SchedulingQueue:
+    """增量维护的待调度队列（参考 kube-scheduler 的 activeQ / unschedulableQ）。
+
+    - activeQ：按 QueueSortPlugin.key 排序，Pod 到达时 push，调度时 pop；
+    - unschedulableQ：上一次尝试时没有任何可行节点的 Pod。集群资源只会在
+      COMPLETION 释放时增加，因此只有当被释放的节点能够容纳它们时才移回 activeQ；
+      by_priority=True（开启抢占）时，节点上出现新的抢占机会（释放资源或绑定了更低优先级的 Pod）
+      也把可能通过抢占放进该节点的等价类移回 activeQ。
+
+    两个队列都按资源规格（Pod.shape，等价类）分组：activeQ 的每个等价类是一个子堆，
+    外层堆只保存各等价类的队首，整体出队顺序与单一堆相同；一个等价类判定不可调度后
+    可以整组移入 unschedulableQ，每组在节点释放时也只需检查一次。
+    by_priority=True 时等价类为 (规格, 优先级)：开启抢占后同规格不同优先级的 Pod 结果不同。
+    """
+
+    def __init__(self, queue_sorter: QueueSortPlugin, by_priority: bool = False):
+        self.queue_sorter = queue_sorter
+        self.by_priority = by_priority
+        # shape -> 子堆
+        self._active_classes: Dict[Tuple, List[QueueEntry]] = {}
+        # 外层堆：(队首排序键, 队首 pod_name, shape)，可能含过期条目，出队时校验
+        self._active: List[Tuple[Any, str, Tuple]] = []
+        self._active_count = 0
+        # shape -> 条目堆（与 activeQ 子堆相同，整组移回时无需重新建堆）
+        self._unschedulable: Dict[Tuple, List[QueueEntry]] = {}
+        self._unschedulable_count = 0
+
+    def __len__(self) -> int:
+        return self._active_count + self._unschedulable_count
+
+    def active_count(self) -> int:
+        return self._active_count
+
+    def unschedulable_count(self) -> int:
+        return self._unschedulable_count
+
+    def _class_of(self, pod: Pod) -> Tuple:
+        return (pod.shape, pod.priority) if self.by_priority else pod.shape
+
+    def _push_entries(self, shape: Tuple, entries: List[QueueEntry]) -> None:
+        """把一个条目堆并入该等价类的 activeQ 子堆（entries 的所有权转移给队列）"""
+        sub = self._active_classes.get(shape)
+        head = sub[0] if sub else None
+        if not sub:
+            sub = entries
+            self._active_classes[shape] = sub
+        else:
+            # 小堆逐个并入大堆
+            if len(entries) > len(sub):
+                sub, entries = entries, sub
+                self._active_classes[shape] = sub
+            for entry in entries:
+                heapq.heappush(sub, entry)
+        if sub[0] is not head:
+            heapq.heappush(self._active, (sub[0][0], sub[0][1], shape))
+        self._active_count += len(entries)
+
+    def push(self, pod: Pod) -> None:
+        self._push_entries(self._class_of(pod), [(self.queue_sorter.key(pod), pod.name, pod)])
+
+    def pop(self) -> Optional[Pod]:
+        while self._active:
+            _, name, shape = heapq.heappop(self._active)
+            sub = self._active_classes.get(shape)
+            if not sub or sub[0][1] != name:
+                continue  # 过期条目
+            pod = heapq.heappop(sub)[2]
+            if sub:
+                heapq.heappush(self._active, (sub[0][0], sub[0][1], shape))
+            else:
+                del self._active_classes[shape]
+            self._active_count -= 1
+            return pod
+        return None
+
+    def active_heads(self) -> List[Pod]:
+        """activeQ 中每个等价类的队首 Pod（不出队）"""
+        return [sub[0][2] for sub in self._active_classes.values()]
+
+    def mark_unschedulable(self, pod: Pod, whole_class: bool = False) -> None:
+        """把 Pod 放入 unschedulableQ；whole_class=True 时同一等价类的 activeQ Pod 一并移入"""
+        shape = self._class_of(pod)
+        group = self._unschedulable.get(shape)
+        if whole_class:
+            sub = self._active_classes.pop(shape, None)
+            if sub:
+                # 整个子堆直接移入，O(1)
+                self._active_count -= len(sub)
+                self._unschedulable_count += len(sub)
+                if group is None:
+                    group = self._unschedulable[shape] = sub
+                else:
+                    if len(sub) > len(group):
+                        group, sub = sub, group
+                        self._unschedulable[shape] = group
+                    for entry in sub:
+                        heapq.heappush(group, entry)
+        if group is None:
+            group = self._unschedulable[shape] = []
+        heapq.heappush(group, (self.queue_sorter.key(pod), pod.name, pod))
+        self._unschedulable_count += 1
+
+    def _reactivate(self, shape: Tuple) -> int:
+        group = self._unschedulable.pop(shape)
+        self._unschedulable_count -= len(group)
+        self._push_entries(shape, group)
+        return len(group)
+
+    def on_node_released(self, node: Node, e: EtcdMock) -> int:
+        """节点资源被释放后，把能放进该节点（by_priority 时包括可能通过抢占放进）的不可调度 Pod 移回 activeQ。
+
+        其余节点的空闲资源自 Pod 失败以来只减不增，所以只需检查被释放的节点。
+        返回：移回 activeQ 的 Pod 数量。
+        """
+        moved = 0
+        for shape in list(self._unschedulable):
+            # 同规格的 Pod 可行性相同，只检查组内任意一个（堆顶）
+            head = self._unschedulable[shape][0][2]
+            if e.check_bindable(head.name, node.name) or \
+                    (self.by_priority and e.priority_index.may_fit_after_eviction(head, node)):
+                moved += self._reactivate(shape)
+        return moved
+
+    def on_pod_bound(self, pod: Pod, node: Node, e: EtcdMock) -> int:
+        """by_priority 模式：pod 绑定到 node 后，优先级更高的不可调度等价类可能可以通过驱逐它放进 node。
+        返回：移回 activeQ 的 Pod 数量。
+        """
+        if not self.by_priority:
+            return 0
+        moved = 0
+        for shape in list(self._unschedulable):
+            head = self._unschedulable[shape][0][2]
+            if head.priority > pod.priority and e.priority_index.may_fit_after_eviction(head, node):
+                moved += self._reactivate(shape)
+        return moved
+
+    def set_queue_sorter(self, queue_sorter: QueueSortPlugin) -> None:
+        """更换排序插件：按新的排序键重建所有子堆，Pod 所在的队列（activeQ / unschedulableQ）不变"""
+        self.queue_sorter = queue_sorter
+        active = [entry[2] for sub in self._active_classes.values() for entry in sub]
+        unschedulable = [(shape, [entry[2] for entry in group]) for shape, group in self._unschedulable.items()]
+        self._active_classes = {}
+        self._active = []
+        self._active_count = 0
+        self._unschedulable = {}
+        self._unschedulable_count = 0
+        for pod in active:
+            self.push(pod)
+        for shape, pods in unschedulable:
+            group = [(queue_sorter.key(pod), pod.name, pod) for pod in pods]
+            heapq.heapify(group)
+            self._unschedulable[shape] = group
+            self._unschedulable_count += len(group)
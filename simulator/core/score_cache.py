@@ -0,0 +1,64 @@
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.node import Node
+from typing import Dict, List, Optional, Tuple
+
+class ScoreCache:
+    """按 (Pod 规格, 节点, 节点版本) 缓存打分结果。
+
+    节点只在 bind/unbind 时变化（EtcdMock.node_versions 递增），
+    因此未变化节点上的分数可以在多个 Pod / 多轮调度之间复用。
+    每个节点只保留最新版本的分数，旧版本在首次访问时整体丢弃。
+    打分插件提出的 GPU 放置（CycleState.gpu_placements）与分数一起缓存，命中时无需重新计算。
+    """
+
+    def __init__(self):
+        # node -> (version, {shape: (score, gpu 放置)})
+        self._entries: Dict[str, Tuple[int, Dict[Tuple, Tuple[float, Optional[Tuple[int, ...]]]]]] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def set_epoch(self, epoch: int) -> None:
+        """插件打分状态变化（ScorePlugin.cache_epoch）时清空缓存"""
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self.clear()
+
+    def lookup(self, shape: Tuple, nodes: List[Node], e: EtcdMock) -> List[Optional[float]]:
+        scores: List[Optional[float]] = []
+        for node in nodes:
+            entry = self._entries.get(node.name)
+            score = None
+            if entry is not None and entry[0] == e.node_versions[node.name]:
+                cached = entry[1].get(shape)
+                if cached is not None:
+                    score = cached[0]
+            if score is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            scores.append(score)
+        return scores
+
+    def placement(self, shape: Tuple, node: Node, e: EtcdMock) -> Optional[Tuple[int, ...]]:
+        """与分数一起缓存的 GPU 放置（没有时返回 None）"""
+        entry = self._entries.get(node.name)
+        if entry is None or entry[0] != e.node_versions[node.name]:
+            return None
+        cached = entry[1].get(shape)
+        return None if cached is None else cached[1]
+
+    def store(self, shape: Tuple, node: Node, e: EtcdMock, score: float,
+              placement: Optional[Tuple[int, ...]] = None) -> None:
+        version = e.node_versions[node.name]
+        entry = self._entries.get(node.name)
+        if entry is None or entry[0] != version:
+            entry = (version, {})
+            self._entries[node.name] = entry
+        entry[1][shape] = (score, placement)
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "nodes": len(self._entries)}
@@ -0,0 +1,182 @@
+from simulator.core.scheduler import Scheduler
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.plugins.interface import CycleState, QueueSortPlugin, FilterPlugin, ScorePlugin
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from multiprocessing.connection import Connection
+from typing import Dict, Iterable, List, Optional, Tuple
+import multiprocessing
+import random
+
+# 分片的评估结果：(最高分, 最高分节点（按节点加入顺序）, 这些节点上的 GPU 放置)；没有可行节点时为 None
+ShardResult = Optional[Tuple[float, List[str], Dict[str, Optional[Tuple[int, ...]]]]]
+
+def _evaluate(shard: Scheduler, pod: Pod) -> ShardResult:
+    """在分片上对 pod 执行 filter + score（复用分片 Scheduler 的可行节点缓存与分数缓存）"""
+    etcd = shard.etcd
+    etcd.add_pod(pod)
+    try:
+        state = CycleState(pod)
+        feasible = shard._filter(pod, state)
+        if not feasible:
+            return None
+        scores = shard._score_nodes(pod, feasible, state)
+        best = max(scores)
+        tied = [node for node, score in zip(feasible, scores) if score == best]
+        return best, [node.name for node in tied], {node.name: shard._gpu_placement(pod, node, state) for node in tied}
+    finally:
+        etcd.remove_pod(pod.name)
+
+def _shard_main(conn: Connection, nodes: List[Node], filter_plugin: FilterPlugin, score_plugin: ScorePlugin,
+                seed: Optional[int], cache_scores: bool) -> None:
+    """分片进程：持有一部分节点的 EtcdMock，按协调者的消息评估 / 绑定 / 释放。
+    消息：("evaluate", pod) -> ShardResult；("bind", pod, node, time, gpu_ids)；("unbind", pod_name)；
+    ("arrival", pod)（转发给在线更新的打分插件）；("stop",)
+    """
+    shard = Scheduler(nodes, [], QueueSortFIFO(), filter_plugin, score_plugin, retain_completed=False,
+                      seed=seed, cache_scores=cache_scores)
+    etcd = shard.etcd
+    while True:
+        msg = conn.recv()
+        op = msg[0]
+        if op == "evaluate":
+            conn.send(_evaluate(shard, msg[1]))
+        elif op == "bind":
+            _, pod, node_name, current_time, gpu_ids = msg
+            etcd.add_pod(pod)
+            etcd.bind(pod.name, node_name, current_time, gpu_ids=gpu_ids)
+        elif op == "unbind":
+            etcd.unbind(msg[1])
+        elif op == "arrival":
+            shard.score_plugin.on_pod_arrival(msg[1])
+        elif op == "stop":
+            break
+    conn.close()
+
+
+class ShardedScheduler(Scheduler):
+    """两级调度：节点按加入顺序切成 workers 个连续分片，每个分片由一个工作进程持有
+    （自己的 EtcdMock 副本、filter / score 插件与缓存）。
+
+    协调者运行事件循环、队列与全局 EtcdMock；每个 Pod 的 filter + score 发给分片并行执行，
+    各分片只返回本分片的最高分节点，协调者合并后按节点加入顺序在全局最高分节点中用同一个
+    随机数生成器选取，因此 probes=None（询问全部分片）时调度结果与单进程 Scheduler 逐位一致
+    （分数只取决于 Pod 与节点自身的打分插件）。bind / unbind 异步转发给节点所在的分片，
+    同一管道上的消息保持顺序。打分插件观察 Pod 到达（observes_arrivals）时，到达也转发给每个分片，
+    各分片上的插件状态与协调者保持一致。
+
+    probes=d 时每个 Pod 先随机询问 d 个分片（Sparrow 式采样），都没有可行节点时再询问其余分片；
+    通信量与分片上的计算减少，但只在被询问的分片中选点，调度质量会偏离单进程调度器。
+
+    分片进程在构造时 fork 出来，用完后调用 close()（或使用 with 语句）。不支持抢占、节点采样与快照。
+    """
+
+    def __init__(self, nodes: List[Node], pods: Iterable[Pod], queue_sorter: QueueSortPlugin,
+                 filter_plugin: FilterPlugin, score_plugin: ScorePlugin, workers: int = 2,
+                 probes: Optional[int] = None, **kwargs):
+        if kwargs.get("post_filter_plugin") is not None:
+            raise ValueError("ShardedScheduler 不支持 post_filter_plugin（抢占）")
+        if kwargs.get("percentage_of_nodes_to_score") is not None:
+            raise ValueError("ShardedScheduler 不支持节点采样，请使用 probes")
+        if workers < 1 or workers > len(nodes):
+            raise ValueError("workers 必须在 [1, 节点数] 之间")
+        if probes is not None and not 1 <= probes <= workers:
+            raise ValueError("probes 必须在 [1, workers] 之间")
+        super().__init__(nodes, pods, queue_sorter, filter_plugin, score_plugin, **kwargs)
+        self.workers = workers
+        self.probes = probes
+        self._probe_rng = random.Random(self.seed)
+        self.shard_requests = 0
+
+        # 连续分片：合并后的候选节点保持全局的节点加入顺序
+        bounds = [len(nodes) * i // workers for i in range(workers + 1)]
+        self._shard_of: Dict[str, int] = {}
+        self._conns: List[Connection] = []
+        self._processes: List[multiprocessing.Process] = []
+        ctx = multiprocessing.get_context("fork")
+        for i in range(workers):
+            part = nodes[bounds[i]:bounds[i + 1]]
+            for node in part:
+                self._shard_of[node.name] = i
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_shard_main, args=(child, part, filter_plugin, score_plugin,
+                                                            self.seed, self.cache_scores), daemon=True)
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+
+    def close(self) -> None:
+        for conn in self._conns:
+            conn.send(("stop",))
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._conns = []
+        self._processes = []
+
+    def __enter__(self) -> "ShardedScheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _ask(self, pod: Pod, shards: List[int]) -> List[ShardResult]:
+        # 先全部发出再依次接收，各分片并行计算
+        for i in shards:
+            self._conns[i].send(("evaluate", pod))
+        self.shard_requests += len(shards)
+        return [self._conns[i].recv() for i in shards]
+
+    def _observe_arrival(self, pod: Pod) -> None:
+        super()._observe_arrival(pod)
+        for conn in self._conns:
+            conn.send(("arrival", pod))
+
+    def _filter(self, pod: Pod, state: CycleState) -> List[Node]:
+        """询问分片，返回全局最高分的候选节点（按节点加入顺序），并把它们的 GPU 放置记入 state"""
+        # 任何 filter 的结果都是可绑定节点的子集：全局容量索引中放不下时不必询问分片
+        if not self.etcd.capacity_index.find(pod.cpu_milli, pod.memory_mib, pod.num_gpu, pod.gpu_milli):
+            return []
+        if self.probes is None:
+            shards = list(range(self.workers))
+            results = self._ask(pod, shards)
+        else:
+            shards = sorted(self._probe_rng.sample(range(self.workers), self.probes))
+            results = self._ask(pod, shards)
+            if all(result is None for result in results):
+                rest = [i for i in range(self.workers) if i not in shards]
+                shards += rest
+                results += self._ask(pod, rest)
+                order = sorted(range(len(shards)), key=shards.__getitem__)
+                results = [results[k] for k in order]
+
+        results = [result for result in results if result is not None]
+        if not results:
+            return []
+        best = max(result[0] for result in results)
+        candidates: List[Node] = []
+        for score, names, placements in results:
+            if score == best:
+                for name in names:
+                    candidates.append(self.etcd.nodes[name])
+                    if placements[name] is not None:
+                        state.propose_gpu_placement(name, placements[name])
+        return candidates
+
+    def _pick_node(self, pod: Pod, feasible_nodes: List[Node],
+                   state: CycleState) -> Tuple[Optional[Node], Optional[Tuple[int, ...]]]:
+        # 候选节点同分：与 select_best 相同的随机选取
+        target = self.score_plugin.select_best(feasible_nodes, [0.0] * len(feasible_nodes))
+        if target is None:
+            return None, None
+        return target, state.gpu_placements.get(target.name)
+
+    def _bind(self, pod: Pod, node: Node, gpu_ids: Optional[Tuple[int, ...]] = None) -> None:
+        # 在绑定前发送（Pod 仍是 Pending）；gpu_ids 为 None 时两边按相同的状态 best-fit，结果一致
+        self._conns[self._shard_of[node.name]].send(("bind", pod, node.name, self.current_time, gpu_ids))
+        super()._bind(pod, node, gpu_ids)
+
+    def _unbind(self, pod: Pod) -> None:
+        self._conns[self._shard_of[pod.bound_node]].send(("unbind", pod.name))
+        super()._unbind(pod)
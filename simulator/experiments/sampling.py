@@ -0,0 +1,113 @@
+"""节点采样（percentageOfNodesToScore）的吞吐量 / 调度质量权衡：同一配置分别以全量打分与
+不同的采样比例运行，报告打分耗时、吞吐量，以及碎片量、利用率、makespan 相对全量打分的变化。
+
+用法（在仓库根目录）：
+    python -m simulator.experiments.sampling --trace synthetic --nodes 2000 --pods 5000 \\
+        --score drift --percentages 0 5 10 25 50
+
+percentage=0 为 kube-scheduler 的自适应比例（50 - N/125，不低于 5%）；可行节点不少于
+--min-feasible 个（默认 100，与 kube-scheduler 相同）。
+"""
+from simulator.core.scheduler import Scheduler
+from simulator.core.metrics import TimeSeriesRecorder
+from simulator.core.node_sampling import MIN_FEASIBLE_NODES_TO_FIND, num_feasible_nodes_to_find
+from simulator.experiments.sweep import SCORE_PLUGINS
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.models.resource import get_target_pod_list_from_pods
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.utils.profiler import Profiler
+from simulator.utils.reader import get_h_nodes, get_h_pods
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+from dataclasses import dataclass
+from typing import List, Optional
+import argparse
+import copy
+import numpy as np
+import time
+
+@dataclass
+class SamplingResult:
+    percentage: Optional[int]  # None 表示全量打分
+    nodes_to_find: int
+    wall_time: float
+    score_time: float
+    mean_scored_nodes: float
+    makespan: int
+    cpu_utilization: float
+    gpu_utilization: float
+    # 采样点上的平均集群碎片量 / 平均 GPU 分配率
+    mean_fragmentation: float
+    mean_gpu_allocation: float
+
+def run_one(nodes: List[Node], pods: List[Pod], score: str, seed: int, percentage: Optional[int],
+            min_feasible: int = MIN_FEASIBLE_NODES_TO_FIND, interval: int = 600) -> SamplingResult:
+    nodes, pods = copy.deepcopy(nodes), copy.deepcopy(pods)
+    recorder = TimeSeriesRecorder(interval=interval, typical_pods=get_target_pod_list_from_pods(pods))
+    profiler = Profiler()
+    scheduler = Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), SCORE_PLUGINS[score](pods),
+                          seed=seed, recorder=recorder, profiler=profiler,
+                          percentage_of_nodes_to_score=percentage, min_feasible_nodes_to_find=min_feasible)
+    start = time.perf_counter()
+    metrics = scheduler.run(report=False)
+    wall = time.perf_counter() - start
+    report = profiler.report()
+    scored = report["observations"].get("scored_nodes", report["observations"].get("feasible_nodes"))
+    samples = recorder.to_arrays()
+    return SamplingResult(
+        percentage=percentage,
+        nodes_to_find=len(nodes) if percentage is None else num_feasible_nodes_to_find(len(nodes), percentage,
+                                                                                       min_feasible),
+        wall_time=wall,
+        score_time=report["phases"].get("score", {}).get("total", 0.0),
+        mean_scored_nodes=scored["mean"] if scored else 0.0,
+        makespan=metrics.makespan,
+        cpu_utilization=metrics.cpu_utilization,
+        gpu_utilization=metrics.gpu_utilization,
+        mean_fragmentation=float(np.nanmean(samples["fragmentation"])) if len(recorder) else 0.0,
+        mean_gpu_allocation=float(np.mean(samples["gpu_allocation"])) if len(recorder) else 0.0,
+    )
+
+def compare(nodes: List[Node], pods: List[Pod], score: str, seed: int, percentages: List[int],
+            min_feasible: int = MIN_FEASIBLE_NODES_TO_FIND, interval: int = 600) -> List[SamplingResult]:
+    """第一个结果是全量打分的基线"""
+    return [run_one(nodes, pods, score, seed, p, min_feasible, interval) for p in [None] + percentages]
+
+def _relative(value: float, base: float) -> str:
+    return f"{(value - base) / base * 100:+.2f}%" if base else "n/a"
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--score", choices=sorted(SCORE_PLUGINS), default="drift")
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--pods", type=int, default=3000)
+    parser.add_argument("--trace", choices=["openb", "synthetic"], default="synthetic")
+    parser.add_argument("--gpu-share", choices=["on", "off"], default="on")
+    parser.add_argument("--percentages", nargs="+", type=int, default=[0, 10, 25, 50])
+    parser.add_argument("--min-feasible", type=int, default=MIN_FEASIBLE_NODES_TO_FIND)
+    parser.add_argument("--interval", type=int, default=600, help="碎片量 / 分配率的采样间隔（仿真秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gpu_share = args.gpu_share == "on"
+    if args.trace == "openb":
+        nodes, pods = get_h_nodes(count=args.nodes, allow_gpu_share=gpu_share), get_h_pods(count=args.pods)
+    else:
+        nodes = synthetic_nodes(args.nodes, allow_gpu_share=gpu_share, seed=args.seed)
+        pods = list(synthetic_pods(args.pods, seed=args.seed))
+    results = compare(nodes, pods, args.score, args.seed, args.percentages, args.min_feasible, args.interval)
+
+    base = results[0]
+    print("\t".join(["percentage", "to_find", "scored", "wall_time", "score_time", "speedup", "makespan",
+                     "cpu_util", "gpu_util", "frag", "d_frag", "d_gpu_alloc"]))
+    for r in results:
+        print("\t".join(["full" if r.percentage is None else str(r.percentage), str(r.nodes_to_find),
+                         f"{r.mean_scored_nodes:.1f}", f"{r.wall_time:.2f}", f"{r.score_time:.2f}",
+                         f"{base.wall_time / r.wall_time:.2f}", str(r.makespan), f"{r.cpu_utilization:.4f}",
+                         f"{r.gpu_utilization:.4f}", f"{r.mean_fragmentation:.0f}",
+                         _relative(r.mean_fragmentation, base.mean_fragmentation),
+                         _relative(r.mean_gpu_allocation, base.mean_gpu_allocation)]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""分片仿真的扩展性与调度质量报告：同一配置分别用单进程 Scheduler 与不同工作进程数 / 采样数的
+ShardedScheduler 运行，报告吞吐量随工作进程数的变化，以及放置结果相对单进程调度器的偏离。
+
+用法（在仓库根目录）：
+    python -m simulator.experiments.sharding --trace synthetic --nodes 10000 --pods 20000 \\
+        --score drift --workers 1 2 4 8 --probes 0 2
+
+probes=0 表示询问全部分片（结果应与单进程逐位一致）；工作进程数超过 CPU 核数时没有加速。
+"""
+from simulator.core.scheduler import Scheduler
+from simulator.core.sharded import ShardedScheduler
+from simulator.experiments.sweep import SCORE_PLUGINS
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.utils.reader import get_h_nodes, get_h_pods
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import argparse
+import copy
+import os
+import time
+
+@dataclass
+class ShardingResult:
+    workers: int  # 0 表示单进程 Scheduler
+    probes: Optional[int]
+    wall_time: float
+    pods_per_second: float
+    makespan: int
+    gpu_utilization: float
+    completed_pods: int
+    # 首次放置与单进程调度器相同节点的 Pod 比例
+    same_node: float = 1.0
+    fingerprint: str = ""
+
+def _first_placements(scheduler: Scheduler) -> Dict[str, Optional[str]]:
+    placements: Dict[str, Optional[str]] = {}
+    for _, name, node, _ in scheduler.placement_log:
+        placements.setdefault(name, node)
+    return placements
+
+def run_one(nodes: List[Node], pods: List[Pod], score: str, seed: int,
+            workers: int = 0, probes: Optional[int] = None) -> Tuple[ShardingResult, Dict[str, Optional[str]]]:
+    nodes, pods = copy.deepcopy(nodes), copy.deepcopy(pods)
+    args = (nodes, pods, QueueSortFIFO(), FilterResourceFit(), SCORE_PLUGINS[score](pods))
+    start = time.perf_counter()
+    if workers == 0:
+        scheduler = Scheduler(*args, seed=seed)
+    else:
+        scheduler = ShardedScheduler(*args, workers=workers, probes=probes, seed=seed)
+    scheduler.enable_placement_log()
+    try:
+        metrics = scheduler.run(report=False)
+    finally:
+        if workers:
+            scheduler.close()
+    wall = time.perf_counter() - start
+    result = ShardingResult(workers=workers, probes=probes, wall_time=wall,
+                            pods_per_second=metrics.pods / wall if wall > 0 else 0.0,
+                            makespan=metrics.makespan, gpu_utilization=metrics.gpu_utilization,
+                            completed_pods=metrics.completed_pods, fingerprint=scheduler.fingerprint())
+    return result, _first_placements(scheduler)
+
+def compare(nodes: List[Node], pods: List[Pod], score: str, seed: int,
+            workers: List[int], probes: List[Optional[int]]) -> List[ShardingResult]:
+    """第一个结果是单进程基线，其余按 (workers, probes) 排列；probes 超过 workers 的组合跳过"""
+    baseline, expected = run_one(nodes, pods, score, seed)
+    results = [baseline]
+    for w in workers:
+        for p in probes:
+            if p is not None and p > w:
+                continue
+            result, placements = run_one(nodes, pods, score, seed, workers=w, probes=p)
+            same = sum(1 for name, node in placements.items() if expected.get(name) == node)
+            result.same_node = same / len(expected) if expected else 1.0
+            results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--score", choices=sorted(SCORE_PLUGINS), default="k8s")
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--pods", type=int, default=5000)
+    parser.add_argument("--trace", choices=["openb", "synthetic"], default="synthetic")
+    parser.add_argument("--gpu-share", choices=["on", "off"], default="on")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--probes", nargs="+", type=int, default=[0])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gpu_share = args.gpu_share == "on"
+    if args.trace == "openb":
+        nodes, pods = get_h_nodes(count=args.nodes, allow_gpu_share=gpu_share), get_h_pods(count=args.pods)
+    else:
+        nodes = synthetic_nodes(args.nodes, allow_gpu_share=gpu_share, seed=args.seed)
+        pods = list(synthetic_pods(args.pods, seed=args.seed))
+    results = compare(nodes, pods, args.score, args.seed, args.workers, [p or None for p in args.probes])
+
+    print(f"cpu cores: {os.cpu_count()}")
+    base = results[0]
+    print("\t".join(["workers", "probes", "wall_time", "pods/s", "speedup", "makespan", "gpu_util", "same_node",
+                     "identical"]))
+    for r in results:
+        print("\t".join([str(r.workers) if r.workers else "single", str(r.probes or "all"), f"{r.wall_time:.2f}",
+                         f"{r.pods_per_second:.1f}", f"{base.wall_time / r.wall_time:.2f}", str(r.makespan),
+                         f"{r.gpu_utilization:.4f}", f"{r.same_node:.4f}", str(r.fingerprint == base.fingerprint)]))
+
+if __name__ == "__main__":
+    main()
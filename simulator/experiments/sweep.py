@@ -0,0 +1,190 @@
+"""参数扫描：把多组 Scheduler 配置分发到进程池并行运行。
+
+trace 在父进程中解析一次（reader 的列式缓存），子进程通过 fork 继承，不再重复解析；
+每个配置的结果追加写入 JSONL 检查点，中断后重新运行会跳过已完成的配置。
+
+用法（在仓库根目录）：
+    python -m simulator.experiments.sweep --queue fifo sjf --score k8s binpack drift \\
+        --nodes 100 --pods 2000 --gpu-share on off --seeds 0 1 2 --checkpoint sweep.jsonl
+"""
+from simulator.core.scheduler import Scheduler
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.models.resource import get_target_pod_list_from_pods
+from simulator.plugins.interface import QueueSortPlugin, ScorePlugin
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.queue_sort.sjf import QueueSortShortJobFirst
+from simulator.plugins.queue_sort.priority import QueueSortPriority
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.plugins.score.binpack import ScoreBinPack
+from simulator.plugins.score.drift import ScoreDrift
+from simulator.plugins.chain import ScoreChain
+from simulator.utils.reader import get_h_nodes, get_h_pods, load_h_node_columns, load_h_pod_columns
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+
+QUEUE_SORTERS: Dict[str, Callable[[], QueueSortPlugin]] = {
+    "fifo": QueueSortFIFO,
+    "sjf": QueueSortShortJobFirst,
+    "priority": QueueSortPriority,
+}
+
+SCORE_PLUGINS: Dict[str, Callable[[List[Pod]], ScorePlugin]] = {
+    "k8s": lambda pods: ScoreKubernetes(),
+    "binpack": lambda pods: ScoreBinPack(),
+    "drift": lambda pods: ScoreDrift(typical_pods=get_target_pod_list_from_pods(pods)),
+    "drift+binpack": lambda pods: ScoreChain([(ScoreDrift(typical_pods=get_target_pod_list_from_pods(pods)), 1.0),
+                                              (ScoreBinPack(), 1.0)]),
+}
+
+@dataclass(frozen=True)
+class SweepConfig:
+    queue_sort: str
+    score: str
+    nodes: int
+    pods: int
+    gpu_share: bool
+    seed: int = 0
+    # openb：读取 data/H 下的 trace；synthetic：simulator.utils.synthetic 生成
+    trace: str = "openb"
+    use_trace_time: bool = False
+
+    def key(self) -> str:
+        """检查点中标识配置的字符串"""
+        return json.dumps(asdict(self), sort_keys=True)
+
+@dataclass
+class RunResult:
+    config: SweepConfig
+    makespan: int
+    cpu_utilization: float
+    gpu_utilization: float
+    completed_pods: int
+    pods: int
+    wall_time: float
+
+    def to_json(self) -> str:
+        record = asdict(self)
+        record["key"] = self.config.key()
+        return json.dumps(record, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, line: str) -> "RunResult":
+        record = json.loads(line)
+        record.pop("key", None)
+        record["config"] = SweepConfig(**record["config"])
+        return cls(**record)
+
+def grid(queue_sorts: Iterable[str], scores: Iterable[str], node_counts: Iterable[int], pod_counts: Iterable[int],
+         gpu_shares: Iterable[bool], seeds: Iterable[int], trace: str = "openb",
+         use_trace_time: bool = False) -> List[SweepConfig]:
+    """笛卡尔积生成配置列表"""
+    return [SweepConfig(q, s, n, p, g, seed, trace, use_trace_time)
+            for q, s, n, p, g, seed in itertools.product(queue_sorts, scores, node_counts, pod_counts, gpu_shares, seeds)]
+
+def _build_workload(config: SweepConfig) -> Tuple[List[Node], List[Pod]]:
+    if config.trace == "synthetic":
+        return (synthetic_nodes(config.nodes, config.gpu_share, seed=config.seed),
+                list(synthetic_pods(config.pods, seed=config.seed)))
+    if config.trace == "openb":
+        return (get_h_nodes(count=config.nodes, allow_gpu_share=config.gpu_share),
+                get_h_pods(count=config.pods, use_trace_time=config.use_trace_time))
+    raise ValueError(f"unknown trace: {config.trace}")
+
+def run_config(config: SweepConfig) -> RunResult:
+    """运行单个配置（在子进程中执行）"""
+    nodes, pods = _build_workload(config)
+    # 每个配置使用独立的仿真级种子，结果与执行顺序、所在进程无关
+    scheduler = Scheduler(nodes, pods, QUEUE_SORTERS[config.queue_sort](), FilterResourceFit(),
+                          SCORE_PLUGINS[config.score](pods), seed=config.seed)
+    metrics = scheduler.run(report=False)
+    return RunResult(config=config, makespan=metrics.makespan, cpu_utilization=metrics.cpu_utilization,
+                     gpu_utilization=metrics.gpu_utilization, completed_pods=metrics.completed_pods,
+                     pods=metrics.pods, wall_time=metrics.wall_time)
+
+def load_checkpoint(path: str) -> Dict[str, RunResult]:
+    done: Dict[str, RunResult] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                result = RunResult.from_json(line)
+            except (ValueError, TypeError, KeyError):
+                continue  # 中断时写了一半的行
+            done[result.config.key()] = result
+    return done
+
+def run_sweep(configs: List[SweepConfig], max_workers: Optional[int] = None,
+              checkpoint: Optional[str] = None,
+              on_result: Optional[Callable[[RunResult], None]] = None) -> List[RunResult]:
+    """并行运行所有配置，返回与 configs 顺序一致的结果。
+    checkpoint 指定 JSONL 文件时，已记录的配置直接复用，新结果完成一个追加一个。
+    """
+    done = load_checkpoint(checkpoint) if checkpoint else {}
+    todo = [c for c in configs if c.key() not in done]
+
+    if todo:
+        # 在 fork 之前解析 trace，子进程继承进程内缓存
+        if any(c.trace == "openb" for c in todo):
+            load_h_node_columns()
+            load_h_pod_columns()
+        workers = max_workers or os.cpu_count() or 1
+        out = open(checkpoint, "a") if checkpoint else None
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(todo)),
+                                     mp_context=multiprocessing.get_context("fork")) as pool:
+                futures = [pool.submit(run_config, c) for c in todo]
+                for future in as_completed(futures):
+                    result = future.result()
+                    done[result.config.key()] = result
+                    if out is not None:
+                        out.write(result.to_json() + "\n")
+                        out.flush()
+                    if on_result is not None:
+                        on_result(result)
+        finally:
+            if out is not None:
+                out.close()
+
+    return [done[c.key()] for c in configs]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queue", nargs="+", choices=sorted(QUEUE_SORTERS), default=["fifo"])
+    parser.add_argument("--score", nargs="+", choices=sorted(SCORE_PLUGINS), default=["k8s", "drift"])
+    parser.add_argument("--nodes", nargs="+", type=int, default=[10])
+    parser.add_argument("--pods", nargs="+", type=int, default=[800])
+    parser.add_argument("--gpu-share", nargs="+", choices=["on", "off"], default=["on"])
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--trace", choices=["openb", "synthetic"], default="openb")
+    parser.add_argument("--use-trace-time", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default=None)
+    args = parser.parse_args()
+
+    configs = grid(args.queue, args.score, args.nodes, args.pods, [g == "on" for g in args.gpu_share], args.seeds,
+                   args.trace, args.use_trace_time)
+    results = run_sweep(configs, args.workers, args.checkpoint,
+                        on_result=lambda r: print(f"done: {r.config.key()} ({r.wall_time:.1f}s)", flush=True))
+
+    columns = [f.name for f in fields(SweepConfig)]
+    print("\t".join(columns + ["makespan", "cpu_util", "gpu_util", "completed", "wall_time"]))
+    for r in results:
+        print("\t".join([str(getattr(r.config, c)) for c in columns] +
+                        [str(r.makespan), f"{r.cpu_utilization:.4f}", f"{r.gpu_utilization:.4f}",
+                         f"{r.completed_pods}/{r.pods}", f"{r.wall_time:.2f}"]))
+
+if __name__ == "__main__":
+    main()
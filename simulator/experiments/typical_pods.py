@@ -0,0 +1,135 @@
+"""压缩 / 在线 typical pods 的打分开销与调度质量权衡：同一配置分别以完整的 typical pods、
+压缩到前 K 个代表规格（可先量化）以及按滑动窗口在线更新的 typical pods 运行 DRIFT，报告
+代表规格数、打分耗时与加速比，以及碎片量、利用率、首次放置相对完整分布的偏离。
+
+碎片量统一相对完整的静态分布（EtcdMock 的 frag_tracker）按时间加权平均，各变体之间可比。
+批量打分时 typical pods 只是 NumPy 计算的一个维度，压缩带来的加速主要体现在逐节点打分
+（--scalar，Fragment 逐个规格循环）上。
+
+用法（在仓库根目录）：
+    python -m simulator.experiments.typical_pods --trace openb --nodes 1000 --pods 5000 \\
+        --top-k 4 8 16 --mass 0.95 --cpu-quantum 1000 --gpu-quantum 100 --window 1000
+"""
+from simulator.core.scheduler import Scheduler
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.models.resource import TargetPod, get_target_pod_list_from_pods
+from simulator.models.typical_pods import TypicalPodWindow, compress_target_pods
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.drift import ScoreDrift
+from simulator.utils.profiler import Profiler
+from simulator.utils.reader import get_h_nodes, get_h_pods
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import argparse
+import copy
+import time
+
+@dataclass
+class TypicalPodsResult:
+    variant: str
+    typical_shapes: int  # 在线模式为运行结束时的代表规格数
+    wall_time: float
+    score_time: float
+    fragment_evaluations: int
+    makespan: int
+    cpu_utilization: float
+    gpu_utilization: float
+    mean_fragmentation: float
+    # 首次放置与完整分布相同节点的 Pod 比例
+    same_node: float = 1.0
+
+def _first_placements(scheduler: Scheduler) -> Dict[str, Optional[str]]:
+    placements: Dict[str, Optional[str]] = {}
+    for _, name, node, _ in scheduler.placement_log:
+        placements.setdefault(name, node)
+    return placements
+
+def run_one(nodes: List[Node], pods: List[Pod], seed: int, variant: str, typical_pods: List[TargetPod],
+            reference: List[TargetPod], window: Optional[TypicalPodWindow] = None, batched: bool = True):
+    nodes, pods, window = copy.deepcopy(nodes), copy.deepcopy(pods), copy.deepcopy(window)
+    profiler = Profiler()
+    plugin = ScoreDrift(typical_pods=typical_pods, batched=batched, window=window)
+    scheduler = Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), plugin, seed=seed,
+                          profiler=profiler, fragmentation_typical_pods=reference)
+    scheduler.enable_placement_log()
+    start = time.perf_counter()
+    metrics = scheduler.run(report=False)
+    wall = time.perf_counter() - start
+    report = profiler.report()
+    result = TypicalPodsResult(
+        variant=variant,
+        typical_shapes=len(plugin.typical_pods),
+        wall_time=wall,
+        score_time=report["phases"].get("score", {}).get("total", 0.0),
+        fragment_evaluations=int(report["counters"].get("drift.fragment_evaluations", 0)),
+        makespan=metrics.makespan,
+        cpu_utilization=metrics.cpu_utilization,
+        gpu_utilization=metrics.gpu_utilization,
+        mean_fragmentation=metrics.mean_fragmentation or 0.0,
+    )
+    return result, _first_placements(scheduler)
+
+def compare(nodes: List[Node], pods: List[Pod], seed: int, top_ks: List[int], mass: float = 1.0,
+            cpu_quantum: int = 0, gpu_quantum: int = 0, window: Optional[int] = None,
+            refresh_every: int = 100, batched: bool = True) -> List[TypicalPodsResult]:
+    """第一个结果是完整 typical pods 的基线；window 给定时最后一个结果为在线模式
+    （初始为完整分布，之后按最近 window 个到达 Pod 更新，压缩参数与静态变体相同）"""
+    full = get_target_pod_list_from_pods(pods)
+    baseline, expected = run_one(nodes, pods, seed, "full", full, full, batched=batched)
+    variants = [(f"top{k}", compress_target_pods(full, top_k=k, mass=mass, cpu_quantum=cpu_quantum,
+                                                  gpu_quantum=gpu_quantum), None) for k in top_ks]
+    if window is not None:
+        online = TypicalPodWindow(size=window, refresh_every=refresh_every, top_k=max(top_ks) if top_ks else None,
+                                  mass=mass, cpu_quantum=cpu_quantum, gpu_quantum=gpu_quantum)
+        variants.append((f"online{window}", full, online))
+    results = [baseline]
+    for name, typical, online in variants:
+        result, placements = run_one(nodes, pods, seed, name, typical, full, online, batched)
+        same = sum(1 for pod, node in placements.items() if expected.get(pod) == node)
+        result.same_node = same / len(expected) if expected else 1.0
+        results.append(result)
+    return results
+
+def _relative(value: float, base: float) -> str:
+    return f"{(value - base) / base * 100:+.2f}%" if base else "n/a"
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--pods", type=int, default=3000)
+    parser.add_argument("--trace", choices=["openb", "synthetic"], default="synthetic")
+    parser.add_argument("--gpu-share", choices=["on", "off"], default="on")
+    parser.add_argument("--top-k", nargs="+", type=int, default=[4, 8, 16])
+    parser.add_argument("--mass", type=float, default=1.0, help="代表规格覆盖的概率质量")
+    parser.add_argument("--cpu-quantum", type=int, default=0, help="CPU 量化步长（milli），0 表示不量化")
+    parser.add_argument("--gpu-quantum", type=int, default=0, help="部分 GPU 请求的量化步长（milli），0 表示不量化")
+    parser.add_argument("--window", type=int, default=None, help="在线模式的滑动窗口大小，不给出时不运行在线模式")
+    parser.add_argument("--refresh-every", type=int, default=100)
+    parser.add_argument("--scalar", action="store_true", help="逐节点打分（不使用批量 NumPy 计算）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gpu_share = args.gpu_share == "on"
+    if args.trace == "openb":
+        nodes, pods = get_h_nodes(count=args.nodes, allow_gpu_share=gpu_share), get_h_pods(count=args.pods)
+    else:
+        nodes = synthetic_nodes(args.nodes, allow_gpu_share=gpu_share, seed=args.seed)
+        pods = list(synthetic_pods(args.pods, seed=args.seed))
+    results = compare(nodes, pods, args.seed, args.top_k, args.mass, args.cpu_quantum, args.gpu_quantum,
+                      args.window, args.refresh_every, batched=not args.scalar)
+
+    base = results[0]
+    print("\t".join(["variant", "shapes", "wall_time", "score_time", "speedup", "frag_evals", "makespan",
+                     "cpu_util", "gpu_util", "frag", "d_frag", "same_node"]))
+    for r in results:
+        print("\t".join([r.variant, str(r.typical_shapes), f"{r.wall_time:.2f}", f"{r.score_time:.2f}",
+                         f"{base.score_time / r.score_time:.2f}" if r.score_time else "n/a",
+                         str(r.fragment_evaluations), str(r.makespan), f"{r.cpu_utilization:.4f}",
+                         f"{r.gpu_utilization:.4f}", f"{r.mean_fragmentation:.0f}",
+                         _relative(r.mean_fragmentation, base.mean_fragmentation), f"{r.same_node:.4f}"]))
+
+if __name__ == "__main__":
+    main()
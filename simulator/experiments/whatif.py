@@ -0,0 +1,34 @@
+"""what-if 分支：从同一个快照出发并行运行多个分支，避免为每个策略重复仿真相同的前缀。
+
+    warm = Scheduler(...)
+    warm.run(report=False, until=T)
+    results = run_branches(warm.snapshot(), [branch_a, branch_b])
+
+分支是接收恢复后的 Scheduler 并返回结果的顶层函数（或 functools.partial），在 fork 出的
+子进程中执行；快照在 fork 前放入模块全局变量，子进程以写时复制方式共享，不逐个任务传输。
+"""
+from simulator.core.scheduler import Scheduler
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+import multiprocessing
+import os
+
+Branch = Callable[[Scheduler], Any]
+
+_snapshot: Optional[bytes] = None
+
+def _run_branch(branch: Branch) -> Any:
+    return branch(Scheduler.restore(_snapshot))
+
+def run_branches(snapshot: bytes, branches: List[Branch], max_workers: Optional[int] = None) -> List[Any]:
+    """在进程池中运行所有分支，返回与 branches 顺序一致的结果"""
+    global _snapshot
+    if not branches:
+        return []
+    _snapshot = snapshot
+    try:
+        workers = min(max_workers or os.cpu_count() or 1, len(branches))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+            return list(pool.map(_run_branch, branches))
+    finally:
+        _snapshot = None
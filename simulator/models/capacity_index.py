@@ -0,0 +1,139 @@
+from simulator.models.node import Node
+from bisect import bisect_left, insort
+from typing import Dict, List, Set, Tuple
+
+# GPU 空闲 milli 的量化粒度：第 k 级表示空闲 >= k * GPU_MILLI_QUANTUM
+GPU_MILLI_QUANTUM = 50
+GPU_MILLI_LEVELS = 1000 // GPU_MILLI_QUANTUM + 1
+
+class CapacityIndex:
+    """EtcdMock 的二级容量索引，由 bind/unbind 增量维护。
+
+    - cpu / memory：按空闲量排序的 (free, order) 列表，二分即可得到满足请求的节点后缀；
+    - gpu：对每个量化级别 k，按“可用 GPU 数”分桶保存节点
+      （共享节点统计空闲 >= k*Q 的 GPU，独占节点统计完全空闲的 GPU）。
+
+    查询时先取三者中最小的候选集合，再对候选节点做 O(1) 的精确校验，
+    结果按节点加入顺序返回，与逐节点扫描的顺序一致。
+    """
+
+    def __init__(self):
+        self._order: Dict[str, int] = {}
+        self._nodes: Dict[str, Node] = {}
+        self._cpu: List[Tuple[int, int]] = []
+        self._mem: List[Tuple[int, int]] = []
+        # node -> 每个级别的可用 GPU 数
+        self._gpu_fit: Dict[str, List[int]] = {}
+        # level -> {可用 GPU 数: 节点集合}
+        self._gpu_buckets: List[Dict[int, Set[str]]] = [dict() for _ in range(GPU_MILLI_LEVELS)]
+        # 插入时记录的 cpu/mem 键，用于更新时定位旧条目
+        self._keys: Dict[str, Tuple[int, int]] = {}
+        self._names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @staticmethod
+    def _gpu_fit_counts(node: Node) -> List[int]:
+        counts = [0] * GPU_MILLI_LEVELS
+        for gid in range(node.gpu_count):
+            if not node.gpu_share_enabled and len(node.gpu_pods[gid]) > 0:
+                continue
+            top = min(node.gpu_free_milli[gid] // GPU_MILLI_QUANTUM, GPU_MILLI_LEVELS - 1)
+            for k in range(top + 1):
+                counts[k] += 1
+        return counts
+
+    def add(self, node: Node) -> None:
+        if node.name in self._nodes:
+            self.update(node)
+            return
+        self._order[node.name] = len(self._names)
+        self._names.append(node.name)
+        self._nodes[node.name] = node
+        self._insert(node)
+
+    def update(self, node: Node) -> None:
+        """节点资源变化后调用（bind/unbind），O(log N + 级别数)"""
+        self._remove(node.name)
+        self._insert(node)
+
+    def _insert(self, node: Node) -> None:
+        order = self._order[node.name]
+        insort(self._cpu, (node.cpu_milli_free, order))
+        insort(self._mem, (node.memory_mib_free, order))
+        self._keys[node.name] = (node.cpu_milli_free, node.memory_mib_free)
+        fit = self._gpu_fit_counts(node)
+        self._gpu_fit[node.name] = fit
+        for k, cnt in enumerate(fit):
+            self._gpu_buckets[k].setdefault(cnt, set()).add(node.name)
+
+    def _remove(self, node_name: str) -> None:
+        order = self._order[node_name]
+        cpu_free, mem_free = self._keys.pop(node_name)
+        del self._cpu[bisect_left(self._cpu, (cpu_free, order))]
+        del self._mem[bisect_left(self._mem, (mem_free, order))]
+        for k, cnt in enumerate(self._gpu_fit.pop(node_name)):
+            bucket = self._gpu_buckets[k][cnt]
+            bucket.discard(node_name)
+            if not bucket:
+                del self._gpu_buckets[k][cnt]
+
+    @staticmethod
+    def _gpu_fits(node: Node, num_gpu: int, gpu_milli: int) -> bool:
+        # 与 EtcdMock.check_bindable 的 GPU 判断一致
+        cnt = 0
+        for gid in range(node.gpu_count):
+            if node.gpu_free_milli[gid] >= gpu_milli and (node.gpu_share_enabled or len(node.gpu_pods[gid]) == 0):
+                cnt += 1
+                if cnt >= num_gpu:
+                    return True
+        return False
+
+    def find(self, cpu_milli: int, memory_mib: int, num_gpu: int, gpu_milli: int) -> List[Node]:
+        """返回能容纳 (cpu, mem, num_gpu, gpu_milli) 的全部节点，按节点加入顺序"""
+        cpu_start = bisect_left(self._cpu, (cpu_milli, -1))
+        mem_start = bisect_left(self._mem, (memory_mib, -1))
+        n_cpu = len(self._cpu) - cpu_start
+        n_mem = len(self._mem) - mem_start
+        if n_cpu == 0 or n_mem == 0:
+            return []
+
+        gpu_exact = True
+        gpu_candidates: Set[str] = set()
+        n_gpu = len(self._nodes)
+        if num_gpu > 0:
+            level = min(gpu_milli // GPU_MILLI_QUANTUM, GPU_MILLI_LEVELS - 1)
+            # gpu_milli 恰好落在量化级别上时桶计数是精确的，否则只是上界
+            gpu_exact = (gpu_milli == level * GPU_MILLI_QUANTUM)
+            for cnt, names in self._gpu_buckets[level].items():
+                if cnt >= num_gpu:
+                    gpu_candidates |= names
+            n_gpu = len(gpu_candidates)
+            if n_gpu == 0:
+                return []
+
+        # 以最小的候选集合为基础，逐个做 O(1) 校验
+        smallest = min(n_cpu, n_mem, n_gpu)
+        if num_gpu > 0 and smallest == n_gpu:
+            orders = [self._order[name] for name in gpu_candidates]
+        elif smallest == n_cpu:
+            orders = [order for _, order in self._cpu[cpu_start:]]
+        else:
+            orders = [order for _, order in self._mem[mem_start:]]
+        orders.sort()
+
+        feasible: List[Node] = []
+        for order in orders:
+            name = self._names[order]
+            node = self._nodes[name]
+            if node.cpu_milli_free < cpu_milli or node.memory_mib_free < memory_mib:
+                continue
+            if num_gpu > 0:
+                if gpu_exact:
+                    if self._gpu_fit[name][level] < num_gpu:
+                        continue
+                elif not self._gpu_fits(node, num_gpu, gpu_milli):
+                    continue
+            feasible.append(node)
+        return feasible
@@ -0,0 +1,131 @@
+from simulator.models.node import Node
+from typing import Dict, List, Optional
+import numpy as np
+
+class ClusterArrays:
+    """以 NumPy 数组保存的集群状态（每个节点一行），由 EtcdMock.bind/unbind 同步。
+
+    - cpu_milli_free / memory_mib_free：长度 N 的 int64 向量
+    - gpu_free_milli：N x G 的 int64 矩阵，不存在的 GPU 位置填 -1（任何请求都放不下）
+    - gpu_pod_count：N x G，每张 GPU 上的 Pod 数（独占模式下只能使用为 0 的 GPU）
+    - gpu_share：GPU 共享开关掩码
+    - gpu_avail_milli：可供新 Pod 使用的 milli（独占模式下已被占用的 GPU 记为 -1），供可行性判断
+
+    Node 对象仍然是权威的逐节点视图，数组只在 sync_node 时整行刷新（<= G 个元素）。
+    """
+
+    def __init__(self, capacity: int = 64, max_gpus: int = 8):
+        self.size = 0
+        self.names: List[str] = []
+        self.nodes: List[Node] = []
+        self.index: Dict[str, int] = {}
+        self._alloc(max(1, capacity), max_gpus)
+
+    _VECTOR_FIELDS = ("cpu_milli_total", "cpu_milli_free", "memory_mib_total", "memory_mib_free",
+                      "gpu_count", "pod_count")
+
+    def _alloc(self, capacity: int, max_gpus: int) -> None:
+        """按新的容量（行数 / 每节点 GPU 上限）重新分配数组并拷贝已有的行"""
+        n = self.size
+        for attr in self._VECTOR_FIELDS:
+            new = np.zeros(capacity, dtype=np.int64)
+            if n > 0:
+                new[:n] = getattr(self, attr)[:n]
+            setattr(self, attr, new)
+        share = np.zeros(capacity, dtype=bool)
+        gpu_free = np.full((capacity, max_gpus), -1, dtype=np.int64)
+        gpu_pods = np.zeros((capacity, max_gpus), dtype=np.int64)
+        gpu_avail = np.full((capacity, max_gpus), -1, dtype=np.int64)
+        if n > 0:
+            share[:n] = self._gpu_share[:n]
+            g = self.gpu_free_milli.shape[1]
+            gpu_free[:n, :g] = self.gpu_free_milli[:n]
+            gpu_pods[:n, :g] = self.gpu_pod_count[:n]
+            gpu_avail[:n, :g] = self.gpu_avail_milli[:n]
+        self._gpu_share = share
+        self.gpu_free_milli = gpu_free
+        self.gpu_pod_count = gpu_pods
+        self.gpu_avail_milli = gpu_avail
+
+    @property
+    def max_gpus(self) -> int:
+        return self.gpu_free_milli.shape[1]
+
+    @property
+    def gpu_share(self) -> np.ndarray:
+        return self._gpu_share[:self.size]
+
+    def add_node(self, node: Node, pod_count: int = 0) -> int:
+        if node.name in self.index:
+            idx = self.index[node.name]
+            self.nodes[idx] = node
+            self.sync_node(node, pod_count)
+            return idx
+        capacity = self.cpu_milli_free.shape[0]
+        if self.size == capacity or node.gpu_count > self.max_gpus:
+            self._alloc(capacity * 2 if self.size == capacity else capacity,
+                        max(self.max_gpus, node.gpu_count))
+        idx = self.size
+        self.size += 1
+        self.names.append(node.name)
+        self.nodes.append(node)
+        self.index[node.name] = idx
+        self.cpu_milli_total[idx] = node.cpu_milli_total
+        self.memory_mib_total[idx] = node.memory_mib_total
+        self.gpu_count[idx] = node.gpu_count
+        self._gpu_share[idx] = node.gpu_share_enabled
+        self.sync_node(node, pod_count)
+        return idx
+
+    def sync_node(self, node: Node, pod_count: int = 0) -> None:
+        """用 Node 对象的当前状态刷新对应行"""
+        idx = self.index[node.name]
+        self.cpu_milli_free[idx] = node.cpu_milli_free
+        self.memory_mib_free[idx] = node.memory_mib_free
+        g = node.gpu_count
+        if g > 0:
+            pod_counts = [len(pods) for pods in node.gpu_pods]
+            self.gpu_free_milli[idx, :g] = node.gpu_free_milli
+            self.gpu_pod_count[idx, :g] = pod_counts
+            if node.gpu_share_enabled:
+                self.gpu_avail_milli[idx, :g] = node.gpu_free_milli
+            else:
+                self.gpu_avail_milli[idx, :g] = [free if cnt == 0 else -1
+                                                 for free, cnt in zip(node.gpu_free_milli, pod_counts)]
+        self.pod_count[idx] = pod_count
+
+    def indices_of(self, nodes: List[Node]) -> np.ndarray:
+        index = self.index
+        return np.fromiter((index[node.name] for node in nodes), dtype=np.int64, count=len(nodes))
+
+    # --- vectorized kernels ---
+    def feasible_mask(self, cpu_milli: int, memory_mib: int, num_gpu: int, gpu_milli: int) -> np.ndarray:
+        """与 EtcdMock.check_bindable 等价的全节点可行性掩码"""
+        n = self.size
+        mask = self.cpu_milli_free[:n] >= cpu_milli
+        mask &= self.memory_mib_free[:n] >= memory_mib
+        if num_gpu > 0:
+            usable = self.gpu_avail_milli[:n] >= gpu_milli
+            mask &= np.count_nonzero(usable, axis=1) >= num_gpu
+        return mask
+
+    def feasible_matrix(self, cpu_milli: np.ndarray, memory_mib: np.ndarray, num_gpu: np.ndarray,
+                        gpu_milli: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """K 个请求（每个参数长度 K）对 rows 行节点（默认全部）的可行性矩阵 K x R，每行与 feasible_mask 相同"""
+        if rows is None:
+            rows = np.arange(self.size)
+        fit = self.cpu_milli_free[rows][None, :] >= cpu_milli[:, None]
+        fit &= self.memory_mib_free[rows][None, :] >= memory_mib[:, None]
+        usable = np.count_nonzero(self.gpu_avail_milli[rows][None, :, :] >= gpu_milli[:, None, None], axis=2)
+        fit &= usable >= num_gpu[:, None]
+        return fit
+
+    def cpu_utilization(self, idx: np.ndarray) -> np.ndarray:
+        total = self.cpu_milli_total[idx]
+        used = total - self.cpu_milli_free[idx]
+        return np.divide(used, total, out=np.zeros(len(idx), dtype=np.float64), where=total > 0)
+
+    def memory_utilization(self, idx: np.ndarray) -> np.ndarray:
+        total = self.memory_mib_total[idx]
+        used = total - self.memory_mib_free[idx]
+        return np.divide(used, total, out=np.zeros(len(idx), dtype=np.float64), where=total > 0)
@@ -1,13 +1,25 @@
-from typing import Dict, Optional, Set, List
+from typing import Dict, Optional, Sequence, Set, List
+import numpy as np
 
 from simulator.models.node import Node
 from simulator.models.pod import Pod, PodStatus
+from simulator.models.capacity_index import CapacityIndex
+from simulator.models.gpu_slots import GpuSlots
+from simulator.models.priority_index import PriorityIndex
+from simulator.models.frag_tracker import FragmentationTracker
+from simulator.models.resource import TargetPod
+from simulator.models.cluster_state import ClusterArrays
 
 class EtcdMock:
-    def __init__(self):
+    def __init__(self, vectorized: bool = False, retain_completed: bool = True):
+        """retain_completed=False 时已完成的 Pod 从 pods 中删除，只累计到 completed_* 聚合计数中，
+        长 trace 回放时内存只与在途 Pod 数量相关
+        """
         self.nodes: Dict[str, Node] = {}
         self.pods: Dict[str, Pod] = {}
         self.node_pods: Dict[str, Set[str]] = {}
+        # per-node GPU slots sorted by free milli (updated by bind/unbind)
+        self.gpu_slots: Dict[str, GpuSlots] = {}
         self.pod_node: Dict[str, str] = {}
 
         # pod status indices
@@ -16,10 +28,76 @@ class EtcdMock:
         self.completed_pods: Set[str] = set()
         self.failed_pods: Set[str] = set()
 
+        # completed pod aggregates (maintained by unbind, independent of retain_completed)
+        self.retain_completed = retain_completed
+        self.completed_count: int = 0
+        self.completed_cpu_milli_time: int = 0
+        self.completed_gpu_milli_time: int = 0
+
+        # cluster totals / allocated resources (maintained by add_node, bind and unbind)
+        self.total_cpu_milli: int = 0
+        self.total_memory_mib: int = 0
+        self.total_gpu_milli: int = 0
+        self.allocated_cpu_milli: int = 0
+        self.allocated_memory_mib: int = 0
+        self.allocated_gpu_milli: int = 0
+
+        # node capacity index (updated incrementally by bind/unbind)
+        self.capacity_index = CapacityIndex()
+        # change versions: bumped whenever a node's resources change (bind/unbind)
+        self.node_versions: Dict[str, int] = {}
+        self.cluster_version: int = 0
+        # optional array-backed cluster state (kept in sync by bind/unbind)
+        self.arrays: Optional[ClusterArrays] = ClusterArrays() if vectorized else None
+        # optional running-pod priority index for preemption (enable_priority_index)
+        self.priority_index: Optional[PriorityIndex] = None
+        self.evicted_count: int = 0
+        # optional per-node / cluster-wide fragmentation accounting (enable_fragmentation_tracker)
+        self.frag_tracker: Optional[FragmentationTracker] = None
+        # 所有随节点状态更新的碎片量账本（frag_tracker 与 add_fragmentation_tracker 注册的）
+        self._frag_trackers: List[FragmentationTracker] = []
+
     # --- basic CRUD ---
     def add_node(self, node: Node) -> None:
+        old = self.nodes.get(node.name)
+        if old is not None:
+            self.total_cpu_milli -= old.cpu_milli_total
+            self.total_memory_mib -= old.memory_mib_total
+            self.total_gpu_milli -= 1000 * old.gpu_count
+        self.total_cpu_milli += node.cpu_milli_total
+        self.total_memory_mib += node.memory_mib_total
+        self.total_gpu_milli += 1000 * node.gpu_count
         self.nodes[node.name] = node
         self.node_pods.setdefault(node.name, set())
+        self.gpu_slots[node.name] = GpuSlots(node)
+        self.node_versions[node.name] = self.node_versions.get(node.name, -1) + 1
+        self.cluster_version += 1
+        self.capacity_index.add(node)
+        if self.arrays is not None:
+            self.arrays.add_node(node, len(self.node_pods[node.name]))
+        for tracker in self._frag_trackers:
+            tracker.update(node)
+
+    def enable_fragmentation_tracker(self, typical_pods: List[TargetPod]) -> FragmentationTracker:
+        """开始维护相对 typical_pods 的逐节点与全集群碎片量（bind/unbind 时只更新该节点）"""
+        self.frag_tracker = self.add_fragmentation_tracker(FragmentationTracker(typical_pods))
+        return self.frag_tracker
+
+    def add_fragmentation_tracker(self, tracker: FragmentationTracker) -> FragmentationTracker:
+        """注册一个额外的碎片量账本（如 TimeSeriesRecorder 自己的 typical_pods），随节点状态增量更新"""
+        for node in self.nodes.values():
+            tracker.update(node)
+        self._frag_trackers.append(tracker)
+        return tracker
+
+    def enable_priority_index(self) -> None:
+        """开始维护运行中 Pod 的优先级索引（抢占插件使用），已运行的 Pod 一并加入"""
+        if self.priority_index is not None:
+            return
+        self.priority_index = PriorityIndex()
+        for pod_name in self.running_pods:
+            pod = self.pods[pod_name]
+            self.priority_index.add(pod, pod.bound_node)
 
     def add_nodes(self, nodes: List[Node]) -> None:
         for node in nodes:
@@ -33,6 +111,13 @@ class EtcdMock:
         for pod in pods:
             self.add_pod(pod)
 
+    def remove_pod(self, pod_name: str) -> None:
+        """删除一个 Pending 的 Pod"""
+        if pod_name not in self.pending_pods:
+            raise ValueError("only pending pods can be removed")
+        self.pending_pods.remove(pod_name)
+        del self.pods[pod_name]
+
     # --- O(1) queries ---
     def get_node(self, node_name: str) -> Node:
         return self.nodes[node_name]
@@ -47,8 +132,11 @@ class EtcdMock:
     def node_of_pod(self, pod_name: str) -> Optional[str]:
         return self.pod_node.get(pod_name)
 
-    # --- binding helpers (GPU allocation is O(<=8)) ---
-    def _alloc_gpus_on_node(self, node: Node, pod: Pod) -> Dict[int, int]:
+    # --- binding helpers (GPU slot lookup is O(log G)) ---
+    def _alloc_gpus_on_node(self, node: Node, pod: Pod, gpu_ids: Optional[Sequence[int]] = None) -> Dict[int, int]:
+        """分配 GPU：gpu_ids 给定时（打分插件已选好放置）只校验，否则按 best-fit 选择
+        （共享节点选放得下的最满的 GPU，独占节点选空闲 GPU，同等条件按 gid）
+        """
         if pod.num_gpu == 0:
             return {}
 
@@ -60,39 +148,23 @@ class EtcdMock:
         if not (0 <= per <= 1000):
             raise ValueError("gpu_milli must be in [0,1000]")
 
-        chosen: Dict[int, int] = {}
-
-        if node.gpu_share_enabled:
-            # best-fit: pick GPUs that are already fuller (smaller free milli),
-            # but still can fit 'per'
-            eligible = [(node.gpu_free_milli[gid], gid)
-                        for gid in range(node.gpu_count)
-                        if node.gpu_free_milli[gid] >= per]
-            eligible.sort(key=lambda x: (x[0], x[1]))  # fuller first, then gid
-
-            if len(eligible) < need:
+        slots = self.gpu_slots[node.name]
+        if gpu_ids is None:
+            chosen_ids = slots.best_fit(per, need)
+            if chosen_ids is None:
                 raise ValueError("insufficient GPU milli / GPU slots on node")
-
-            for _, gid in eligible[:need]:
-                chosen[gid] = per
-
         else:
-            # no sharing: each GPU can bind at most one pod
-            eligible = [gid for gid in range(node.gpu_count)
-                        if len(node.gpu_pods[gid]) == 0 and node.gpu_free_milli[gid] >= per]
-            # deterministic
-            eligible.sort()
-
-            if len(eligible) < need:
-                raise ValueError("insufficient GPU milli / GPU slots on node")
-
-            for gid in eligible[:need]:
-                chosen[gid] = per
+            chosen_ids = list(gpu_ids)
+            if len(chosen_ids) != need or not slots.can_place(per, chosen_ids):
+                raise ValueError(f"invalid GPU placement {chosen_ids} for pod {pod.name} on node {node.name}")
 
         # commit
-        for gid, milli in chosen.items():
-            node.gpu_free_milli[gid] -= milli
-            node.gpu_pods[gid][pod.name] = milli
+        chosen: Dict[int, int] = {}
+        for gid in chosen_ids:
+            chosen[gid] = per
+            node.gpu_free_milli[gid] -= per
+            node.gpu_pods[gid][pod.name] = per
+            slots.update(node, gid)
 
         return chosen
     
@@ -105,27 +177,33 @@ class EtcdMock:
         if pod.num_gpu == 0:
             return True
 
-        if node.gpu_count < pod.num_gpu:
-            return False
-
-        need = pod.num_gpu
-        per = pod.gpu_milli
-
-        if node.gpu_share_enabled:
-            eligible = [gid for gid in range(node.gpu_count)
-                        if node.gpu_free_milli[gid] >= per]
-            if len(eligible) < need:
-                return False
-        else:
-            eligible = [gid for gid in range(node.gpu_count)
-                        if len(node.gpu_pods[gid]) == 0 and node.gpu_free_milli[gid] >= per]
-            if len(eligible) < need:
-                return False
+        return self.gpu_slots[node_name].count_fit(pod.gpu_milli) >= pod.num_gpu
 
-        return True
+    def feasible_nodes(self, pod_name: str) -> List[Node]:
+        """通过容量索引返回所有可绑定该 Pod 的节点（按节点加入顺序），等价于逐个 check_bindable"""
+        pod = self.pods[pod_name]
+        if self.arrays is not None:
+            mask = self.arrays.feasible_mask(pod.cpu_milli, pod.memory_mib, pod.num_gpu, pod.gpu_milli)
+            nodes = self.arrays.nodes
+            return [nodes[i] for i in mask.nonzero()[0].tolist()]
+        return self.capacity_index.find(pod.cpu_milli, pod.memory_mib, pod.num_gpu, pod.gpu_milli)
+
+    def node_version(self, node_name: str) -> int:
+        return self.node_versions[node_name]
+
+    def _sync_node_state(self, node: Node) -> None:
+        self.node_versions[node.name] += 1
+        self.cluster_version += 1
+        self.capacity_index.update(node)
+        if self.arrays is not None:
+            self.arrays.sync_node(node, len(self.node_pods[node.name]))
+        for tracker in self._frag_trackers:
+            tracker.update(node)
 
     # --- bind / unbind ---
-    def bind(self, pod_name: str, node_name: str, current_time: Optional[int] = None) -> None:
+    def bind(self, pod_name: str, node_name: str, current_time: Optional[int] = None,
+             gpu_ids: Optional[Sequence[int]] = None) -> None:
+        """gpu_ids：打分阶段已经选好的 GPU 放置，None 时由 EtcdMock 按 best-fit 选择"""
         pod = self.pods[pod_name]
         node = self.nodes[node_name]
 
@@ -136,12 +214,15 @@ class EtcdMock:
         if node.cpu_milli_free < pod.cpu_milli or node.memory_mib_free < pod.memory_mib:
             raise ValueError("insufficient cpu/mem")
 
-        # allocate GPUs (<=8 scan)
-        gpu_alloc = self._alloc_gpus_on_node(node, pod)
+        # allocate GPUs (O(log G) slot lookup)
+        gpu_alloc = self._alloc_gpus_on_node(node, pod, gpu_ids)
 
         # commit cpu/mem
         node.cpu_milli_free -= pod.cpu_milli
         node.memory_mib_free -= pod.memory_mib
+        self.allocated_cpu_milli += pod.cpu_milli
+        self.allocated_memory_mib += pod.memory_mib
+        self.allocated_gpu_milli += sum(gpu_alloc.values())
 
         # commit indices O(1)
         pod.bound_node = node_name
@@ -151,45 +232,88 @@ class EtcdMock:
 
         self.node_pods[node_name].add(pod_name)
         self.pod_node[pod_name] = node_name
+        self._sync_node_state(node)
+        if self.priority_index is not None:
+            self.priority_index.add(pod, node_name)
 
         # update pod status indices
         self.pending_pods.discard(pod_name)
         self.running_pods.add(pod_name)
 
 
-    def unbind(self, pod_name: str, current_time: Optional[int] = None) -> None:
-        pod = self.pods[pod_name]
+    def _release(self, pod: Pod) -> None:
+        """归还 Pod 在节点上占用的资源并更新索引（unbind / evict 共用）"""
         node_name = pod.bound_node
-        if node_name is None:
-            return  # or raise
-
         node = self.nodes[node_name]
+        if self.priority_index is not None:
+            self.priority_index.remove(pod, node_name)
 
         # restore cpu/mem
         node.cpu_milli_free += pod.cpu_milli
         node.memory_mib_free += pod.memory_mib
+        self.allocated_cpu_milli -= pod.cpu_milli
+        self.allocated_memory_mib -= pod.memory_mib
+        self.allocated_gpu_milli -= sum(pod.gpu_alloc.values())
 
         # restore GPUs (<=8)
+        slots = self.gpu_slots[node_name]
         for gid, milli in pod.gpu_alloc.items():
             # safety: if data corrupted, KeyError will expose it early
             node.gpu_pods[gid].pop(pod.name)
             node.gpu_free_milli[gid] += milli
+            slots.update(node, gid)
 
         # update indices
-        self.node_pods[node_name].remove(pod_name)
-        self.pod_node.pop(pod_name, None)
+        self.node_pods[node_name].remove(pod.name)
+        self.pod_node.pop(pod.name, None)
+        self._sync_node_state(node)
 
         pod.bound_node = None
         pod.gpu_alloc.clear()
+        self.running_pods.discard(pod.name)
+
+    def unbind(self, pod_name: str, current_time: Optional[int] = None) -> None:
+        pod = self.pods[pod_name]
+        if pod.bound_node is None:
+            return  # or raise
+
+        self._release(pod)
         pod.status = PodStatus.Completed
         pod.completion_time = current_time
 
         # update pod status indices
-        self.running_pods.discard(pod_name)
-        self.completed_pods.add(pod_name)
+        duration = pod.duration or 0  # 直接 bind/unbind 的 Pod 可能没有 duration
+        self.completed_count += 1
+        self.completed_cpu_milli_time += pod.cpu_milli * duration
+        self.completed_gpu_milli_time += pod.num_gpu * pod.gpu_milli * duration
+        if self.retain_completed:
+            self.completed_pods.add(pod_name)
+        else:
+            del self.pods[pod_name]
+
+    def evict(self, pod_name: str, current_time: int) -> None:
+        """抢占：驱逐运行中的 Pod 并放回 Pending，duration 改为剩余的运行时间。
+        已运行部分占用的资源时间计入 completed_*_milli_time（利用率统计的是实际占用）
+        """
+        pod = self.pods[pod_name]
+        if pod.bound_node is None:
+            raise ValueError("pod not bound")
+        ran = current_time - pod.scheduled_time
+        self.completed_cpu_milli_time += pod.cpu_milli * ran
+        self.completed_gpu_milli_time += pod.num_gpu * pod.gpu_milli * ran
+
+        self._release(pod)
+        pod.duration = max((pod.duration or 0) - ran, 0)
+        pod.scheduled_time = None
+        pod.status = PodStatus.Pending
+        self.pending_pods.add(pod_name)
+        self.evicted_count += 1
 
     def get_total_cpu_milli(self) -> int:
-        return sum(node.cpu_milli_total for node in self.nodes.values())
+        return self.total_cpu_milli
+
+    def get_total_memory_mib(self) -> int:
+        return self.total_memory_mib
     
     def get_total_gpu_milli(self) -> int:
-        return 1000 * sum(node.gpu_count for node in self.nodes.values())
\ No newline at end of file
+        return self.total_gpu_milli
\ No newline at end of file
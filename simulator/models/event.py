@@ -1,18 +1,20 @@
-
-from enum import Enum, auto
-from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import NamedTuple
 from simulator.models.pod import Pod
 
-class EventType(Enum):
-    ARRIVAL = auto()
-    COMPLETION = auto()
+class EventType(IntEnum):
+    # 取值即同一时刻的处理顺序：先处理到达、再处理完成
+    ARRIVAL = 0
+    COMPLETION = 1
 
 # =========================
 # 事件定义
 # =========================
-@dataclass(order=True)
-class Event:
+class Event(NamedTuple):
+    """事件以元组形式入堆，heapq 直接按 (time, type, order) 做元组比较；
+    order 全局唯一，比较不会落到 Pod 上
+    """
     time: int
+    type: EventType
     order: int
-    type: EventType = field(compare=False)
-    pod: Pod = field(compare=False)
\ No newline at end of file
+    pod: Pod
@@ -1,6 +1,7 @@
 from simulator.models.resource import NodeResource, PodResource, TargetPod
 from typing import List, Dict
 from enum import Enum
+import numpy as np
 
 class FragmentType(Enum):
     Q1LackBoth  = "q1_lack_both"
@@ -88,4 +89,90 @@ class Fragment:
         for ftype, amount in self.frag_amount.items():
             if ftype != FragmentType.Q3Satisfied:
                 frag_sum += amount
-        return frag_sum
\ No newline at end of file
+        return frag_sum
+
+class TypicalPodMatrix:
+    """typical_pods 的列式表示，供批量碎片计算使用"""
+    def __init__(self, typical_pods: List[TargetPod]):
+        self.cpu_request = np.array([t.target_pod_resource.cpu_request for t in typical_pods], dtype=np.int64)
+        self.gpu_count = np.array([t.target_pod_resource.gpu_count for t in typical_pods], dtype=np.int64)
+        self.gpu_points = np.array([t.target_pod_resource.gpu_points for t in typical_pods], dtype=np.int64)
+        self.freq = np.array([t.percentage for t in typical_pods], dtype=np.float64)
+        if np.any((self.freq < 0) | (self.freq > 1)):
+            raise ValueError("TargetPod percentage must be in [0,1]")
+
+    def __len__(self) -> int:
+        return len(self.freq)
+
+
+def _sequential_sum(contrib: np.ndarray) -> np.ndarray:
+    """按 typical pod 顺序逐项累加（与标量路径的累加顺序一致，保证浮点结果相同）"""
+    if contrib.shape[1] == 0:
+        return np.zeros(contrib.shape[0], dtype=np.float64)
+    return np.add.accumulate(contrib, axis=1)[:, -1]
+
+
+def _batch_frag_amounts(free_cpu: np.ndarray, free_gpus: np.ndarray, typical: TypicalPodMatrix,
+                        with_q3: bool) -> Dict[FragmentType, np.ndarray]:
+    """批量计算 get_node_gpushare_frag_amount 的各类型碎片量（with_q3=False 时省略 Q3，NoAccess 恒为 0 不计算）"""
+    free_cpu = np.asarray(free_cpu, dtype=np.int64)
+    free_gpus = np.asarray(free_gpus, dtype=np.int64)
+    total = free_gpus.sum(axis=1)                                       # (B,)
+
+    points = typical.gpu_points[None, None, :]                          # (1, 1, T)
+    gpus = free_gpus[:, :, None]                                        # (B, G, 1)
+    fit_count = np.count_nonzero(gpus >= points, axis=1)                # (B, T)
+    frag_points = np.where(gpus < points, gpus, 0).sum(axis=1)          # (B, T)
+
+    cpu_ok = free_cpu[:, None] >= typical.cpu_request[None, :]          # (B, T)
+    no_gpu = (typical.gpu_points == 0)[None, :]
+    can_host = fit_count >= np.maximum(typical.gpu_count, 1)[None, :]
+
+    freq = typical.freq[None, :]
+    idle = freq * total[:, None]
+    zero = np.zeros_like(idle)
+    q3 = ~no_gpu & can_host & cpu_ok
+    q1 = ~no_gpu & ~can_host & ~cpu_ok
+    q2 = ~no_gpu & ~can_host & cpu_ok
+    q4 = ~no_gpu & can_host & ~cpu_ok
+    xl = no_gpu & cpu_ok
+    xr = no_gpu & ~cpu_ok
+
+    amount = {
+        FragmentType.Q1LackBoth: _sequential_sum(np.where(q1, idle, zero)),
+        # Q3 中放不下该 Pod 的那部分 GPU 也计入 Q2
+        FragmentType.Q2LackGpu: _sequential_sum(np.where(q3, freq * frag_points, np.where(q2, idle, zero))),
+        FragmentType.Q4LackCpu: _sequential_sum(np.where(q4, idle, zero)),
+        FragmentType.XLSatisfied: _sequential_sum(np.where(xl, idle, zero)),
+        FragmentType.XRLackCPU: _sequential_sum(np.where(xr, idle, zero)),
+    }
+    if with_q3:
+        amount[FragmentType.Q3Satisfied] = _sequential_sum(np.where(q3, freq * (total[:, None] - frag_points), zero))
+    return amount
+
+
+def batch_frag_amounts(free_cpu: np.ndarray, free_gpus: np.ndarray, typical: TypicalPodMatrix) -> np.ndarray:
+    """批量计算 Fragment(...).frag_amount：返回 (B, len(FragmentType))，列按 FragmentType 的定义顺序"""
+    amount = _batch_frag_amounts(free_cpu, free_gpus, typical, with_q3=True)
+    result = np.zeros((len(free_cpu), len(FragmentType)), dtype=np.float64)
+    for col, ftype in enumerate(FragmentType):
+        if ftype in amount:
+            result[:, col] = amount[ftype]
+    return result
+
+
+def batch_frag_amount_sum_except_q3(free_cpu: np.ndarray, free_gpus: np.ndarray,
+                                    typical: TypicalPodMatrix) -> np.ndarray:
+    """批量计算 Fragment(...).get_frag_amount_sum_except_q3()。
+
+    free_cpu：(B,) 每个（节点, 假设放置）状态的空闲 CPU；
+    free_gpus：(B, G) 每张 GPU 的空闲点数，GPU 数不足 G 的行用 0 补齐。
+    返回 (B,) 的碎片量，与逐个构造 Fragment 的结果逐位相同。
+    """
+    amount = _batch_frag_amounts(free_cpu, free_gpus, typical, with_q3=False)
+    # 与 get_frag_amount_sum_except_q3 相同的类型顺序求和（NoAccess 恒为 0）
+    frag_sum = np.zeros(len(free_cpu), dtype=np.float64)
+    for ftype in FragmentType:
+        if ftype in amount:
+            frag_sum = frag_sum + amount[ftype]
+    return frag_sum
@@ -0,0 +1,81 @@
+from simulator.models.frag import FragmentType, TypicalPodMatrix, batch_frag_amounts
+from simulator.models.node import Node
+from simulator.models.resource import TargetPod
+from typing import Dict, List, Optional
+import numpy as np
+
+FRAGMENT_TYPES: List[FragmentType] = list(FragmentType)
+_Q3 = FRAGMENT_TYPES.index(FragmentType.Q3Satisfied)
+
+class FragmentationTracker:
+    """EtcdMock 的集群碎片量账本（相对一组 typical_pods）。
+
+    保存每个节点各 FragmentType 的碎片量（与 Fragment(...).frag_amount 相同）与全集群合计；
+    节点状态变化（bind / unbind / evict）时只重新计算该节点并把差值计入合计，O(1 个节点)。
+    advance(time) 在仿真时间推进时累计 合计 x 时长，得到整个运行期间按时间加权的平均碎片量。
+    合计是增量累加的浮点数，与逐节点重新求和相差舍入误差。
+    """
+
+    def __init__(self, typical_pods: List[TargetPod]):
+        self.typical = TypicalPodMatrix(typical_pods)
+        self._node_amounts: Dict[str, np.ndarray] = {}
+        self.totals = np.zeros(len(FRAGMENT_TYPES), dtype=np.float64)
+        self.updates = 0
+        # 按时间加权的累计量
+        self._integral = np.zeros(len(FRAGMENT_TYPES), dtype=np.float64)
+        self._start_time: Optional[int] = None
+        self._last_time: Optional[int] = None
+
+    def update(self, node: Node) -> None:
+        """节点状态变化后调用"""
+        free_gpus = np.zeros((1, max(1, node.gpu_count)), dtype=np.int64)
+        free_gpus[0, :node.gpu_count] = node.gpu_free_milli
+        row = batch_frag_amounts(np.array([node.cpu_milli_free], dtype=np.int64), free_gpus, self.typical)[0]
+        old = self._node_amounts.get(node.name)
+        if old is not None:
+            self.totals -= old
+        self.totals += row
+        self._node_amounts[node.name] = row
+        self.updates += 1
+
+    def advance(self, time: int) -> None:
+        """仿真时间推进到 time（在 time 时刻的状态变化之前调用）"""
+        if self._last_time is None:
+            self._start_time = time
+        elif time > self._last_time:
+            self._integral += self.totals * (time - self._last_time)
+        self._last_time = time
+
+    @staticmethod
+    def _except_q3(amounts: np.ndarray) -> float:
+        # 与 get_frag_amount_sum_except_q3 相同的类型顺序求和
+        return float(sum(amounts[i] for i in range(len(FRAGMENT_TYPES)) if i != _Q3))
+
+    def amount(self, ftype: FragmentType) -> float:
+        return float(self.totals[FRAGMENT_TYPES.index(ftype)])
+
+    def total_except_q3(self) -> float:
+        """全集群碎片量（DRIFT 的优化目标，不含 Q3）"""
+        return self._except_q3(self.totals)
+
+    def node_amount_except_q3(self, node_name: str) -> float:
+        return self._except_q3(self._node_amounts[node_name])
+
+    def time_averages(self) -> Optional[np.ndarray]:
+        """各类型按时间加权的平均碎片量（列按 FragmentType 顺序），时间没有推进时为 None"""
+        if self._last_time is None or self._last_time == self._start_time:
+            return None
+        return self._integral / (self._last_time - self._start_time)
+
+    def mean_except_q3(self) -> Optional[float]:
+        averages = self.time_averages()
+        return None if averages is None else self._except_q3(averages)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """当前合计与按时间加权的平均值，按 FragmentType.value 索引"""
+        averages = self.time_averages()
+        return {
+            "current": {ftype.value: float(self.totals[i]) for i, ftype in enumerate(FRAGMENT_TYPES)},
+            "time_average": {} if averages is None else
+                {ftype.value: float(averages[i]) for i, ftype in enumerate(FRAGMENT_TYPES)},
+        }
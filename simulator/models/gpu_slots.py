@@ -0,0 +1,55 @@
+from simulator.models.node import Node
+from bisect import bisect_left, insort
+from typing import List, Optional, Sequence, Tuple
+
+# 槽位：(free_milli, gid)
+GpuSlot = Tuple[int, int]
+
+class GpuSlots:
+    """单个节点上可放置 Pod 的 GPU，按 (空闲 milli, gid) 升序保存，由 bind/unbind 按 GPU 增量更新。
+
+    共享节点包含全部 GPU；独占节点只包含没有 Pod 的 GPU。放得下 per milli 的 GPU 是
+    bisect 之后的后缀，后缀的开头就是 best-fit（最满且放得下）的 GPU，查询 O(log G)。
+    """
+    __slots__ = ("gpu_share_enabled", "_keys", "_slots")
+
+    def __init__(self, node: Node):
+        self.gpu_share_enabled = node.gpu_share_enabled
+        self._keys: List[Optional[GpuSlot]] = [None] * node.gpu_count
+        self._slots: List[GpuSlot] = []
+        for gid in range(node.gpu_count):
+            self.update(node, gid)
+
+    def update(self, node: Node, gid: int) -> None:
+        """GPU gid 的空闲量或占用变化后调用"""
+        old = self._keys[gid]
+        if old is not None:
+            del self._slots[bisect_left(self._slots, old)]
+        key = None
+        if self.gpu_share_enabled or not node.gpu_pods[gid]:
+            key = (node.gpu_free_milli[gid], gid)
+            insort(self._slots, key)
+        self._keys[gid] = key
+
+    def count_fit(self, per: int) -> int:
+        """能放下 per milli 的 GPU 数"""
+        return len(self._slots) - bisect_left(self._slots, (per, -1))
+
+    def best_fit(self, per: int, need: int) -> Optional[List[int]]:
+        """best-fit：放得下的 GPU 中最满的 need 个（同空闲量按 gid），不够时返回 None"""
+        i = bisect_left(self._slots, (per, -1))
+        if len(self._slots) - i < need:
+            return None
+        return [gid for _, gid in self._slots[i:i + need]]
+
+    def can_place(self, per: int, gpu_ids: Sequence[int]) -> bool:
+        """指定的一组 GPU（互不相同）是否都能放下 per milli"""
+        if len(set(gpu_ids)) != len(gpu_ids):
+            return False
+        for gid in gpu_ids:
+            if not 0 <= gid < len(self._keys):
+                return False
+            key = self._keys[gid]
+            if key is None or key[0] < per:
+                return False
+        return True
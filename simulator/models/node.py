@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     name: str
     cpu_milli_total: int
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from enum import Enum
 class PodStatus(str, Enum):
@@ -8,7 +8,8 @@ class PodStatus(str, Enum):
     Completed = "Completed"
     Failed = "Failed"
 
-@dataclass
+# slots：百万级 Pod 时省去每个实例的 __dict__
+@dataclass(slots=True)
 class Pod:
     name: str
     cpu_milli: int
@@ -25,4 +26,13 @@ class Pod:
     scheduled_time: Optional[int] = None
     completion_time: Optional[int] = None
 
-    status: PodStatus = PodStatus.Pending
\ No newline at end of file
+    status: PodStatus = PodStatus.Pending
+
+    # 调度优先级（越大越重要，抢占时只驱逐更低优先级的 Pod）与 trace 中的 QoS 类别
+    priority: int = 0
+    qos: str = ""
+
+    @property
+    def shape(self) -> Tuple[int, int, int, int]:
+        """资源规格 (cpu, mem, num_gpu, gpu_milli)，规格相同的 Pod 调度行为一致"""
+        return (self.cpu_milli, self.memory_mib, self.num_gpu, self.gpu_milli)
\ No newline at end of file
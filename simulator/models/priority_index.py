@@ -0,0 +1,81 @@
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from bisect import bisect_left, insort
+from typing import Dict, List, Tuple
+
+# 索引条目：(priority, -scheduled_time, pod_name)，升序即“重要性”从低到高
+PriorityEntry = Tuple[int, int, str]
+
+class PriorityIndex:
+    """EtcdMock 的运行中 Pod 优先级索引，由 bind/unbind/evict 增量维护，供抢占选择牺牲者。
+
+    - 每个节点：按 (priority, 越晚启动越靠前) 排序的运行中 Pod，低于某优先级的 Pod 是一个前缀；
+    - 每个节点每个优先级的资源合计，O(优先级数) 求出驱逐全部低优先级 Pod 后可释放的资源；
+    - 全局每个优先级的运行中 Pod 数，集群中没有更低优先级的 Pod 时无需逐节点检查。
+    """
+
+    def __init__(self):
+        self._pods: Dict[str, List[PriorityEntry]] = {}
+        # node -> priority -> [cpu, memory, gpu_milli, pod 数]
+        self._usage: Dict[str, Dict[int, List[int]]] = {}
+        self._counts: Dict[int, int] = {}
+
+    @staticmethod
+    def _entry(pod: Pod) -> PriorityEntry:
+        return (pod.priority, -(pod.scheduled_time or 0), pod.name)
+
+    def add(self, pod: Pod, node_name: str) -> None:
+        insort(self._pods.setdefault(node_name, []), self._entry(pod))
+        usage = self._usage.setdefault(node_name, {}).setdefault(pod.priority, [0, 0, 0, 0])
+        usage[0] += pod.cpu_milli
+        usage[1] += pod.memory_mib
+        usage[2] += sum(pod.gpu_alloc.values())
+        usage[3] += 1
+        self._counts[pod.priority] = self._counts.get(pod.priority, 0) + 1
+
+    def remove(self, pod: Pod, node_name: str) -> None:
+        """在 Pod 的 scheduled_time / gpu_alloc 被清除之前调用"""
+        entries = self._pods[node_name]
+        entry = self._entry(pod)
+        i = bisect_left(entries, entry)
+        if i == len(entries) or entries[i] != entry:
+            raise KeyError(pod.name)
+        del entries[i]
+        node_usage = self._usage[node_name]
+        usage = node_usage[pod.priority]
+        usage[0] -= pod.cpu_milli
+        usage[1] -= pod.memory_mib
+        usage[2] -= sum(pod.gpu_alloc.values())
+        usage[3] -= 1
+        if usage[3] == 0:
+            del node_usage[pod.priority]
+        self._counts[pod.priority] -= 1
+        if self._counts[pod.priority] == 0:
+            del self._counts[pod.priority]
+
+    def has_lower(self, priority: int) -> bool:
+        """集群中是否有优先级低于 priority 的运行中 Pod"""
+        return any(p < priority for p in self._counts)
+
+    def releasable(self, node_name: str, priority: int) -> Tuple[int, int, int, int]:
+        """驱逐节点上所有优先级低于 priority 的 Pod 可释放的 (cpu, memory, gpu_milli, pod 数)"""
+        cpu = mem = gpu = count = 0
+        for p, usage in self._usage.get(node_name, {}).items():
+            if p < priority:
+                cpu += usage[0]
+                mem += usage[1]
+                gpu += usage[2]
+                count += usage[3]
+        return cpu, mem, gpu, count
+
+    def may_fit_after_eviction(self, pod: Pod, node: Node) -> bool:
+        """抢占的必要条件：节点上有低优先级 Pod，且驱逐它们全部后资源总量足够放下 pod"""
+        cpu, memory, gpu, count = self.releasable(node.name, pod.priority)
+        return count > 0 and node.cpu_milli_free + cpu >= pod.cpu_milli \
+            and node.memory_mib_free + memory >= pod.memory_mib \
+            and sum(node.gpu_free_milli) + gpu >= pod.num_gpu * pod.gpu_milli
+
+    def lower_priority_pods(self, node_name: str, priority: int) -> List[str]:
+        """节点上优先级低于 priority 的 Pod，最不重要的在前"""
+        entries = self._pods.get(node_name, [])
+        return [name for _, _, name in entries[:bisect_left(entries, (priority,))]]
@@ -14,6 +14,9 @@ class NodeResource:
         for free_milli in node.gpu_free_milli:
             self.free_gpus_points_list.append(free_milli)
         assert self.total_gpus == len(self.free_gpus_points_list)
+        # 独占节点上已有 Pod 的 GPU 不能再放置（与 EtcdMock.check_bindable 一致）
+        self.gpu_share_enabled = node.gpu_share_enabled
+        self.gpu_busy: List[bool] = [len(pods) > 0 for pods in node.gpu_pods]
 
     def copy(self):
         new_nr = NodeResource.__new__(NodeResource)  # 绕过 __init__
@@ -24,7 +27,14 @@ class NodeResource:
         new_nr.free_memory = self.free_memory
         new_nr.total_gpus = self.total_gpus
         new_nr.free_gpus_points_list = self.free_gpus_points_list.copy()
+        new_nr.gpu_share_enabled = self.gpu_share_enabled
+        new_nr.gpu_busy = self.gpu_busy.copy()
         return new_nr
+
+    def eligible_gpus(self, gpu_points: int) -> List[int]:
+        """能放下 gpu_points 的 GPU（按 gid）"""
+        return [i for i in range(self.total_gpus)
+                if self.free_gpus_points_list[i] >= gpu_points and (self.gpu_share_enabled or not self.gpu_busy[i])]
         
 
 class PodResource:
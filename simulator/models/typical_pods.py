@@ -0,0 +1,146 @@
+from simulator.models.pod import Pod
+from simulator.models.resource import PodResource, TargetPod
+from collections import Counter, deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+# 碎片量只依赖 (cpu, num_gpu, gpu_points)；内存取同组最大值，只作记录
+ShapeKey = Tuple[int, int, int]
+
+def _ceil_to(value: int, quantum: int) -> int:
+    if quantum <= 0 or value == 0:
+        return value
+    return -(-value // quantum) * quantum
+
+def quantize_shape(cpu_request: int, gpu_count: int, gpu_points: int,
+                   cpu_quantum: int = 0, gpu_quantum: int = 0) -> ShapeKey:
+    """把规格向上取整到量化步长（保守：量化后的 Pod 不比原来小）。部分 GPU 请求不超过整卡"""
+    cpu = _ceil_to(cpu_request, cpu_quantum)
+    if 0 < gpu_points < 1000:
+        gpu_points = min(_ceil_to(gpu_points, gpu_quantum), 1000)
+    return cpu, gpu_count, gpu_points
+
+def _gpu_class(key: ShapeKey) -> Tuple[int, bool]:
+    """GPU 需求的结构：(GPU 数, 是否部分 GPU)。同一类的规格在碎片量上的表现相近"""
+    _, gpu_count, gpu_points = key
+    return gpu_count, 0 < gpu_points < 1000
+
+def _select(weights: Dict[ShapeKey, float], memory: Dict[ShapeKey, int],
+            top_k: Optional[int], mass: float) -> List[TargetPod]:
+    """选出代表规格并把其余规格的占比并入同一 GPU 类中最近的代表。
+
+    先按类的总占比为每个 GPU 类取其占比最高的规格（罕见但很大的规格，如 8 卡 Pod，不会因占比低
+    被整类丢弃），再按占比从高到低补充，直到代表规格覆盖 mass 或达到 top_k 个。
+    没有代表的类（top_k 小于类数时）被丢弃，保留下来的占比归一化到 1
+    """
+    if sum(weights.values()) <= 0:
+        return []
+    # 同占比按规格排序，结果与输入顺序无关
+    ranked = sorted(weights, key=lambda key: (-weights[key], key))
+    class_weight: Dict[Tuple[int, bool], float] = {}
+    for key in ranked:
+        class_weight[_gpu_class(key)] = class_weight.get(_gpu_class(key), 0.0) + weights[key]
+    heads: Dict[Tuple[int, bool], ShapeKey] = {}
+    for key in ranked:
+        heads.setdefault(_gpu_class(key), key)
+    order = [heads[c] for c in sorted(class_weight, key=lambda c: (-class_weight[c], c))]
+    order += [key for key in ranked if key not in order]
+
+    total = sum(weights.values())
+    kept: List[ShapeKey] = []
+    covered = 0.0
+    for key in order:
+        if (top_k is not None and len(kept) >= top_k) or (len(kept) >= len(heads) and covered >= mass * total - 1e-12):
+            break
+        kept.append(key)
+        covered += weights[key]
+
+    merged = {key: weights[key] for key in kept}
+    cpu_scale = max(key[0] for key in weights) or 1
+    for key in ranked:
+        if key in merged:
+            continue
+        same_class = [rep for rep in kept if _gpu_class(rep) == _gpu_class(key)]
+        if same_class:
+            nearest = min(same_class, key=lambda rep: abs(rep[2] - key[2]) / 1000 + abs(rep[0] - key[0]) / cpu_scale)
+            merged[nearest] += weights[key]
+    kept_total = sum(merged.values())
+
+    target_pods = []
+    for (cpu, gpu_count, gpu_points) in kept:
+        pres = PodResource.__new__(PodResource)  # 绕过 __init__
+        pres.cpu_request = cpu
+        pres.memory_request = memory[(cpu, gpu_count, gpu_points)]
+        pres.gpu_count = gpu_count
+        pres.gpu_points = gpu_points
+        target_pods.append(TargetPod(pres, merged[(cpu, gpu_count, gpu_points)] / kept_total))
+    return target_pods
+
+def compress_target_pods(target_pods: List[TargetPod], top_k: Optional[int] = None, mass: float = 1.0,
+                         cpu_quantum: int = 0, gpu_quantum: int = 0) -> List[TargetPod]:
+    """压缩 typical pods：规格按 cpu_quantum / gpu_quantum 量化后合并，再取覆盖 mass 概率质量、
+    至多 top_k 个代表规格，其余规格的占比并入最近的代表（见 _select）。碎片量的计算量与代表规格数成正比。
+    默认参数（不量化、mass=1）只合并内存不同的规格，碎片量只有浮点舍入的差别
+    """
+    if not 0 < mass <= 1:
+        raise ValueError("mass 必须在 (0, 1] 之间")
+    if top_k is not None and top_k < 1:
+        raise ValueError("top_k 至少为 1")
+    weights: Dict[ShapeKey, float] = {}
+    memory: Dict[ShapeKey, int] = {}
+    for target in target_pods:
+        pres = target.target_pod_resource
+        key = quantize_shape(pres.cpu_request, pres.gpu_count, pres.gpu_points, cpu_quantum, gpu_quantum)
+        weights[key] = weights.get(key, 0.0) + target.percentage
+        memory[key] = max(memory.get(key, 0), pres.memory_request)
+    return _select(weights, memory, top_k, mass)
+
+
+class TypicalPodWindow:
+    """最近 size 个到达 Pod 的规格分布（滑动窗口），供 ScoreDrift 在线更新 typical_pods。
+
+    observe 为 O(1)；每观察 refresh_every 个 Pod 返回一次 True，此时由调用方用 target_pods()
+    重建 typical pods（按与 compress_target_pods 相同的量化与 top-K 规则压缩）。
+    """
+
+    def __init__(self, size: int = 1000, refresh_every: int = 100, top_k: Optional[int] = None,
+                 mass: float = 1.0, cpu_quantum: int = 0, gpu_quantum: int = 0):
+        if size < 1 or refresh_every < 1:
+            raise ValueError("size 与 refresh_every 至少为 1")
+        if not 0 < mass <= 1:
+            raise ValueError("mass 必须在 (0, 1] 之间")
+        self.size = size
+        self.refresh_every = refresh_every
+        self.top_k = top_k
+        self.mass = mass
+        self.cpu_quantum = cpu_quantum
+        self.gpu_quantum = gpu_quantum
+        self._window: Deque[ShapeKey] = deque()
+        self._counts: Counter = Counter()
+        self._memory: Dict[ShapeKey, int] = {}
+        self.observed = 0
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def observe(self, pod: Pod) -> bool:
+        """记录一个到达的 Pod，返回是否到了刷新 typical pods 的时候"""
+        key = quantize_shape(pod.cpu_milli, pod.num_gpu, pod.gpu_milli, self.cpu_quantum, self.gpu_quantum)
+        self._window.append(key)
+        self._counts[key] += 1
+        self._memory[key] = max(self._memory.get(key, 0), pod.memory_mib)
+        if len(self._window) > self.size:
+            old = self._window.popleft()
+            self._counts[old] -= 1
+            if self._counts[old] == 0:
+                del self._counts[old]
+                del self._memory[old]
+        self.observed += 1
+        return self.observed % self.refresh_every == 0
+
+    def observe_all(self, pods: Iterable[Pod]) -> None:
+        for pod in pods:
+            self.observe(pod)
+
+    def target_pods(self) -> List[TargetPod]:
+        """窗口内的规格分布（已压缩），窗口为空时为空列表"""
+        return _select(dict(self._counts), self._memory, self.top_k, self.mass)
@@ -0,0 +1,131 @@
+"""插件链：把多个 filter / score 插件组合成一个插件交给 Scheduler。
+
+    filter_plugin = FilterChain([FilterResourceFit(), MyAffinityFilter()])
+    score_plugin = ScoreChain([(ScoreDrift(typical_pods), 2.0), (ScoreBinPack(), 1.0)])
+
+FilterChain 按 cost 从小到大执行，候选节点为空时立即停止；ScoreChain 让每个插件对整组可行节点
+批量打分一次，经各自的 normalize_scores 映射到 [0, MAX_NODE_SCORE] 后加权求和（kube-scheduler 的
+Score + NormalizeScore + weight）。同一周期内所有插件共享一个 CycleState。
+"""
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.plugins.executor import ExecutionStrategy
+from simulator.plugins.interface import CycleState, FilterPlugin, ScorePlugin, MAX_NODE_SCORE
+from simulator.utils.profiler import NullProfiler
+from typing import List, Optional, Sequence, Tuple
+import math
+import random
+
+def default_normalize_score(scores: List[float], reverse: bool = False) -> List[float]:
+    """kube-scheduler 的 DefaultNormalizeScore：按最大值缩放到 [0, MAX_NODE_SCORE]，reverse 时取反。
+    结果依赖整组节点，使用它的插件应保持 cacheable_scores = False
+    """
+    max_score = max((score for score in scores if score != -math.inf), default=0.0)
+    normalized = []
+    for score in scores:
+        if score == -math.inf:  # 打分失败的节点保持最低分
+            normalized.append(score)
+            continue
+        score = MAX_NODE_SCORE * score / max_score if max_score != 0 else 0.0
+        normalized.append(MAX_NODE_SCORE - score if reverse else score)
+    return normalized
+
+
+class FilterChain(FilterPlugin):
+    def __init__(self, filters: Sequence[FilterPlugin]):
+        if not filters:
+            raise ValueError("FilterChain 至少需要一个过滤器")
+        # sorted 是稳定的：开销相同的过滤器保持给定顺序
+        self.filters: List[FilterPlugin] = sorted(filters, key=lambda f: f.cost)
+        self.cost = sum(f.cost for f in self.filters)
+
+    def set_executor(self, executor: ExecutionStrategy) -> None:
+        super().set_executor(executor)
+        for f in self.filters:
+            f.set_executor(executor)
+
+    def set_profiler(self, profiler: NullProfiler) -> None:
+        super().set_profiler(profiler)
+        for f in self.filters:
+            f.set_profiler(profiler)
+
+    def set_rng(self, rng: random.Random) -> None:
+        super().set_rng(rng)
+        for f in self.filters:
+            f.set_rng(rng)
+
+    def filter(self, pod: Pod, e: EtcdMock, state: Optional[CycleState] = None) -> List[Node]:
+        if state is None:
+            state = CycleState(pod)
+        nodes = self.filters[0].filter(pod, e, state)
+        for f in self.filters[1:]:
+            if not nodes:
+                break
+            nodes = f.filter_nodes(pod, nodes, e, state)
+        return nodes
+
+    def filter_nodes(self, pod: Pod, nodes: List[Node], e: EtcdMock,
+                     state: Optional[CycleState] = None) -> List[Node]:
+        if state is None:
+            state = CycleState(pod)
+        for f in self.filters:
+            if not nodes:
+                break
+            nodes = f.filter_nodes(pod, nodes, e, state)
+        return nodes
+
+
+class ScoreChain(ScorePlugin):
+    def __init__(self, scorers: Sequence[Tuple[ScorePlugin, float]]):
+        """scorers：[(插件, 权重)]，权重为正数"""
+        if not scorers:
+            raise ValueError("ScoreChain 至少需要一个打分插件")
+        for plugin, weight in scorers:
+            if weight <= 0:
+                raise ValueError(f"{type(plugin).__name__} 的权重必须为正数: {weight}")
+        self.scorers: List[Tuple[ScorePlugin, float]] = list(scorers)
+        # 每个插件的分数逐节点独立时，加权和也逐节点独立
+        self.cacheable_scores = all(plugin.cacheable_scores for plugin, _ in self.scorers)
+        self.observes_arrivals = any(plugin.observes_arrivals for plugin, _ in self.scorers)
+
+    def name(self) -> str:
+        return "+".join(f"{weight:g}*{plugin.name()}" for plugin, weight in self.scorers)
+
+    def cache_epoch(self) -> int:
+        # 各插件的 epoch 只增不减，和的变化即任一插件的变化
+        return sum(plugin.cache_epoch() for plugin, _ in self.scorers)
+
+    def on_pod_arrival(self, pod: Pod) -> None:
+        for plugin, _ in self.scorers:
+            if plugin.observes_arrivals:
+                plugin.on_pod_arrival(pod)
+
+    def set_executor(self, executor: ExecutionStrategy) -> None:
+        super().set_executor(executor)
+        for plugin, _ in self.scorers:
+            plugin.set_executor(executor)
+
+    def set_profiler(self, profiler: NullProfiler) -> None:
+        super().set_profiler(profiler)
+        for plugin, _ in self.scorers:
+            plugin.set_profiler(profiler)
+
+    def set_rng(self, rng: random.Random) -> None:
+        super().set_rng(rng)
+        for plugin, _ in self.scorers:
+            plugin.set_rng(rng)
+
+    def score(self, pod: Pod, node: Node, e: EtcdMock) -> float:
+        return self.score_nodes(pod, [node], e)[0]
+
+    def score_nodes(self, pod: Pod, nodes: List[Node], e: EtcdMock,
+                    state: Optional[CycleState] = None) -> List[float]:
+        if state is None:
+            state = CycleState(pod)
+        total = [0.0] * len(nodes)
+        for plugin, weight in self.scorers:
+            scores = plugin.normalize_scores(plugin.score_nodes(pod, nodes, e, state))
+            for i, score in enumerate(scores):
+                total[i] += weight * score
+        return total
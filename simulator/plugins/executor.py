@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, List, Optional, TypeVar
+import multiprocessing
+import os
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+class ExecutionStrategy:
+    """插件内部逐节点计算（filter / score）的执行策略。
+    map 必须保持输入顺序，保证可行节点与打分结果的顺序是确定的。
+    """
+    def map(self, fn: Callable[[T], R], items: List[T]) -> List[R]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __reduce__(self):
+        # 插件连同执行策略一起被 pickle 到子进程时，子进程内一律串行执行
+        return (SerialExecution, ())
+
+
+class SerialExecution(ExecutionStrategy):
+    """在当前线程内逐个执行（默认）。纯 Python 的打分受 GIL 限制，串行开销最小。"""
+    def map(self, fn: Callable[[T], R], items: List[T]) -> List[R]:
+        return [fn(item) for item in items]
+
+
+class SharedThreadPoolExecution(ExecutionStrategy):
+    """长期复用的线程池，避免每次调用都创建 / 销毁线程。"""
+    def __init__(self, max_workers: int = 10):
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def map(self, fn: Callable[[T], R], items: List[T]) -> List[R]:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return list(self._pool.map(fn, items))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def _apply_chunk(fn: Callable[[T], R], chunk: List[T]) -> List[R]:
+    return [fn(item) for item in chunk]
+
+
+class ProcessPoolExecution(ExecutionStrategy):
+    """进程池，按块分发。fn 及其参数需要可 pickle（模块级函数 + functools.partial），
+    每个块都会序列化一次 fn 绑定的参数（如 EtcdMock），只适合单节点计算很重的打分插件。
+    """
+    def __init__(self, max_workers: Optional[int] = None, chunks_per_worker: int = 1):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def map(self, fn: Callable[[T], R], items: List[T]) -> List[R]:
+        if not items:
+            return []
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context("fork"))
+        num_chunks = min(len(items), self.max_workers * self.chunks_per_worker)
+        size = (len(items) + num_chunks - 1) // num_chunks
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        results: List[R] = []
+        for part in self._pool.map(_apply_chunk, [fn] * len(chunks), chunks):
+            results.extend(part)
+        return results
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+SERIAL_EXECUTION = SerialExecution()
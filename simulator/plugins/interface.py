@@ -1,24 +1,174 @@
 from simulator.models.pod import Pod
 from simulator.models.node import Node
 from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from simulator.models.etcd_mock import EtcdMock
+from simulator.models.resource import NodeResource, PodResource
+from simulator.models.cluster_state import ClusterArrays
+from simulator.plugins.executor import ExecutionStrategy, SERIAL_EXECUTION
+from simulator.utils.profiler import NullProfiler, NULL_PROFILER
+from functools import partial
 import math
 import random
-from typing import Tuple
+import numpy as np
+from typing import Any, Dict, Tuple
+
+# kube-scheduler 的节点分数区间，ScoreChain 组合前各插件的 normalize_scores 应把分数映射到此区间
+MIN_NODE_SCORE = 0.0
+MAX_NODE_SCORE = 100.0
+
+class CycleState:
+    """一个 Pod 一次调度周期（filter + score）内插件共享的状态。
+    PodResource 与每个节点的 NodeResource 只构建一次，供所有插件复用；
+    周期内节点不会变化，周期结束（bind）后即丢弃。data 供插件存放自己的预计算结果。
+    gpu_placements：打分插件为每个节点选定的 GPU 放置，调度器把选中节点的放置直接交给 bind。
+    """
+    __slots__ = ("pod", "data", "gpu_placements", "_pod_res", "_node_res")
+
+    def __init__(self, pod: Pod):
+        self.pod = pod
+        self.data: Dict[str, Any] = {}
+        self.gpu_placements: Dict[str, Tuple[int, ...]] = {}
+        self._pod_res: Optional[PodResource] = None
+        self._node_res: Dict[str, NodeResource] = {}
+
+    def pod_resource(self) -> PodResource:
+        if self._pod_res is None:
+            self._pod_res = PodResource(self.pod)
+        return self._pod_res
+
+    def propose_gpu_placement(self, node_name: str, gpu_ids: Tuple[int, ...]) -> None:
+        """记录节点上的 GPU 放置；ScoreChain 中先提出放置的插件优先"""
+        if len(gpu_ids) == self.pod.num_gpu:
+            self.gpu_placements.setdefault(node_name, gpu_ids)
+
+    def node_resource(self, node: Node) -> NodeResource:
+        """只读：需要修改时先 copy()"""
+        node_res = self._node_res.get(node.name)
+        if node_res is None:
+            node_res = NodeResource(node)
+            self._node_res[node.name] = node_res
+        return node_res
 
 class QueueSortPlugin:
-    def sort(self, e: EtcdMock) -> List[Pod]:
+    # 仿真级随机数生成器（Scheduler(seed=...) 注入），None 表示使用全局 random
+    rng: Optional[random.Random] = None
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    def key(self, pod: Pod) -> Tuple:
+        """返回 Pod 的排序键，键越小越先调度（供增量维护的调度队列使用）"""
         raise NotImplementedError
-    
+
+    def sort(self, e: EtcdMock) -> List[Pod]:
+        pending_pods = [e.pods[pod_name] for pod_name in e.pending_pods]
+        return sorted(pending_pods, key=self.key)
+
 class FilterPlugin:
-    def filter(self, pod: Pod, e: EtcdMock) -> List[Node]:
+    # 相对开销，FilterChain 按开销从小到大执行，便宜的过滤器先排除大部分节点
+    cost: float = 1.0
+    # 逐节点计算的执行策略，默认串行
+    executor: ExecutionStrategy = SERIAL_EXECUTION
+    # 插件自己的计数器通过 profiler 上报，默认不记录
+    profiler: NullProfiler = NULL_PROFILER
+    # 仿真级随机数生成器（Scheduler(seed=...) 注入），None 表示使用全局 random
+    rng: Optional[random.Random] = None
+    # 提供向量化核 feasible_matrix 时为 True，BatchScheduler 据此直接在 ClusterArrays 上过滤
+    vector_kernel: bool = False
+
+    def set_executor(self, executor: ExecutionStrategy) -> None:
+        self.executor = executor
+
+    def set_profiler(self, profiler: NullProfiler) -> None:
+        self.profiler = profiler
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    def filter(self, pod: Pod, e: EtcdMock, state: Optional[CycleState] = None) -> List[Node]:
+        """返回集群中所有可行节点（按节点加入顺序）"""
         raise NotImplementedError
-    
+
+    def filter_nodes(self, pod: Pod, nodes: List[Node], e: EtcdMock,
+                     state: Optional[CycleState] = None) -> List[Node]:
+        """在候选节点中过滤（FilterChain 中排在后面的过滤器使用），保持 nodes 的顺序。
+        默认实现借助 filter 求交集，子类可以覆盖为只检查候选节点
+        """
+        feasible = {node.name for node in self.filter(pod, e, state)}
+        return [node for node in nodes if node.name in feasible]
+
+    def feasible_matrix(self, pods: List[Pod], arrays: ClusterArrays,
+                        rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """向量化核：pods 对 rows 行节点（默认全部）的可行性矩阵 len(pods) x R，每行与 filter 的结果一致"""
+        raise NotImplementedError
+
+
+class PostFilterPlugin:
+    """filter 没有找到可行节点时调用（如抢占）"""
+    # 插件自己的计数器通过 profiler 上报，默认不记录
+    profiler: NullProfiler = NULL_PROFILER
+    # 仿真级随机数生成器（Scheduler(seed=...) 注入），None 表示使用全局 random
+    rng: Optional[random.Random] = None
+
+    def set_profiler(self, profiler: NullProfiler) -> None:
+        self.profiler = profiler
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    def post_filter(self, pod: Pod, e: EtcdMock, state: Optional[CycleState] = None) -> Optional[Tuple[Node, List[Pod]]]:
+        """返回 (目标节点, 需要驱逐的 Pod)；驱逐这些 Pod 后 pod 可以绑定到目标节点。无解时返回 None"""
+        raise NotImplementedError
+
+
+def _score_single_node(plugin: "ScorePlugin", pod: Pod, e: EtcdMock, node: Node) -> float:
+    """
+    对单个节点打分
+    捕获异常避免单个节点打分失败影响整体流程
+    """
+    try:
+        return plugin.score(pod, node, e)
+    except Exception as exc:
+        # 打分失败的节点按最低分处理，避免被选中
+        print(f"节点 {getattr(node, 'name', '未知')} 打分失败: {exc}")
+        return -math.inf
+
+
 class ScorePlugin:
+    # 逐节点计算的执行策略，默认串行
+    executor: ExecutionStrategy = SERIAL_EXECUTION
+    # 分数只取决于 (Pod 规格, 节点状态) 时为 True，调度器据此按节点版本缓存分数；
+    # normalize_scores 依赖整组节点（如按最大值归一化）的插件不能设为 True
+    cacheable_scores: bool = False
+    # 插件自己的计数器通过 profiler 上报，默认不记录
+    profiler: NullProfiler = NULL_PROFILER
+    # 仿真级随机数生成器（Scheduler(seed=...) 注入），None 表示使用全局 random
+    rng: Optional[random.Random] = None
+    # 提供向量化核 score_vector 时为 True，BatchScheduler 据此直接在 ClusterArrays 上打分
+    vector_kernel: bool = False
+    # 需要观察 Pod 到达（on_pod_arrival）时为 True，调度器只对这样的插件调用
+    observes_arrivals: bool = False
+
+    def cache_epoch(self) -> int:
+        """插件自身影响打分的状态变化时递增（如 typical_pods），使已缓存的分数失效"""
+        return 0
+
+    def on_pod_arrival(self, pod: Pod) -> None:
+        """Pod 到达时由调度器调用（observes_arrivals=True 时），可用于在线更新插件状态"""
+
+    def set_executor(self, executor: ExecutionStrategy) -> None:
+        self.executor = executor
+
+    def set_profiler(self, profiler: NullProfiler) -> None:
+        """子类可以覆盖此方法，通过 profiler.register_counter 注册自己的计数器"""
+        self.profiler = profiler
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+
     def score(self, pod: Pod, node: Node, e: EtcdMock) -> float:
         raise NotImplementedError
-    
+
     # def pick(self, pod: Pod, feasible_nodes: List[Node], e: EtcdMock) -> Optional[Node]:
     #     # 对每一个可行节点打分，返回分数最高的节点（平局时随机选一个）
     #     best_node: Optional[Node] = None
@@ -33,44 +183,34 @@ class ScorePlugin:
     #             if random.random() < 0.5:
     #                 best_node = node
     #     return best_node
-    
-    def pick(self, pod: Pod, feasible_nodes: List[Node], e: EtcdMock) -> Optional[Node]:
+
+    def score_nodes(self, pod: Pod, nodes: List[Node], e: EtcdMock,
+                    state: Optional[CycleState] = None) -> List[float]:
+        """对一组节点打分，结果与 nodes 顺序一一对应。state 为本调度周期的共享状态（可为 None）"""
+        return self.executor.map(partial(_score_single_node, self, pod, e), nodes)
+
+    def score_vector(self, pod: Pod, arrays: ClusterArrays, idx: np.ndarray) -> np.ndarray:
+        """向量化核：idx 行节点的分数，与 score_nodes 的结果逐位一致"""
+        raise NotImplementedError
+
+    def normalize_scores(self, scores: List[float]) -> List[float]:
+        """NormalizeScore：把 score_nodes 的结果映射到 [MIN_NODE_SCORE, MAX_NODE_SCORE]，供 ScoreChain 加权求和。
+        默认不变换（分数已在该区间内）
+        """
+        return scores
+
+    def select_best(self, nodes: List[Node], scores: List[float]) -> Optional[Node]:
+        """返回分数最高的节点（平局时在按 nodes 顺序排列的候选中随机选一个）"""
+        if not nodes:
+            return None
+        best_score = max(scores)
+        best_nodes = [node for node, score in zip(nodes, scores) if score == best_score]
+        rng = self.rng if self.rng is not None else random
+        return rng.choice(best_nodes)
+
+    def pick(self, pod: Pod, feasible_nodes: List[Node], e: EtcdMock,
+             state: Optional[CycleState] = None) -> Optional[Node]:
         if not feasible_nodes:
             return None
-        
-        def _score_single_node(node: Node) -> Tuple[Node, float]:
-            """
-            对单个节点打分，返回(节点, 分数)
-            捕获异常避免单个节点打分失败影响整体流程
-            """
-            try:
-                # 修正：传递e参数到score方法（关键修复笔误问题）
-                score = self.score(pod, node, e)
-                return (node, score)
-            except Exception as exc:
-                # 打分失败的节点按最低分处理，避免被选中
-                print(f"节点 {getattr(node, 'name', '未知')} 打分失败: {exc}")
-                return (node, -math.inf)
-        
-        # 并行执行所有节点的打分
-        scored_nodes: List[Tuple[Node, float]] = []
-
-        max_workers = min(10, len(feasible_nodes))
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            
-            future_map = {
-                executor.submit(_score_single_node, node): node
-                for node in feasible_nodes
-            }
-            
-            
-            for future in as_completed(future_map):
-                node_score_tuple = future.result()
-                scored_nodes.append(node_score_tuple)
-        
-        best_score = max(scored_nodes, key=lambda x: x[1])[1]
-        best_nodes = [node for node, score in scored_nodes if score == best_score]
-        best_node = random.choice(best_nodes) if best_nodes else None
-        
-        return best_node
\ No newline at end of file
+        scores = self.score_nodes(pod, feasible_nodes, e, state)
+        return self.select_best(feasible_nodes, scores)
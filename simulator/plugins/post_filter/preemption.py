@@ -0,0 +1,107 @@
+from simulator.plugins.interface import CycleState, PostFilterPlugin
+from simulator.models.pod import Pod
+from simulator.models.node import Node
+from simulator.models.etcd_mock import EtcdMock
+from typing import Dict, List, Optional, Tuple
+
+def _fits(pod: Pod, gpu_share_enabled: bool, cpu_free: int, memory_free: int,
+          gpu_free: List[int], gpu_busy: List[int]) -> bool:
+    """与 EtcdMock.check_bindable 相同的判定，作用在假设的节点状态上"""
+    if cpu_free < pod.cpu_milli or memory_free < pod.memory_mib:
+        return False
+    if pod.num_gpu == 0:
+        return True
+    if gpu_share_enabled:
+        eligible = sum(1 for free in gpu_free if free >= pod.gpu_milli)
+    else:
+        eligible = sum(1 for free, busy in zip(gpu_free, gpu_busy) if busy == 0 and free >= pod.gpu_milli)
+    return eligible >= pod.num_gpu
+
+class DefaultPreemption(PostFilterPlugin):
+    """kube-scheduler DefaultPreemption 的资源部分：只驱逐优先级更低的 Pod。
+
+    1. 用 EtcdMock.priority_index 的聚合量排除“驱逐全部低优先级 Pod 也放不下”的节点；
+    2. 对剩余节点：假设驱逐全部低优先级 Pod 后检查能否放下，再按重要性从高到低尝试
+       逐个放回（reprieve），放回后仍能放下的 Pod 不必驱逐，得到该节点的最小牺牲者集合；
+    3. 选择节点：牺牲者最高优先级最低 -> 优先级之和最小 -> 数量最少 -> 节点加入顺序。
+
+    只考虑资源（与 FilterResourceFit 等价），不对假设状态重跑其他 filter 插件。
+    节点上的评估结果只取决于节点状态：按 (规格, 优先级) 缓存每个节点的结果及节点版本，
+    每次调用只重新评估版本变化过的节点。缓存只保存牺牲者的名字，不引用 Pod 对象
+    （retain_completed=False 时已完成的 Pod 可以被回收）。
+    """
+
+    def __init__(self):
+        # (规格, 优先级) -> {节点: (节点版本, None 或 (排序键, 牺牲者名字))}
+        self._evaluated: Dict[Tuple, Dict[str, Tuple[int, Optional[Tuple[Tuple, List[str]]]]]] = {}
+
+    def name(self) -> str:
+        return "default_preemption"
+
+    def post_filter(self, pod: Pod, e: EtcdMock, state: Optional[CycleState] = None) -> Optional[Tuple[Node, List[Pod]]]:
+        index = e.priority_index
+        if index is None:
+            raise ValueError("DefaultPreemption 需要 EtcdMock.enable_priority_index()")
+        if not index.has_lower(pod.priority):
+            return None
+
+        evaluated = self._evaluated.setdefault((pod.shape, pod.priority), {})
+        versions = e.node_versions
+        best: Optional[Tuple[Tuple, Node, List[str]]] = None
+        fresh = 0
+        for name, node in e.nodes.items():
+            entry = evaluated.get(name)
+            if entry is None or entry[0] != versions[name]:
+                result = self._evaluate(pod, node, e)
+                entry = (versions[name], None if result is None else (result[0], [v.name for v in result[1]]))
+                evaluated[name] = entry
+                fresh += 1
+            result = entry[1]
+            if result is not None and (best is None or result[0] < best[0]):
+                best = (result[0], node, result[1])
+        self.profiler.count("preemption.evaluated_nodes", fresh)
+        return None if best is None else (best[1], [e.pods[name] for name in best[2]])
+
+    def _evaluate(self, pod: Pod, node: Node, e: EtcdMock) -> Optional[Tuple[Tuple, List[Pod]]]:
+        """节点上的 (排序键, 牺牲者)；无法通过抢占放下时返回 None"""
+        if not e.priority_index.may_fit_after_eviction(pod, node):
+            return None
+        victims = self.select_victims_on_node(pod, node, e)
+        if not victims:
+            # 放不下，或者无需驱逐也能放下（被资源以外的 filter 拒绝），都不是抢占的候选
+            return None
+        return (victims[0].priority, sum(v.priority for v in victims), len(victims)), victims
+
+    def select_victims_on_node(self, pod: Pod, node: Node, e: EtcdMock) -> Optional[List[Pod]]:
+        """节点上的最小牺牲者集合（最重要的在前），放不下时返回 None"""
+        lower = [e.pods[name] for name in e.priority_index.lower_priority_pods(node.name, pod.priority)]
+        cpu_free = node.cpu_milli_free
+        memory_free = node.memory_mib_free
+        gpu_free = node.gpu_free_milli.copy()
+        gpu_busy = [len(pods) for pods in node.gpu_pods]
+        for victim in lower:
+            cpu_free += victim.cpu_milli
+            memory_free += victim.memory_mib
+            for gid, milli in victim.gpu_alloc.items():
+                gpu_free[gid] += milli
+                gpu_busy[gid] -= 1
+        if not _fits(pod, node.gpu_share_enabled, cpu_free, memory_free, gpu_free, gpu_busy):
+            return None
+
+        victims: List[Pod] = []
+        for victim in reversed(lower):
+            # reprieve：放回后仍能放下 pod 的不必驱逐
+            cpu_free -= victim.cpu_milli
+            memory_free -= victim.memory_mib
+            for gid, milli in victim.gpu_alloc.items():
+                gpu_free[gid] -= milli
+                gpu_busy[gid] += 1
+            if _fits(pod, node.gpu_share_enabled, cpu_free, memory_free, gpu_free, gpu_busy):
+                continue
+            cpu_free += victim.cpu_milli
+            memory_free += victim.memory_mib
+            for gid, milli in victim.gpu_alloc.items():
+                gpu_free[gid] += milli
+                gpu_busy[gid] -= 1
+            victims.append(victim)
+        return victims
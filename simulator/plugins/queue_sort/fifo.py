@@ -1,9 +1,7 @@
 from simulator.plugins.interface import QueueSortPlugin
-from simulator.models.etcd_mock import EtcdMock
 from simulator.models.pod import Pod
-from typing import List
+from typing import Tuple
 
 class QueueSortFIFO(QueueSortPlugin):
-    def sort(self, e: EtcdMock) -> List[Pod]:
-        pending_pods = [e.pods[pod_name] for pod_name in e.pending_pods]
-        return sorted(pending_pods, key=lambda p: (p.creation_time, p.name))
\ No newline at end of file
+    def key(self, pod: Pod) -> Tuple:
+        return (pod.creation_time, pod.name)
\ No newline at end of file
@@ -0,0 +1,8 @@
+from simulator.plugins.interface import QueueSortPlugin
+from simulator.models.pod import Pod
+from typing import Tuple
+
+class QueueSortPriority(QueueSortPlugin):
+    def key(self, pod: Pod) -> Tuple:
+        # 高优先级先调度，同优先级按到达顺序
+        return (-pod.priority, pod.creation_time, pod.name)
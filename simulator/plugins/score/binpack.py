@@ -1,12 +1,17 @@
-from simulator.plugins.interface import ScorePlugin
+from simulator.plugins.interface import CycleState, ScorePlugin
 from simulator.models.pod import Pod
 from simulator.models.node import Node
 import random
 import math
+import numpy as np
 from typing import List, Optional
 from simulator.models.etcd_mock import EtcdMock
+from simulator.models.cluster_state import ClusterArrays
 
 class ScoreBinPack(ScorePlugin):
+    cacheable_scores = True
+    vector_kernel = True
+
     def name(self) -> str:
         return "binpack"
     
@@ -15,4 +20,13 @@ class ScoreBinPack(ScorePlugin):
         mem_util = node.get_memory_utilization()
         util = max(cpu_util, mem_util)
         return util * 100.0
-    
\ No newline at end of file
+
+    def score_nodes(self, pod: Pod, nodes: List[Node], e: EtcdMock,
+                    state: Optional[CycleState] = None) -> List[float]:
+        if e.arrays is None:
+            return super().score_nodes(pod, nodes, e, state)
+        # 向量化：一次计算所有节点，结果与逐节点 score 完全一致
+        return self.score_vector(pod, e.arrays, e.arrays.indices_of(nodes)).tolist()
+
+    def score_vector(self, pod: Pod, arrays: ClusterArrays, idx: np.ndarray) -> np.ndarray:
+        return np.maximum(arrays.cpu_utilization(idx), arrays.memory_utilization(idx)) * 100.0
@@ -1,68 +1,280 @@
-from simulator.plugins.interface import ScorePlugin
+from simulator.plugins.interface import CycleState, ScorePlugin, MAX_NODE_SCORE
 from simulator.models.node import Node
 from simulator.models.pod import Pod
 import math
+from functools import partial
 import numpy as np
-from typing import Optional, List
+from collections import OrderedDict
+from typing import Dict, Optional, List, Tuple
 from simulator.models.resource import PodResource, NodeResource
 from simulator.models.etcd_mock import EtcdMock
+from simulator.models.frag import TypicalPodMatrix, batch_frag_amount_sum_except_q3
+from simulator.models.typical_pods import TypicalPodWindow
+
+# 节点资源签名：(free_cpu, 升序的 GPU 空闲点数)。碎片量只依赖这两项与 typical_pods
+NodeSignature = Tuple[int, Tuple[int, ...]]
+
+# calculate_gpu_share_frag_score 的分数上限（sigmoid * 1000）
+MAX_DRIFT_SCORE = 1000
+
+# GPU 放置：选中的 gid（升序）
+GpuPlacement = Tuple[int, ...]
+
+def _score_node_resource(plugin: "ScoreDrift", pod_res: PodResource,
+                         node_res: NodeResource) -> Tuple[float, GpuPlacement]:
+    """逐节点打分（非批量模式下执行策略分发的最小单元），失败按最低分处理"""
+    try:
+        score, gpu_ids = plugin.calculate_gpu_share_frag_score(node_res, pod_res)
+        return float(score), gpu_ids
+    except Exception as exc:
+        print(f"节点 {node_res.node_name} 打分失败: {exc}")
+        return -math.inf, ()
+
+def _gpu_combinations(free: List[int], eligible: List[int], need: int) -> List[GpuPlacement]:
+    """从 eligible 中选 need 个 GPU 的所有放置，空闲量相同的 GPU 可以互换（碎片量相同），
+    因此只枚举每个空闲量取几个（取 gid 最小的几个）。按“先取更满的 GPU”的顺序给出，
+    第一个即 best-fit。
+    """
+    groups: Dict[int, List[int]] = {}
+    for gid in eligible:
+        groups.setdefault(free[gid], []).append(gid)
+    values = sorted(groups)
+    combos: List[GpuPlacement] = []
+
+    def choose(k: int, left: int, chosen: List[int]) -> None:
+        if left == 0:
+            combos.append(tuple(sorted(chosen)))
+            return
+        if k == len(values):
+            return
+        group = groups[values[k]]
+        for take in range(min(left, len(group)), -1, -1):
+            choose(k + 1, left - take, chosen + group[:take])
+
+    choose(0, need, [])
+    return combos
 
 class ScoreDrift(ScorePlugin):
-    def __init__(self, typical_pods: List[PodResource]):
-        """初始化插件，typical_pods 可用于计算资源碎片化得分的参考"""
+    cacheable_scores = True
+
+    def __init__(self, typical_pods: List[PodResource], batched: bool = True, frag_cache_size: int = 65536,
+                 window: Optional[TypicalPodWindow] = None):
+        """初始化插件，typical_pods 可用于计算资源碎片化得分的参考
+        batched=True 时 score_nodes 把所有（节点, 假设放置）一次性交给 NumPy 计算
+        frag_cache_size：按节点资源签名缓存碎片量的 LRU 容量，0 表示不缓存
+        window：在线模式，按最近到达 Pod 的滑动窗口定期替换 typical_pods（初始值仍为 typical_pods）
+        """
+        self.batched = batched
+        self.window = window
+        self.observes_arrivals = window is not None
+        self.typical_refreshes = 0
+        self.frag_cache_size = frag_cache_size
+        self._frag_cache: "OrderedDict[NodeSignature, float]" = OrderedDict()
+        self.frag_cache_hits = 0
+        self.frag_cache_misses = 0
+        self._typical_epoch = -1
         self.typical_pods = typical_pods
 
     def name(self) -> str:
         return "drift"
 
+    @property
+    def typical_pods(self) -> List[PodResource]:
+        return self._typical_pods
+
+    @typical_pods.setter
+    def typical_pods(self, typical_pods: List[PodResource]) -> None:
+        # typical_pods 变化后缓存的碎片量全部失效
+        self._typical_pods = typical_pods
+        self._typical_matrix = TypicalPodMatrix(typical_pods)
+        self._typical_epoch += 1
+        self.clear_frag_cache()
+
+    def cache_epoch(self) -> int:
+        return self._typical_epoch
+
+    def on_pod_arrival(self, pod: Pod) -> None:
+        if self.window.observe(pod):
+            self.typical_pods = self.window.target_pods()
+            self.typical_refreshes += 1
+
+    def set_profiler(self, profiler) -> None:
+        super().set_profiler(profiler)
+        profiler.register_counter("drift.frag_cache_hits", lambda: self.frag_cache_hits)
+        profiler.register_counter("drift.frag_cache_misses", lambda: self.frag_cache_misses)
+        if self.window is not None:
+            profiler.register_counter("drift.typical_refreshes", lambda: self.typical_refreshes)
+
+    # --- node fragmentation cache ---
+    @staticmethod
+    def node_signature(free_cpu: int, free_gpus: List[int]) -> NodeSignature:
+        return (free_cpu, tuple(sorted(free_gpus)))
+
+    def clear_frag_cache(self) -> None:
+        self._frag_cache.clear()
+
+    def frag_cache_info(self) -> Dict[str, int]:
+        return {
+            "hits": self.frag_cache_hits,
+            "misses": self.frag_cache_misses,
+            "size": len(self._frag_cache),
+            "maxsize": self.frag_cache_size,
+        }
+
+    def _frag_cache_get(self, key: NodeSignature) -> Optional[float]:
+        if self.frag_cache_size <= 0:
+            return None  # 未开启缓存：不查找也不计数
+        value = self._frag_cache.get(key)
+        if value is None:
+            self.frag_cache_misses += 1
+            return None
+        self._frag_cache.move_to_end(key)
+        self.frag_cache_hits += 1
+        return value
+
+    def _frag_cache_put(self, key: NodeSignature, value: float) -> None:
+        if self.frag_cache_size <= 0:
+            return
+        self._frag_cache[key] = value
+        self._frag_cache.move_to_end(key)
+        if len(self._frag_cache) > self.frag_cache_size:
+            self._frag_cache.popitem(last=False)
+
     def score(self, pod: Pod, node: Node, e: EtcdMock) -> float:
         node_res = NodeResource(node)
         pod_res = PodResource(pod)
         score, _ = self.calculate_gpu_share_frag_score(node_res, pod_res)
         return float(score)
 
-    def calculate_gpu_share_frag_score(self, node_res: NodeResource, pod_res: PodResource):
-        """计算 GPU 分配的碎片化得分"""
-        node_gpu_share_frag_score = self.node_gpu_share_frag_amount_score(node_res)
+    def score_nodes(self, pod: Pod, nodes: List[Node], e: EtcdMock,
+                    state: Optional[CycleState] = None) -> List[float]:
+        # PodResource / NodeResource 在本调度周期内只构建一次，与链中其他插件共享；
+        # 每个节点上选定的 GPU 放置记入 state，由调度器直接交给 bind
+        if state is None:
+            state = CycleState(pod)
+        node_resources = [state.node_resource(node) for node in nodes]
+        if not self.batched:
+            results = self.executor.map(partial(_score_node_resource, self, state.pod_resource()), node_resources)
+        else:
+            results = self.batch_gpu_share_frag_scores(node_resources, state.pod_resource())
+        scores = []
+        for node, (score, gpu_ids) in zip(nodes, results):
+            state.propose_gpu_placement(node.name, gpu_ids)
+            scores.append(float(score))
+        return scores
+
+    def normalize_scores(self, scores: List[float]) -> List[float]:
+        # 分数区间已知，线性映射到 [0, MAX_NODE_SCORE]，逐节点独立，分数缓存仍然有效
+        return [score * MAX_NODE_SCORE / MAX_DRIFT_SCORE for score in scores]
 
-        if pod_res.gpu_count == 1 and pod_res.gpu_points < 1000:  # 部分 GPU 请求
-            score, gpu_id = 0, ""
-            for i in range(node_res.total_gpus):
-                if node_res.free_gpus_points_list[i] >= pod_res.gpu_points:
-                    new_node_res = node_res.copy()
-                    new_node_res.free_cpu -= pod_res.cpu_request
-                    new_node_res.free_memory -= pod_res.memory_request
-                    new_node_res.free_gpus_points_list[i] -= pod_res.gpu_points
-                    
-                    new_node_gpu_share_frag_score = self.node_gpu_share_frag_amount_score(new_node_res)
-                    frag_score = int(self.sigmoid((node_gpu_share_frag_score - new_node_gpu_share_frag_score) / 1000) * 1000)
-
-                    if gpu_id == "" or frag_score > score:
-                        score = frag_score
-                        gpu_id = str(i)
-
-            return score, gpu_id
+    @staticmethod
+    def _hypothetical_placements(node_res: NodeResource, pod_res: PodResource) -> List[Tuple[GpuPlacement, List[int]]]:
+        """列出候选的 GPU 放置：[(gid 元组, 放置后的 GPU 空闲列表)]。
+        部分 GPU 请求逐个 GPU 尝试；整卡 / 多卡请求枚举所有不等价的 GPU 组合；不需要 GPU 时只有空放置
+        """
+        free = node_res.free_gpus_points_list
+        if pod_res.gpu_count == 0:
+            return [((), free.copy())]
+        eligible = node_res.eligible_gpus(pod_res.gpu_points)
+        if pod_res.gpu_count == 1 and pod_res.gpu_points < 1000:  # 部分 GPU 请求：逐个 GPU 尝试
+            combos: List[GpuPlacement] = [(gid,) for gid in eligible]
         else:
-            # 处理需要多张 GPU 的情况
+            combos = _gpu_combinations(free, eligible, pod_res.gpu_count)
+        placements = []
+        for gpu_ids in combos:
+            new_free = free.copy()
+            for gid in gpu_ids:
+                new_free[gid] -= pod_res.gpu_points
+            placements.append((gpu_ids, new_free))
+        return placements
+
+    def batch_gpu_share_frag_scores(self, node_resources: List[NodeResource],
+                                    pod_res: PodResource) -> List[Tuple[int, GpuPlacement]]:
+        """批量版 calculate_gpu_share_frag_score：所有节点的当前状态与全部假设放置
+        组成一个矩阵，一次计算碎片量。返回 [(score, gpu_ids)]，与逐节点结果相同。
+        """
+        free_cpu: List[int] = []
+        free_gpus: List[List[int]] = []
+        layout: List[List[GpuPlacement]] = []  # 每个节点：假设放置的列表（行号紧随当前状态行）
+        for node_res in node_resources:
+            placements = self._hypothetical_placements(node_res, pod_res)
+            free_cpu.append(node_res.free_cpu)
+            free_gpus.append(node_res.free_gpus_points_list)
+            for _, new_free in placements:
+                free_cpu.append(node_res.free_cpu - pod_res.cpu_request)
+                free_gpus.append(new_free)
+            layout.append([gpu_id for gpu_id, _ in placements])
+
+        frag = self._batch_frag_amounts(free_cpu, free_gpus)
+
+        results: List[Tuple[int, GpuPlacement]] = []
+        row = 0
+        for placements in layout:
+            base = frag[row]
+            score, best = 0, None
+            for k, gpu_ids in enumerate(placements):
+                frag_score = int(self.sigmoid((base - frag[row + 1 + k]) / 1000) * 1000)
+                if best is None or frag_score > score:
+                    score = frag_score
+                    best = gpu_ids
+            results.append((score, best if best is not None else ()))
+            row += 1 + len(placements)
+        return results
+
+    def _batch_frag_amounts(self, free_cpu: List[int], free_gpus: List[List[int]]) -> List[float]:
+        """批量求碎片量：先查缓存，未命中的签名去重后一次性交给 NumPy 计算"""
+        keys = [self.node_signature(cpu, gpus) for cpu, gpus in zip(free_cpu, free_gpus)]
+        frag: List[Optional[float]] = [self._frag_cache_get(key) for key in keys]
+        missing: Dict[NodeSignature, List[int]] = {}
+        for row, value in enumerate(frag):
+            if value is None:
+                missing.setdefault(keys[row], []).append(row)
+        if missing:
+            # 签名中的 GPU 列表已排序，碎片量与 GPU 顺序无关
+            sigs = list(missing)
+            width = max(len(gpus) for _, gpus in sigs)
+            gpu_matrix = np.zeros((len(sigs), width), dtype=np.int64)
+            for row, (_, gpus) in enumerate(sigs):
+                gpu_matrix[row, :len(gpus)] = gpus
+            self.profiler.count("drift.fragment_evaluations", len(sigs))
+            values = batch_frag_amount_sum_except_q3(np.array([cpu for cpu, _ in sigs], dtype=np.int64),
+                                                     gpu_matrix, self._typical_matrix).tolist()
+            for key, value in zip(sigs, values):
+                self._frag_cache_put(key, value)
+                for row in missing[key]:
+                    frag[row] = value
+        return frag
+
+    def calculate_gpu_share_frag_score(self, node_res: NodeResource, pod_res: PodResource) -> Tuple[int, GpuPlacement]:
+        """计算 GPU 分配的碎片化得分：返回碎片增量最小的放置的 (得分, gpu_ids)，同分取先列出的放置"""
+        node_gpu_share_frag_score = self.node_gpu_share_frag_amount_score(node_res)
+        score, best = 0, None
+        for gpu_ids, new_free in self._hypothetical_placements(node_res, pod_res):
             new_node_res = node_res.copy()
             new_node_res.free_cpu -= pod_res.cpu_request
             new_node_res.free_memory -= pod_res.memory_request
-            cnt = 0
-            for i in range(node_res.total_gpus):
-                if node_res.free_gpus_points_list[i] >= pod_res.gpu_points:
-                    new_node_res.free_gpus_points_list[i] -= pod_res.gpu_points
-                    cnt += 1
-                    if cnt == pod_res.gpu_count:
-                        break
+            new_node_res.free_gpus_points_list = new_free
+
             new_node_gpu_share_frag_score = self.node_gpu_share_frag_amount_score(new_node_res)
-            return int(self.sigmoid((node_gpu_share_frag_score - new_node_gpu_share_frag_score) / 1000) * 1000), str(0)  # 选择第一个 GPU
+            frag_score = int(self.sigmoid((node_gpu_share_frag_score - new_node_gpu_share_frag_score) / 1000) * 1000)
+            if best is None or frag_score > score:
+                score = frag_score
+                best = gpu_ids
+        return score, best if best is not None else ()
 
     def node_gpu_share_frag_amount_score(self, node_res: NodeResource):
         """计算节点的 GPU 资源碎片化得分"""
         from simulator.models.frag import Fragment
+        key = self.node_signature(node_res.free_cpu, node_res.free_gpus_points_list)
+        cached = self._frag_cache_get(key)
+        if cached is not None:
+            return cached
+        self.profiler.count("drift.fragment_evaluations")
         frag = Fragment(node_res, self.typical_pods)
-        return frag.get_frag_amount_sum_except_q3()
+        value = frag.get_frag_amount_sum_except_q3()
+        self._frag_cache_put(key, value)
+        return value
 
     def sigmoid(self, x):
         """Sigmoid 函数用于平滑分数"""
-        return 1 / (1 + math.exp(-x))
\ No newline at end of file
+        return 1 / (1 + math.exp(-x))
@@ -1,15 +1,30 @@
-from simulator.plugins.interface import ScorePlugin
+from simulator.plugins.interface import CycleState, ScorePlugin
 from simulator.models.pod import Pod
 from simulator.models.node import Node
 import random
 import math
 from typing import List, Optional
 from simulator.models.etcd_mock import EtcdMock
+from simulator.models.cluster_state import ClusterArrays
+import numpy as np
 
 class ScoreKubernetes(ScorePlugin):
+    cacheable_scores = True
+    vector_kernel = True
+
     def name(self) -> str:
         return "k8s"
 
     def score(self, pod: Pod, node: Node, e: EtcdMock) -> float:
         pod_count = len(e.pods_on_node(node.name))
-        return 1.0 / (pod_count + 1) * 100.0
\ No newline at end of file
+        return 1.0 / (pod_count + 1) * 100.0
+
+    def score_nodes(self, pod: Pod, nodes: List[Node], e: EtcdMock,
+                    state: Optional[CycleState] = None) -> List[float]:
+        if e.arrays is None:
+            return super().score_nodes(pod, nodes, e, state)
+        # 向量化：一次计算所有节点，结果与逐节点 score 完全一致
+        return self.score_vector(pod, e.arrays, e.arrays.indices_of(nodes)).tolist()
+
+    def score_vector(self, pod: Pod, arrays: ClusterArrays, idx: np.ndarray) -> np.ndarray:
+        return 1.0 / (arrays.pod_count[idx] + 1) * 100.0
@@ -1,25 +1,50 @@
 from datetime import datetime
 
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+_LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
 class Logger:
-    def __init__(self, debug_mode: bool = True):
-        self.debug_mode = debug_mode
+    """%-格式的惰性日志：低于当前级别的消息直接返回，不会格式化参数或生成时间字符串。
+    用法：logger.info("Pod %s scheduled to %s", pod.name, node.name)
+    """
+    def __init__(self, debug_mode: bool = True, level: int = INFO):
+        self.level = DEBUG if debug_mode else level
+
+    @property
+    def debug_mode(self) -> bool:
+        return self.level <= DEBUG
+
+    def set_level(self, level: int) -> None:
+        self.level = level
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
 
-    def _log(self, level: str, msg: str):
+    def _log(self, level: int, msg: str, args: tuple):
+        if args:
+            msg = msg % args
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        print(f"[{now}] [{level}] {msg}")
+        print(f"[{now}] [{_LEVEL_NAMES[level]}] {msg}")
 
-    def debug(self, msg: str):
-        if self.debug_mode:
-            self._log("DEBUG", msg)
+    def debug(self, msg: str, *args):
+        if self.level <= DEBUG:
+            self._log(DEBUG, msg, args)
 
-    def info(self, msg: str):
-        self._log("INFO", msg)
+    def info(self, msg: str, *args):
+        if self.level <= INFO:
+            self._log(INFO, msg, args)
 
-    def warning(self, msg: str):
-        self._log("WARNING", msg)
+    def warning(self, msg: str, *args):
+        if self.level <= WARNING:
+            self._log(WARNING, msg, args)
 
-    def error(self, msg: str):
-        self._log("ERROR", msg)
+    def error(self, msg: str, *args):
+        if self.level <= ERROR:
+            self._log(ERROR, msg, args)
 
 debug_mode = False
-logger = Logger(debug_mode)
\ No newline at end of file
+logger = Logger(debug_mode)
@@ -0,0 +1,120 @@
+from array import array
+from time import perf_counter
+from typing import Callable, Dict, List, Union
+import numpy as np
+
+Number = Union[int, float]
+
+class NullProfiler:
+    """不做任何记录的 profiler（默认）。
+
+    调度循环中的埋点总是直接调用 profiler 的方法，关闭时这些方法都是空操作，
+    不需要在热路径上判断是否开启。
+    """
+    enabled = False
+
+    def tic(self) -> float:
+        return 0.0
+
+    def toc(self, phase: str, start: float) -> None:
+        pass
+
+    def observe(self, name: str, value: Number) -> None:
+        pass
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def register_counter(self, name: str, fn: Callable[[], Number]) -> None:
+        pass
+
+    def report(self) -> Dict[str, Dict]:
+        return {"phases": {}, "observations": {}, "counters": {}}
+
+    def format_report(self) -> str:
+        return ""
+
+NULL_PROFILER = NullProfiler()
+
+
+def _distribution(values: array) -> Dict[str, float]:
+    data = np.frombuffer(values, dtype=np.float64)
+    if len(data) == 0:
+        return {"count": 0, "total": 0.0, "mean": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    p50, p90, p99 = np.percentile(data, [50, 90, 99]).tolist()
+    return {
+        "count": len(data),
+        "total": float(data.sum()),
+        "mean": float(data.mean()),
+        "p50": p50,
+        "p90": p90,
+        "p99": p99,
+        "max": float(data.max()),
+    }
+
+
+class Profiler(NullProfiler):
+    """按阶段记录耗时、记录数值分布（如每个 Pod 的可行节点数）和计数器。
+
+    - tic()/toc(phase, start)：记录一次阶段耗时（秒）
+    - observe(name, value)：记录一个数值样本
+    - count(name, n)：累加计数器
+    - register_counter(name, fn)：注册在 report() 时读取的计数器（如插件内部的缓存命中数）
+    """
+    enabled = True
+
+    def __init__(self):
+        self.phases: Dict[str, array] = {}
+        self.observations: Dict[str, array] = {}
+        self.counters: Dict[str, int] = {}
+        self._counter_sources: Dict[str, Callable[[], Number]] = {}
+
+    def __reduce__(self):
+        # 随插件进入进程池子进程时退化为 NullProfiler（子进程中的记录无法汇总回来）
+        return (NullProfiler, ())
+
+    def tic(self) -> float:
+        return perf_counter()
+
+    def toc(self, phase: str, start: float) -> None:
+        elapsed = perf_counter() - start
+        samples = self.phases.get(phase)
+        if samples is None:
+            samples = self.phases[phase] = array("d")
+        samples.append(elapsed)
+
+    def observe(self, name: str, value: Number) -> None:
+        samples = self.observations.get(name)
+        if samples is None:
+            samples = self.observations[name] = array("d")
+        samples.append(value)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def register_counter(self, name: str, fn: Callable[[], Number]) -> None:
+        self._counter_sources[name] = fn
+
+    def report(self) -> Dict[str, Dict]:
+        counters: Dict[str, Number] = dict(self.counters)
+        for name, fn in self._counter_sources.items():
+            counters[name] = fn()
+        return {
+            "phases": {name: _distribution(samples) for name, samples in self.phases.items()},
+            "observations": {name: _distribution(samples) for name, samples in self.observations.items()},
+            "counters": counters,
+        }
+
+    def format_report(self) -> str:
+        report = self.report()
+        lines: List[str] = [f"{'phase':<16}{'calls':>10}{'total(s)':>11}{'mean(us)':>11}"
+                            f"{'p50(us)':>10}{'p90(us)':>10}{'p99(us)':>10}{'max(us)':>10}"]
+        for name, d in report["phases"].items():
+            lines.append(f"{name:<16}{d['count']:>10}{d['total']:>11.3f}{d['mean']*1e6:>11.1f}"
+                         f"{d['p50']*1e6:>10.1f}{d['p90']*1e6:>10.1f}{d['p99']*1e6:>10.1f}{d['max']*1e6:>10.1f}")
+        for name, d in report["observations"].items():
+            lines.append(f"{name}: count={d['count']} mean={d['mean']:.2f} p50={d['p50']:.0f} "
+                         f"p90={d['p90']:.0f} p99={d['p99']:.0f} max={d['max']:.0f}")
+        for name, value in report["counters"].items():
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
@@ -1,51 +1,171 @@
 from simulator.models.node import Node
 from simulator.models.pod import Pod, PodStatus
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
+import os
 import pandas as pd
 import numpy as np
 
 h_nodes_csv_path = "./data/H/csv/openb_node_list_all_node.csv"
 h_pods_csv_path = "./data/H/csv/openb_pod_list_default.csv"
 
+# 列式缓存：CSV 只解析一次，结果以 .npz 形式保存在 CSV 旁边，下次启动直接加载
+COLUMN_CACHE_SUFFIX = ".columns.npz"
+
+Columns = Dict[str, np.ndarray]
+
 # nodes csv:
 # sn,cpu_milli,memory_mib,gpu,model
 # openb-node-0000,32000,262144,0,
 # openb-node-0001,32000,262144,0,
 # ...
-def get_h_nodes(count: int, allow_gpu_share: bool) -> List[Node]:
-    df_nodes = pd.read_csv(h_nodes_csv_path)
-    nodes: List[Node] = []
-    for i in range(min(count, len(df_nodes))):
-        row = df_nodes.iloc[i]
-        node = Node(
-            name=row["sn"],
-            cpu_milli_total=int(row["cpu_milli"]),
-            memory_mib_total=int(row["memory_mib"]),
-            gpu_count=int(row["gpu"]),
-            gpu_share_enabled=allow_gpu_share,
-        )
-        nodes.append(node)
-    return nodes
+NODE_INT_COLUMNS = ["cpu_milli", "memory_mib", "gpu"]
+NODE_STR_COLUMNS = ["sn", "model"]
 
 # pods csv:
 # name,cpu_milli,memory_mib,num_gpu,gpu_milli,gpu_spec,qos,pod_phase,creation_time,deletion_time,scheduled_time
 # openb-pod-0000,12000,16384,1,1000,,LS,Running,0,12537496,0
 # openb-pod-0001,6000,12288,1,460,,LS,Running,427061,12902960,427061
 # openb-pod-0002,12000,24576,1,1000,,LS,Running,1558381,12902960,1558381
+POD_INT_COLUMNS = ["cpu_milli", "memory_mib", "num_gpu", "gpu_milli",
+                   "creation_time", "deletion_time", "scheduled_time"]
+POD_STR_COLUMNS = ["name", "gpu_spec", "qos", "pod_phase"]
+
+# trace 的 qos 列到调度优先级的映射（越大越重要），未知类别按最低优先级处理
+QOS_PRIORITY = {"Guaranteed": 3, "LS": 2, "Burstable": 1, "BE": 0}
+
+_columns_memo: Dict[str, Tuple[Tuple[int, int], Columns]] = {}
+
+def _source_stamp(csv_path: str) -> Tuple[int, int]:
+    st = os.stat(csv_path)
+    return (st.st_mtime_ns, st.st_size)
+
+def _parse_csv(csv_path: str, int_columns: List[str], str_columns: List[str]) -> Columns:
+    df = pd.read_csv(csv_path, dtype={c: str for c in str_columns})
+    columns: Columns = {}
+    for c in int_columns:
+        # 缺失值（如尚未删除的 Pod 的 deletion_time）记为 -1
+        columns[c] = df[c].fillna(-1).to_numpy(dtype=np.int64)
+    for c in str_columns:
+        columns[c] = df[c].fillna("").to_numpy(dtype=str)
+    return columns
+
+def load_columns(csv_path: str, int_columns: List[str], str_columns: List[str],
+                 use_disk_cache: bool = True) -> Columns:
+    """解析 CSV 为列式数组：进程内缓存 -> 磁盘 .npz 缓存 -> 解析 CSV（并写回磁盘缓存）。
+    缓存以 CSV 的 mtime/size 校验，CSV 变化后自动重新解析。
+    """
+    key = os.path.abspath(csv_path)
+    stamp = _source_stamp(csv_path)
+    memo = _columns_memo.get(key)
+    if memo is not None and memo[0] == stamp:
+        return memo[1]
+
+    cache_path = csv_path + COLUMN_CACHE_SUFFIX
+    columns: Optional[Columns] = None
+    if use_disk_cache and os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as data:
+                if tuple(data["__source_stamp__"].tolist()) == stamp:
+                    columns = {c: data[c] for c in int_columns + str_columns}
+        except (OSError, KeyError, ValueError):
+            columns = None
+
+    if columns is None:
+        columns = _parse_csv(csv_path, int_columns, str_columns)
+        if use_disk_cache:
+            try:
+                tmp_path = cache_path + ".tmp.npz"
+                np.savez(tmp_path, __source_stamp__=np.array(stamp, dtype=np.int64), **columns)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass  # 只读目录等情况下退化为仅进程内缓存
+
+    _columns_memo[key] = (stamp, columns)
+    return columns
+
+def load_h_node_columns(csv_path: str = h_nodes_csv_path) -> Columns:
+    return load_columns(csv_path, NODE_INT_COLUMNS, NODE_STR_COLUMNS)
+
+def load_h_pod_columns(csv_path: str = h_pods_csv_path) -> Columns:
+    return load_columns(csv_path, POD_INT_COLUMNS, POD_STR_COLUMNS)
+
+def get_h_nodes(count: int, allow_gpu_share: bool) -> List[Node]:
+    cols = load_h_node_columns()
+    n = min(count, len(cols["sn"]))
+    return [
+        Node(name=name, cpu_milli_total=cpu, memory_mib_total=mem, gpu_count=gpu, gpu_share_enabled=allow_gpu_share)
+        for name, cpu, mem, gpu in zip(cols["sn"][:n].tolist(), cols["cpu_milli"][:n].tolist(),
+                                       cols["memory_mib"][:n].tolist(), cols["gpu"][:n].tolist())
+    ]
+
+def _build_pods(cols: Columns, rows: np.ndarray, use_trace_time: bool = False) -> List[Pod]:
+    """use_trace_time=True 时使用 trace 中的 creation_time，duration = deletion_time - creation_time
+    （trace 结束时仍未删除的 Pod 视为运行到 trace 中最晚的 deletion_time）；
+    否则所有 Pod 在 0 时刻到达、运行 3600 秒
+    """
+    n = len(rows)
+    if use_trace_time:
+        creation = cols["creation_time"][rows]
+        deletion = cols["deletion_time"][rows]
+        deletion = np.where(deletion < 0, cols["deletion_time"].max(), deletion)
+        creation_times = creation.tolist()
+        durations = np.maximum(deletion - creation, 0).tolist()
+    else:
+        creation_times = [0] * n
+        durations = [3600] * n
+    qos_list = cols["qos"][rows].tolist() if "qos" in cols else [""] * n
+    return [
+        Pod(name=name, cpu_milli=cpu, memory_mib=mem, num_gpu=num_gpu, gpu_milli=gpu_milli,
+            creation_time=creation_time, duration=duration, priority=QOS_PRIORITY.get(qos, 0), qos=qos)
+        for name, cpu, mem, num_gpu, gpu_milli, creation_time, duration, qos in zip(
+            cols["name"][rows].tolist(), cols["cpu_milli"][rows].tolist(), cols["memory_mib"][rows].tolist(),
+            cols["num_gpu"][rows].tolist(), cols["gpu_milli"][rows].tolist(), creation_times, durations, qos_list)
+    ]
+
+def get_h_pods(count: int, use_trace_time: bool = False) -> List[Pod]:
+    """取 CSV 前 count 个 Pod（按 CSV 顺序）。use_trace_time 的默认值与 iter_h_pods 相同（False）：
+    所有 Pod 在 0 时刻到达、运行 3600 秒；True 时回放 trace 的到达时间与运行时长（见 _build_pods）
+    """
+    cols = load_h_pod_columns()
+    n = min(count, len(cols["name"]))
+    return _build_pods(cols, np.arange(n), use_trace_time)
+
+class TracePodIterator:
+    """按 creation_time 顺序（同时间保持 CSV 顺序）逐批构造 Pod 的迭代器，供流式仿真使用。
+    只保存列式数组与游标，可以被 pickle。
+    """
+    def __init__(self, cols: Columns, rows: np.ndarray, batch_size: int = 1024, use_trace_time: bool = False):
+        self.cols = cols
+        self.rows = rows
+        self.batch_size = batch_size
+        self.use_trace_time = use_trace_time
+        self.cursor = 0
+        self._buffer: List[Pod] = []
+
+    def __iter__(self) -> "TracePodIterator":
+        return self
+
+    def __len__(self) -> int:
+        return len(self.rows) - self.cursor + len(self._buffer)
+
+    def __next__(self) -> Pod:
+        if not self._buffer:
+            if self.cursor >= len(self.rows):
+                raise StopIteration
+            batch = self.rows[self.cursor:self.cursor + self.batch_size]
+            self.cursor += len(batch)
+            self._buffer = _build_pods(self.cols, batch, self.use_trace_time)
+            self._buffer.reverse()
+        return self._buffer.pop()
 
-def get_h_pods(count: int) -> List[Pod]:
-    df_pods = pd.read_csv(h_pods_csv_path)
-    pods: List[Pod] = []
-    for i in range(min(count, len(df_pods))):
-        row = df_pods.iloc[i]
-        pod = Pod(
-            name=row["name"],
-            cpu_milli=int(row["cpu_milli"]),
-            memory_mib=int(row["memory_mib"]),
-            num_gpu=int(row["num_gpu"]),
-            gpu_milli=int(row["gpu_milli"]),
-            creation_time=0,
-            duration=3600,
-        )
-        pods.append(pod)
-    return pods
\ No newline at end of file
+def iter_h_pods(count: Optional[int] = None, batch_size: int = 1024, use_trace_time: bool = False) -> TracePodIterator:
+    """get_h_pods 的流式版本（配合 Scheduler(lazy_arrivals=True)），use_trace_time 的含义与默认值相同，
+    两者产出的 Pod 一致；use_trace_time=True（trace 回放）时按创建时间顺序产出，否则按 CSV 顺序
+    """
+    cols = load_h_pod_columns()
+    n = len(cols["name"]) if count is None else min(count, len(cols["name"]))
+    if use_trace_time:
+        rows = np.argsort(cols["creation_time"][:n], kind="stable")
+    else:
+        rows = np.arange(n)
+    return TracePodIterator(cols, rows, batch_size, use_trace_time)
@@ -0,0 +1,66 @@
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from typing import Iterator, List, Tuple
+import itertools
+import math
+import random
+
+# 合成 trace 的资源规格分布：取自 openb pod 列表中最常见的规格（cpu_milli, memory_mib, num_gpu, gpu_milli），
+# 权重为出现次数，另补充少量多卡规格
+POD_SHAPES: List[Tuple[Tuple[int, int, int, int], int]] = [
+    ((3152, 5600, 1, 810), 1047),
+    ((11300, 49152, 1, 1000), 857),
+    ((11400, 48128, 1, 1000), 534),
+    ((3152, 5600, 1, 1000), 470),
+    ((11908, 47104, 1, 470), 388),
+    ((12500, 57344, 0, 0), 364),
+    ((8000, 30517, 1, 470), 360),
+    ((32000, 49152, 0, 0), 284),
+    ((18708, 64512, 1, 1000), 255),
+    ((11908, 47104, 1, 650), 237),
+    ((9810, 41560, 1, 1000), 195),
+    ((8000, 30517, 0, 0), 163),
+    ((24000, 98304, 2, 1000), 120),
+    ((48000, 196608, 4, 1000), 60),
+    ((96000, 393216, 8, 1000), 30),
+]
+
+# 节点规格分布：openb 节点列表中最常见的规格（cpu_milli, memory_mib, gpu）
+NODE_SHAPES: List[Tuple[Tuple[int, int, int], int]] = [
+    ((96000, 393216, 8), 549),
+    ((104000, 524288, 2), 387),
+    ((32000, 262144, 0), 129),
+    ((16000, 122880, 2), 107),
+    ((96000, 524288, 0), 59),
+    ((128000, 786432, 8), 39),
+    ((32000, 131072, 4), 28),
+]
+
+def synthetic_nodes(count: int, allow_gpu_share: bool, seed: int = 0) -> List[Node]:
+    rng = random.Random(seed)
+    shapes = [shape for shape, _ in NODE_SHAPES]
+    cum_weights = list(itertools.accumulate(w for _, w in NODE_SHAPES))
+    nodes = []
+    for k in range(count):
+        cpu, mem, gpu = rng.choices(shapes, cum_weights=cum_weights)[0]
+        nodes.append(Node(name=f"syn-node-{k:05d}", cpu_milli_total=cpu, memory_mib_total=mem, gpu_count=gpu,
+                          gpu_share_enabled=allow_gpu_share))
+    return nodes
+
+def synthetic_pods(count: int, seed: int = 0, mean_interarrival: float = 10.0,
+                   median_duration: float = 540.0, duration_sigma: float = 2.0) -> Iterator[Pod]:
+    """按 creation_time 升序逐个生成 Pod（可直接作为 Scheduler(lazy_arrivals=True) 的到达流）。
+    到达间隔服从指数分布，运行时长服从对数正态分布（中位数 median_duration）。
+    相同参数与种子生成的序列完全相同。
+    """
+    rng = random.Random(seed)
+    shapes = [shape for shape, _ in POD_SHAPES]
+    cum_weights = list(itertools.accumulate(w for _, w in POD_SHAPES))
+    mu = math.log(median_duration)
+    now = 0.0
+    for k in range(count):
+        now += rng.expovariate(1.0 / mean_interarrival)
+        cpu, mem, num_gpu, gpu_milli = rng.choices(shapes, cum_weights=cum_weights)[0]
+        duration = max(1, int(rng.lognormvariate(mu, duration_sigma)))
+        yield Pod(name=f"syn-pod-{k:07d}", cpu_milli=cpu, memory_mib=mem, num_gpu=num_gpu, gpu_milli=gpu_milli,
+                  creation_time=int(now), duration=duration)
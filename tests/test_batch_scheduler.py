@@ -0,0 +1,61 @@
+from simulator.core.scheduler import Scheduler
+from simulator.core.batch_scheduler import BatchScheduler
+from simulator.models.cluster_state import ClusterArrays
+from simulator.models.resource import get_target_pod_list_from_pods
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.queue_sort.priority import QueueSortPriority
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.plugins.score.binpack import ScoreBinPack
+from simulator.plugins.score.drift import ScoreDrift
+from simulator.plugins.post_filter.preemption import DefaultPreemption
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+import numpy as np
+import pytest
+import random
+
+def test_feasible_matrix_matches_feasible_mask():
+    arrays = ClusterArrays()
+    for node in synthetic_nodes(12, allow_gpu_share=False, seed=5):
+        arrays.add_node(node)
+    pods = list(synthetic_pods(30, seed=5))
+    requests = np.array([(p.cpu_milli, p.memory_mib, p.num_gpu, p.gpu_milli) for p in pods])
+    fit = arrays.feasible_matrix(*requests.T)
+    assert fit.tolist() == [arrays.feasible_mask(*r).tolist() for r in requests.tolist()]
+    rows = np.array([3, 7])
+    assert arrays.feasible_matrix(*requests.T, rows=rows).tolist() == fit[:, rows].tolist()
+
+
+@pytest.mark.parametrize("score_plugin", [ScoreKubernetes, ScoreBinPack])
+def test_batch_scheduler_matches_sequential(score_plugin):
+    def run(cls):
+        s = cls(synthetic_nodes(10, allow_gpu_share=True, seed=6), list(synthetic_pods(500, seed=6)),
+                QueueSortFIFO(), FilterResourceFit(), score_plugin(), seed=2)
+        s.run(report=False)
+        return s.fingerprint()
+
+    assert run(BatchScheduler) == run(Scheduler)
+
+
+def test_batch_scheduler_with_preemption_matches_sequential():
+    def run(cls):
+        pods = list(synthetic_pods(500, seed=8, mean_interarrival=0.5))
+        rng = random.Random(1)
+        for pod in pods:
+            pod.priority = rng.choice([0, 0, 1, 2])
+        s = cls(synthetic_nodes(8, allow_gpu_share=True, seed=8), pods, QueueSortPriority(), FilterResourceFit(),
+                ScoreKubernetes(), seed=0, post_filter_plugin=DefaultPreemption())
+        metrics = s.run(report=False)
+        return metrics.evictions, s.fingerprint()
+
+    evictions, fingerprint = run(BatchScheduler)
+    assert evictions > 0
+    assert run(Scheduler) == (evictions, fingerprint)
+
+
+def test_batch_scheduler_falls_back_without_kernels():
+    pods = list(synthetic_pods(100, seed=9))
+    s = BatchScheduler(synthetic_nodes(4, allow_gpu_share=True, seed=9), pods, QueueSortFIFO(), FilterResourceFit(),
+                       ScoreDrift(get_target_pod_list_from_pods(pods)))
+    assert not s.batch_enabled
+    assert s.run(report=False).completed_pods == 100
@@ -0,0 +1,24 @@
+from simulator.experiments.engine_check import VARIANTS, run_variant
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+import pytest
+
+def workload(score: str):
+    return (synthetic_nodes(8, allow_gpu_share=(score != "k8s"), seed=2),
+            list(synthetic_pods(300, seed=11, mean_interarrival=2.0)))
+
+
+@pytest.mark.parametrize("score", ["k8s", "binpack", "drift"])
+def test_optimized_engines_match_reference(score):
+    nodes, pods = workload(score)
+    runs = {}
+    for variant in VARIANTS:
+        runs[variant] = run_variant(variant, nodes, pods, score, seed=3)
+    assert runs["reference"].placements_count == 300
+    assert len({s.fingerprint() for s in runs.values()}) == 1
+
+
+def test_fingerprint_depends_on_seed():
+    nodes, pods = workload("k8s")
+    a, b, c = (run_variant("reference", nodes, pods, "k8s", seed) for seed in (1, 1, 2))
+    assert a.fingerprint() == b.fingerprint()
+    assert a.placement_digest() != c.placement_digest()
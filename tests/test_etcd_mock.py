@@ -1,6 +1,7 @@
 from simulator.models.etcd_mock import EtcdMock
 from simulator.models.node import Node
 from simulator.models.pod import Pod, PodStatus
+import pytest
 
 def test_gpu_packing_prefer_fuller_single_gpu():
     e = EtcdMock()
@@ -135,3 +136,73 @@ def test_unbind_restores_all_resources_and_indices():
     # 确认确实发生过变化（不是空测）
     assert alloc_before != {}
     assert free_before != [1000, 1000]
+
+
+def test_vectorized_state_matches_nodes():
+    import random
+    from simulator.plugins.score.binpack import ScoreBinPack
+    from simulator.plugins.score.k8s import ScoreKubernetes
+    from simulator.plugins.interface import ScorePlugin
+
+    rng = random.Random(3)
+    e = EtcdMock(vectorized=True)
+    for i in range(12):
+        e.add_node(Node(name=f"n{i}", cpu_milli_total=16000, memory_mib_total=65536,
+                        gpu_count=rng.choice([0, 1, 4, 8]), gpu_share_enabled=(i % 2 == 0)))
+
+    running = []
+    for k in range(150):
+        pod = Pod(name=f"p{k}", cpu_milli=rng.choice([500, 2000]), memory_mib=1024,
+                  num_gpu=rng.choice([0, 1, 2]), gpu_milli=rng.choice([200, 500, 1000]))
+        e.add_pod(pod)
+        feas = e.feasible_nodes(pod.name)
+        # 数组掩码与逐节点 check_bindable 一致
+        assert [n.name for n in feas] == [name for name in e.nodes if e.check_bindable(pod.name, name)]
+        # 向量化打分与逐节点 score 一致
+        for scorer in (ScoreBinPack(), ScoreKubernetes()):
+            assert scorer.score_nodes(pod, feas, e) == ScorePlugin.score_nodes(scorer, pod, feas, e)
+        if feas:
+            e.bind(pod.name, rng.choice(feas).name)
+            running.append(pod.name)
+        if running and rng.random() < 0.4:
+            e.unbind(running.pop(rng.randrange(len(running))))
+
+    arrays = e.arrays
+    for name, node in e.nodes.items():
+        i = arrays.index[name]
+        assert arrays.cpu_milli_free[i] == node.cpu_milli_free
+        assert arrays.memory_mib_free[i] == node.memory_mib_free
+        assert arrays.gpu_free_milli[i, :node.gpu_count].tolist() == node.gpu_free_milli
+        assert arrays.pod_count[i] == len(e.pods_on_node(name))
+
+
+def test_bind_with_explicit_gpu_placement():
+    e = EtcdMock()
+    e.add_node(Node(name="s", cpu_milli_total=8000, memory_mib_total=8192, gpu_count=4, gpu_share_enabled=True))
+    e.add_node(Node(name="x", cpu_milli_total=8000, memory_mib_total=8192, gpu_count=2, gpu_share_enabled=False))
+    for i, (num_gpu, milli) in enumerate([(1, 300), (2, 600), (1, 500), (1, 200)]):
+        e.add_pod(Pod(name=f"p{i}", cpu_milli=100, memory_mib=1, num_gpu=num_gpu, gpu_milli=milli))
+
+    # 不指定时按 best-fit；指定时使用给定的 GPU
+    e.bind("p0", "s")
+    assert e.pods["p0"].gpu_alloc == {0: 300}
+    e.bind("p1", "s", gpu_ids=(1, 3))
+    assert e.pods["p1"].gpu_alloc == {1: 600, 3: 600}
+    assert e.nodes["s"].gpu_free_milli == [700, 400, 1000, 400]
+    assert e.gpu_slots["s"].best_fit(300, 2) == [1, 3]
+    assert e.gpu_slots["s"].count_fit(500) == 2
+
+    # 放不下、重复或数量不对的放置被拒绝，节点状态不变
+    for gpu_ids in [(1,), (0, 0), (0, 2)]:
+        with pytest.raises(ValueError):
+            e.bind("p2", "s", gpu_ids=gpu_ids)
+    assert e.pods["p2"].status == PodStatus.Pending
+    assert e.nodes["s"].gpu_free_milli == [700, 400, 1000, 400]
+
+    # 独占节点上有 Pod 的 GPU 不可再放置
+    e.bind("p2", "x", gpu_ids=(1,))
+    with pytest.raises(ValueError):
+        e.bind("p3", "x", gpu_ids=(1,))
+    assert not e.check_bindable("p1", "x")
+    e.unbind("p2")
+    assert e.gpu_slots["x"].count_fit(1000) == 2
@@ -26,4 +26,47 @@ def test_resource_fit_filter_plugin():
 
     assert len(feasible_nodes_pod2) == 2
     assert set(node.name for node in feasible_nodes_pod2) == {"n1", "n2"}
-    
\ No newline at end of file
+    
+def test_resource_fit_index_matches_full_scan():
+    import random
+    rng = random.Random(7)
+    e = EtcdMock()
+    for i in range(30):
+        e.add_node(Node(name=f"n{i}", cpu_milli_total=rng.choice([8000, 16000, 32000]), memory_mib_total=65536,
+                        gpu_count=rng.choice([0, 2, 4, 8]), gpu_share_enabled=(i % 3 != 0)))
+
+    shapes = [(1000, 2048, 0, 0), (2000, 4096, 1, 1000), (500, 1024, 1, 460), (4000, 8192, 2, 500), (1000, 1024, 1, 250)]
+    indexed = FilterResourceFit()
+    scan = FilterResourceFit(use_index=False)
+    bound = []
+    for k in range(200):
+        cpu, mem, num_gpu, gpu_milli = rng.choice(shapes)
+        pod = Pod(name=f"p{k}", cpu_milli=cpu, memory_mib=mem, num_gpu=num_gpu, gpu_milli=gpu_milli)
+        e.add_pod(pod)
+        expected = sorted(n.name for n in scan.filter(pod, e))
+        got = indexed.filter(pod, e)
+        # 索引结果与全量扫描一致，且按节点加入顺序返回
+        assert sorted(n.name for n in got) == expected
+        assert [n.name for n in got] == [name for name in e.nodes if name in set(expected)]
+        if got:
+            e.bind(pod.name, rng.choice(got).name)
+            bound.append(pod.name)
+        if bound and rng.random() < 0.3:
+            e.unbind(bound.pop(rng.randrange(len(bound))))
+
+def test_resource_fit_scan_order_is_deterministic():
+    from simulator.plugins.executor import SharedThreadPoolExecution
+    e = EtcdMock()
+    for i in range(20):
+        e.add_node(Node(name=f"n{i}", cpu_milli_total=4000 if i % 2 else 1000, memory_mib_total=8192, gpu_count=0))
+    pod = Pod(name="p", cpu_milli=2000, memory_mib=1024)
+    e.add_pod(pod)
+
+    serial = FilterResourceFit(use_index=False)
+    threaded = FilterResourceFit(use_index=False)
+    threaded.set_executor(SharedThreadPoolExecution(max_workers=4))
+
+    expected = [f"n{i}" for i in range(1, 20, 2)]
+    assert [n.name for n in serial.filter(pod, e)] == expected
+    assert [n.name for n in threaded.filter(pod, e)] == expected
+    threaded.executor.close()
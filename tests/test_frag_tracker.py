@@ -0,0 +1,92 @@
+from simulator.core.scheduler import Scheduler
+from simulator.core.metrics import TimeSeriesRecorder
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.frag import Fragment, FragmentType, TypicalPodMatrix, batch_frag_amounts
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.models.resource import NodeResource, get_target_pod_list_from_pods
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.drift import ScoreDrift
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+import numpy as np
+import pytest
+
+def recompute(e, typical):
+    totals = {ftype: 0.0 for ftype in FragmentType}
+    for node in e.nodes.values():
+        for ftype, amount in Fragment(NodeResource(node), typical).frag_amount.items():
+            totals[ftype] += amount
+    return totals
+
+
+def test_batch_frag_amounts_matches_fragment():
+    pods = list(synthetic_pods(100, seed=3))
+    typical = get_target_pod_list_from_pods(pods)
+    e = EtcdMock()
+    e.add_nodes(synthetic_nodes(12, allow_gpu_share=True, seed=3))
+    e.add_pods(pods)
+    for pod in pods[:60]:
+        feasible = e.feasible_nodes(pod.name)
+        if feasible:
+            e.bind(pod.name, feasible[-1].name)
+    nodes = list(e.nodes.values())
+    free_gpus = np.zeros((len(nodes), 8), dtype=np.int64)
+    for row, node in enumerate(nodes):
+        free_gpus[row, :node.gpu_count] = node.gpu_free_milli
+    amounts = batch_frag_amounts(np.array([n.cpu_milli_free for n in nodes]), free_gpus, TypicalPodMatrix(typical))
+    for node, row in zip(nodes, amounts):
+        expected = Fragment(NodeResource(node), typical).frag_amount
+        assert row.tolist() == pytest.approx([expected[ftype] for ftype in FragmentType])
+
+
+def test_tracker_follows_bind_and_unbind_incrementally():
+    pods = list(synthetic_pods(300, seed=4, mean_interarrival=2.0))
+    typical = get_target_pod_list_from_pods(pods)
+    nodes = synthetic_nodes(10, allow_gpu_share=True, seed=4)
+    recorder = TimeSeriesRecorder(capacity=1024)
+    s = Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), ScoreDrift(typical), seed=0,
+                  recorder=recorder, fragmentation_typical_pods=typical)
+    tracker = s.etcd.frag_tracker
+    assert tracker.updates == 10
+
+    # 运行中途：增量合计与逐节点重新计算一致，recorder 直接读取合计
+    checked = []
+    original_sample = recorder.sample
+    def sample(time, e, *args):
+        original_sample(time, e, *args)
+        if len(checked) < 30:
+            totals = recompute(e, typical)
+            for ftype in FragmentType:
+                assert tracker.amount(ftype) == pytest.approx(totals[ftype], abs=1e-6)
+            assert recorder.to_arrays()["fragmentation"][-1] == tracker.total_except_q3()
+            checked.append(time)
+    recorder.sample = sample
+
+    metrics = s.run(report=False)
+    assert len(checked) == 30
+    # 每次 bind / unbind 只更新一个节点
+    assert tracker.updates == 10 + 2 * metrics.completed_pods
+    assert metrics.mean_fragmentation is not None and metrics.mean_fragmentation > 0
+    assert set(tracker.report()["time_average"]) == {ftype.value for ftype in FragmentType}
+
+
+def test_tracker_time_average():
+    typical = get_target_pod_list_from_pods([Pod(name="t", cpu_milli=1000, memory_mib=1, num_gpu=1, gpu_milli=1000)])
+    e = EtcdMock()
+    e.add_node(Node(name="n", cpu_milli_total=4000, memory_mib_total=100, gpu_count=2, gpu_share_enabled=True))
+    tracker = e.enable_fragmentation_tracker(typical)
+    e.add_pod(Pod(name="p", cpu_milli=1000, memory_mib=1, num_gpu=1, gpu_milli=500))
+
+    # 与 Scheduler.run 相同：先推进时间，再应用该时刻的状态变化
+    tracker.advance(0)
+    assert tracker.mean_except_q3() is None
+    assert tracker.total_except_q3() == 0.0     # 两张空闲 GPU 都能放下 typical pod
+    tracker.advance(10)
+    e.bind("p", "n")
+    assert tracker.total_except_q3() == 500.0   # 剩余 500 的 GPU 放不下整卡 Pod
+    tracker.advance(30)
+    e.unbind("p")
+    assert tracker.total_except_q3() == 0.0
+    # 0~10 秒碎片量为 0，10~30 秒为 500
+    assert tracker.mean_except_q3() == pytest.approx(500.0 * 20 / 30)
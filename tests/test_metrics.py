@@ -0,0 +1,69 @@
+from simulator.core.scheduler import Scheduler
+from simulator.core.metrics import TimeSeriesRecorder
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.models.frag import Fragment
+from simulator.models.resource import NodeResource, get_target_pod_list_from_pods
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+import numpy as np
+import pytest
+import random
+
+def build(recorder: TimeSeriesRecorder, pods) -> Scheduler:
+    return Scheduler(synthetic_nodes(5, allow_gpu_share=True, seed=1), pods, QueueSortFIFO(), FilterResourceFit(),
+                     ScoreKubernetes(), recorder=recorder)
+
+
+def test_run_returns_metrics_and_records_time_series(tmp_path):
+    pods = list(synthetic_pods(200, seed=2))
+    typical = get_target_pod_list_from_pods(pods)
+    recorder = TimeSeriesRecorder(capacity=64, typical_pods=typical)
+    s = build(recorder, pods)
+
+    # 增量计数与逐节点重新统计一致（在运行中途检查）
+    checked = []
+    original_sample = recorder.sample
+    def sample(time, e, *args):
+        original_sample(time, e, *args)
+        if len(checked) < 20:
+            assert e.allocated_cpu_milli == sum(n.cpu_milli_total - n.cpu_milli_free for n in e.nodes.values())
+            assert e.allocated_gpu_milli == sum(1000 * n.gpu_count - sum(n.gpu_free_milli) for n in e.nodes.values())
+            frag = sum(Fragment(NodeResource(n), typical).get_frag_amount_sum_except_q3() for n in e.nodes.values())
+            assert recorder.to_arrays()["fragmentation"][-1] == pytest.approx(frag)
+            checked.append(time)
+    recorder.sample = sample
+
+    random.seed(0)
+    metrics = s.run(report=False)
+    assert metrics.completed_pods == metrics.pods == 200
+    assert metrics.makespan == s.current_time
+    assert metrics.events == 400
+
+    # 环形缓冲区只保留最后 capacity 个样本，按时间顺序
+    series = recorder.to_arrays()
+    assert recorder.total_samples == 400 and len(series["time"]) == 64
+    assert np.all(np.diff(series["time"]) >= 0) and series["time"][-1] == metrics.makespan
+    assert series["running_pods"][-1] == 0 and series["cpu_allocation"][-1] == 0
+
+    # 写文件模式保留完整曲线
+    path = str(tmp_path / "series.csv")
+    streamed = TimeSeriesRecorder(capacity=64, path=path)
+    random.seed(0)
+    build(streamed, list(synthetic_pods(200, seed=2))).run(report=False)
+    rows = np.loadtxt(path, delimiter=",", skiprows=1)
+    assert rows.shape == (400, len(TimeSeriesRecorder.COLUMNS))
+    assert np.array_equal(rows[-64:, 0], series["time"])
+
+def test_latency_aggregates_every_event_between_samples(tmp_path):
+    # 采样间隔内的每个事件都计入延迟汇总，而不只是触发采样的那个事件
+    path = str(tmp_path / "series.csv")
+    recorder = TimeSeriesRecorder(capacity=16, interval=3600, path=path)
+    random.seed(0)
+    metrics = build(recorder, list(synthetic_pods(200, seed=2))).run(report=False)
+    rows = np.loadtxt(path, delimiter=",", skiprows=1)
+    columns = {name: i for i, name in enumerate(TimeSeriesRecorder.COLUMNS)}
+    assert len(rows) < metrics.events
+    assert rows[:, columns["latency_events"]].sum() == metrics.events
+    assert np.all(rows[:, columns["latency_max"]] >= rows[:, columns["latency_mean"]])
+    assert np.all(rows[:, columns["latency_mean"]] > 0)
@@ -0,0 +1,53 @@
+from simulator.core.node_sampling import NodeSampler, num_feasible_nodes_to_find
+from simulator.core.scheduler import Scheduler
+from simulator.models.node import Node
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.utils.profiler import Profiler
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+
+def test_num_feasible_nodes_to_find():
+    assert num_feasible_nodes_to_find(50, 10) == 50       # 小于 min_feasible 的集群不采样
+    assert num_feasible_nodes_to_find(5000, 100) == 5000
+    assert num_feasible_nodes_to_find(5000, 10) == 500
+    assert num_feasible_nodes_to_find(500, 10) == 100      # 至少 min_feasible 个
+    assert num_feasible_nodes_to_find(5000, 0) == 5000 * 10 // 100  # 自适应：50 - 5000/125 = 10%
+    assert num_feasible_nodes_to_find(10000, 0) == 500     # 自适应比例不低于 5%
+    assert num_feasible_nodes_to_find(10, 50, min_feasible=2) == 5
+
+
+def test_node_sampler_round_robin():
+    nodes = [Node(name=f"n{i}", cpu_milli_total=1, memory_mib_total=1, gpu_count=0) for i in range(10)]
+    sampler = NodeSampler([node.name for node in nodes], percentage=30, min_feasible=2)
+    assert sampler.num_to_find == 3
+    feasible = [nodes[i] for i in (1, 2, 4, 5, 7, 9)]
+    # 从 0 开始检查到 n4 找到 3 个，下一个起点为 5
+    assert [n.name for n in sampler.sample(feasible)] == ["n1", "n2", "n4"]
+    assert sampler.next_start == 5
+    assert [n.name for n in sampler.sample(feasible)] == ["n5", "n7", "n9"]
+    assert sampler.next_start == 0
+    # 从 n9 之后绕回开头
+    sampler.next_start = 8
+    assert [n.name for n in sampler.sample(feasible)] == ["n9", "n1", "n2"]
+    assert sampler.next_start == 3
+    # 可行节点不多于目标数：全部打分，起点不变
+    assert sampler.sample(feasible[:3]) == feasible[:3]
+    assert sampler.next_start == 3
+
+
+def test_scheduler_with_node_sampling():
+    def run(percentage):
+        profiler = Profiler()
+        s = Scheduler(synthetic_nodes(40, allow_gpu_share=True, seed=12), list(synthetic_pods(400, seed=12)),
+                      QueueSortFIFO(), FilterResourceFit(), ScoreKubernetes(), seed=0, profiler=profiler,
+                      percentage_of_nodes_to_score=percentage, min_feasible_nodes_to_find=5)
+        metrics = s.run(report=False)
+        assert metrics.completed_pods == 400
+        return s.placement_digest(), profiler.report()["observations"]
+
+    full_digest, _ = run(None)
+    assert run(100)[0] == full_digest
+    digest, observations = run(25)
+    assert digest != full_digest
+    assert observations["scored_nodes"]["max"] <= 10 < observations["feasible_nodes"]["max"]
@@ -0,0 +1,94 @@
+from simulator.core.scheduler import Scheduler
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.node import Node
+from simulator.models.pod import Pod
+from simulator.models.resource import get_target_pod_list_from_pods
+from simulator.plugins.chain import FilterChain, ScoreChain, default_normalize_score
+from simulator.plugins.interface import CycleState, FilterPlugin
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.binpack import ScoreBinPack
+from simulator.plugins.score.drift import ScoreDrift
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+import pytest
+
+class CountingFilter(FilterPlugin):
+    """只保留名字在 allowed 中的节点，并记录被调用的次数"""
+    def __init__(self, allowed, cost):
+        self.allowed = set(allowed)
+        self.cost = cost
+        self.calls = []
+
+    def filter(self, pod, e, state=None):
+        self.calls.append("filter")
+        return [node for node in e.nodes.values() if node.name in self.allowed]
+
+    def filter_nodes(self, pod, nodes, e, state=None):
+        self.calls.append("filter_nodes")
+        return [node for node in nodes if node.name in self.allowed]
+
+
+def test_filter_chain_runs_in_cost_order_and_short_circuits():
+    e = EtcdMock()
+    for i in range(4):
+        e.add_node(Node(name=f"n{i}", cpu_milli_total=4000, memory_mib_total=8192, gpu_count=1))
+    pod = Pod(name="p", cpu_milli=1000, memory_mib=1024, num_gpu=0, gpu_milli=0, creation_time=0, duration=1)
+    e.add_pod(pod)
+
+    expensive = CountingFilter(["n0", "n1", "n2"], cost=10)
+    cheap = CountingFilter(["n1", "n2", "n3"], cost=1)
+    chain = FilterChain([expensive, cheap, FilterResourceFit()])
+    assert chain.filters[0] is cheap
+    assert [n.name for n in chain.filter(pod, e)] == ["n1", "n2"]
+    assert cheap.calls == ["filter"] and expensive.calls == ["filter_nodes"]
+
+    empty = CountingFilter([], cost=0)
+    expensive.calls.clear()
+    assert FilterChain([expensive, empty]).filter(pod, e) == []
+    assert expensive.calls == []
+
+
+def test_score_chain_is_weighted_sum_of_normalized_scores():
+    nodes = synthetic_nodes(8, allow_gpu_share=True, seed=2)
+    pods = list(synthetic_pods(40, seed=2))
+    e = EtcdMock()
+    e.add_nodes(nodes)
+    e.add_pods(pods)
+    for pod in pods[:20]:
+        feasible = e.feasible_nodes(pod.name)
+        if feasible:
+            e.bind(pod.name, feasible[0].name, 0)
+
+    drift = ScoreDrift(get_target_pod_list_from_pods(pods))
+    binpack = ScoreBinPack()
+    chain = ScoreChain([(drift, 2.0), (binpack, 0.5)])
+    assert chain.cacheable_scores
+    for pod in pods[20:]:
+        feasible = e.feasible_nodes(pod.name)
+        expected = [2.0 * d / 10 + 0.5 * b for d, b in
+                    zip(drift.score_nodes(pod, feasible, e), binpack.score_nodes(pod, feasible, e))]
+        assert chain.score_nodes(pod, feasible, e, CycleState(pod)) == pytest.approx(expected)
+
+    with pytest.raises(ValueError):
+        ScoreChain([(binpack, 0)])
+
+
+def test_default_normalize_score():
+    assert default_normalize_score([0.0, 5.0, 10.0]) == [0.0, 50.0, 100.0]
+    assert default_normalize_score([0.0, 5.0, 10.0], reverse=True) == [100.0, 50.0, 0.0]
+    assert default_normalize_score([0.0, 0.0]) == [0.0, 0.0]
+
+
+def test_single_plugin_chain_matches_plugin():
+    def run(filter_plugin, score_plugin, cache_scores=True):
+        s = Scheduler(synthetic_nodes(10, allow_gpu_share=False, seed=3), list(synthetic_pods(400, seed=3)),
+                      QueueSortFIFO(), filter_plugin, score_plugin, seed=1, cache_scores=cache_scores)
+        s.run(report=False)
+        return s.placement_digest()
+
+    expected = run(FilterResourceFit(), ScoreKubernetes())
+    assert run(FilterChain([FilterResourceFit()]), ScoreChain([(ScoreKubernetes(), 3.0)])) == expected
+    # 组合打分在有无分数缓存时结果一致
+    combo = lambda: ScoreChain([(ScoreKubernetes(), 1.0), (ScoreBinPack(), 1.0)])
+    assert run(FilterResourceFit(), combo()) == run(FilterResourceFit(), combo(), cache_scores=False)
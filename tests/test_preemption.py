@@ -0,0 +1,138 @@
+from simulator.core.scheduler import Scheduler
+from simulator.core.scheduling_queue import SchedulingQueue
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.node import Node
+from simulator.models.pod import Pod, PodStatus
+from simulator.plugins.queue_sort.priority import QueueSortPriority
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.plugins.post_filter.preemption import DefaultPreemption
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+import random
+
+def make_pod(name, cpu, priority, creation_time=0, duration=100, num_gpu=0, gpu_milli=0):
+    return Pod(name=name, cpu_milli=cpu, memory_mib=1, num_gpu=num_gpu, gpu_milli=gpu_milli,
+               creation_time=creation_time, duration=duration, priority=priority)
+
+
+def test_select_minimal_victims_with_reprieve():
+    e = EtcdMock()
+    e.add_node(Node(name="n0", cpu_milli_total=4000, memory_mib_total=100, gpu_count=0))
+    e.enable_priority_index()
+    running = [make_pod("low-early", 1000, 0), make_pod("low-late", 1000, 0),
+               make_pod("mid", 1000, 1), make_pod("high", 1000, 5)]
+    for t, pod in enumerate(running):
+        e.add_pod(pod)
+        e.bind(pod.name, "n0", t)
+    assert e.priority_index.lower_priority_pods("n0", 2) == ["low-late", "low-early", "mid"]
+    assert e.priority_index.releasable("n0", 1) == (2000, 2, 0, 2)
+
+    # 需要两个 Pod 的资源：重要的 mid 被保留，驱逐两个 priority 0
+    preemptor = make_pod("p", 2000, 2)
+    e.add_pod(preemptor)
+    node, victims = DefaultPreemption().post_filter(preemptor, e)
+    assert node.name == "n0"
+    assert sorted(v.name for v in victims) == ["low-early", "low-late"]
+
+    # 只需一个 Pod 的资源：驱逐最晚启动的最低优先级 Pod
+    small = make_pod("s", 1000, 2)
+    e.add_pod(small)
+    _, victims = DefaultPreemption().post_filter(small, e)
+    assert [v.name for v in victims] == ["low-late"]
+
+    # 没有更低优先级的 Pod 可驱逐
+    assert DefaultPreemption().post_filter(make_pod("z", 1000, 0), e) is None
+
+
+def test_preemption_picks_node_with_least_important_victims():
+    e = EtcdMock()
+    for name in ("a", "b"):
+        e.add_node(Node(name=name, cpu_milli_total=1000, memory_mib_total=100, gpu_count=0))
+    e.enable_priority_index()
+    for pod, node in ((make_pod("on-a", 1000, 1), "a"), (make_pod("on-b", 1000, 0), "b")):
+        e.add_pod(pod)
+        e.bind(pod.name, node, 0)
+    preemptor = make_pod("p", 1000, 3)
+    e.add_pod(preemptor)
+    node, victims = DefaultPreemption().post_filter(preemptor, e)
+    assert node.name == "b" and [v.name for v in victims] == ["on-b"]
+
+
+def test_evicted_pod_resumes_with_remaining_duration():
+    nodes = [Node(name="n0", cpu_milli_total=1000, memory_mib_total=100, gpu_count=0)]
+    low = make_pod("low", 1000, 0, creation_time=0, duration=100)
+    high = make_pod("high", 1000, 1, creation_time=30, duration=50)
+    s = Scheduler(nodes, [low, high], QueueSortPriority(), FilterResourceFit(), ScoreKubernetes(),
+                  post_filter_plugin=DefaultPreemption())
+    s.enable_placement_log()
+    metrics = s.run(report=False)
+
+    # low 运行 30 秒后被驱逐，high 完成后以剩余的 70 秒重新运行；旧的完成事件被丢弃
+    assert [(t, name, node) for t, name, node, _ in s.placement_log] == \
+        [(0, "low", "n0"), (30, "low", None), (30, "high", "n0"), (80, "low", "n0")]
+    assert low.status == PodStatus.Completed and low.duration == 70
+    assert metrics.makespan == 150
+    assert metrics.evictions == 1 and metrics.completed_pods == 2
+    # 利用率统计的是实际占用的资源时间：30 + 50 + 70 秒
+    assert s.etcd.completed_cpu_milli_time == 1000 * 150
+
+
+def test_parked_pod_retries_preemption_after_release():
+    nodes = [Node(name="n0", cpu_milli_total=4000, memory_mib_total=100, gpu_count=0)]
+    h1 = make_pod("h1", 3000, 2, creation_time=0, duration=100)
+    p = make_pod("p", 4000, 2, creation_time=1, duration=10)
+    low = make_pod("low", 1000, 0, creation_time=2, duration=1000)
+    s = Scheduler(nodes, [h1, p, low], QueueSortPriority(), FilterResourceFit(), ScoreKubernetes(),
+                  post_filter_plugin=DefaultPreemption())
+    s.enable_placement_log()
+    metrics = s.run(report=False)
+
+    # t=1 时没有可驱逐的 Pod，p 进入 unschedulableQ；h1 完成后驱逐 low 即可放下，p 重新尝试抢占
+    assert [(t, name, node) for t, name, node, _ in s.placement_log][:4] == \
+        [(0, "h1", "n0"), (2, "low", "n0"), (100, "low", None), (100, "p", "n0")]
+    assert metrics.evictions == 1 and metrics.completed_pods == 3
+
+
+def test_lower_priority_bind_reactivates_parked_class():
+    e = EtcdMock()
+    node = Node(name="n0", cpu_milli_total=4000, memory_mib_total=100, gpu_count=2, gpu_share_enabled=False)
+    e.add_node(node)
+    e.enable_priority_index()
+    for pod in [make_pod("h1", 1000, 2, num_gpu=1, gpu_milli=500), make_pod("h2", 1000, 2, num_gpu=1, gpu_milli=500)]:
+        e.add_pod(pod)
+        e.bind(pod.name, "n0")
+    queue = SchedulingQueue(QueueSortPriority(), by_priority=True)
+    p = make_pod("p", 1000, 2, num_gpu=1, gpu_milli=1000)
+    e.add_pod(p)
+    queue.mark_unschedulable(p, whole_class=True)
+
+    # 节点上没有更低优先级的 Pod：同优先级的绑定不带来抢占机会
+    same = make_pod("same", 100, 2)
+    e.add_pod(same)
+    e.bind("same", "n0")
+    assert queue.on_pod_bound(same, node, e) == 0
+    # 绑定了更低优先级的 Pod 后，p 的等价类移回 activeQ 重新尝试抢占
+    low = make_pod("low", 100, 0)
+    e.add_pod(low)
+    e.bind("low", "n0")
+    assert queue.on_pod_bound(low, node, e) == 1
+    assert queue.pop() is p
+
+
+def test_preemption_run_is_deterministic_and_consistent():
+    def run(use_index):
+        pods = list(synthetic_pods(600, seed=4, mean_interarrival=0.5))
+        rng = random.Random(0)
+        for pod in pods:
+            pod.priority = rng.choice([0, 0, 1, 2])
+        s = Scheduler(synthetic_nodes(8, allow_gpu_share=True, seed=4), pods, QueueSortPriority(),
+                      FilterResourceFit(use_index=use_index), ScoreKubernetes(), seed=0,
+                      post_filter_plugin=DefaultPreemption(), cache_feasible=use_index)
+        metrics = s.run(report=False)
+        assert metrics.completed_pods == 600
+        assert not s.etcd.running_pods and not s.etcd.pending_pods
+        return metrics.evictions, s.fingerprint()
+
+    evictions, fingerprint = run(use_index=True)
+    assert evictions > 0
+    assert run(use_index=False) == (evictions, fingerprint)
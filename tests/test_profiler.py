@@ -0,0 +1,41 @@
+from simulator.core.scheduler import Scheduler
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.drift import ScoreDrift
+from simulator.models.resource import get_target_pod_list_from_pods
+from simulator.utils.profiler import Profiler
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+from simulator.utils.logger import Logger, INFO, WARNING
+
+def test_profiler_records_phases_and_plugin_counters():
+    pods = list(synthetic_pods(150, seed=4))
+    profiler = Profiler()
+    s = Scheduler(synthetic_nodes(5, allow_gpu_share=True), pods, QueueSortFIFO(), FilterResourceFit(),
+                  ScoreDrift(get_target_pod_list_from_pods(pods)), profiler=profiler)
+    s.run(report=False)
+
+    report = profiler.report()
+    phases = report["phases"]
+    assert phases["bind"]["count"] == 150
+    assert phases["event"]["count"] == phases["schedule_cycle"]["count"] == 300
+    # 每次 queue_sort 要么取出一个 Pod，要么发现 activeQ 为空结束本轮
+    assert phases["queue_sort"]["count"] == phases["filter"]["count"] + 300
+    assert report["observations"]["feasible_nodes"]["count"] == phases["filter"]["count"]
+    counters = report["counters"]
+    # 同一批内重复的签名只计算一次
+    assert 0 < counters["drift.fragment_evaluations"] <= counters["drift.frag_cache_misses"]
+    assert counters["score_cache.hits"] + counters["score_cache.misses"] > 0
+    assert "feasible_nodes" in profiler.format_report()
+
+
+def test_logger_formats_lazily(capsys):
+    class Boom:
+        def __str__(self):
+            raise AssertionError("formatted a suppressed message")
+
+    log = Logger(debug_mode=False, level=WARNING)
+    log.debug("%s", Boom())
+    log.info("%s", Boom())
+    log.warning("pod %s on %s", "p1", "n1")
+    assert capsys.readouterr().out.rstrip().endswith("[WARNING] pod p1 on n1")
+    assert Logger(debug_mode=False).is_enabled_for(INFO)
@@ -0,0 +1,90 @@
+from simulator.utils.reader import (
+    load_columns, POD_INT_COLUMNS, POD_STR_COLUMNS, COLUMN_CACHE_SUFFIX, TracePodIterator, _columns_memo, _build_pods,
+    get_h_pods, iter_h_pods,
+)
+import os
+import pickle
+import numpy as np
+
+CSV = """name,cpu_milli,memory_mib,num_gpu,gpu_milli,gpu_spec,qos,pod_phase,creation_time,deletion_time,scheduled_time
+pod-a,12000,16384,1,1000,,LS,Running,30,100,30
+pod-b,6000,12288,1,460,V100M16,BE,Running,10,50,10
+pod-c,4000,8192,0,0,,LS,Pending,10,,
+"""
+
+def test_load_columns_and_disk_cache(tmp_path):
+    csv_path = str(tmp_path / "pods.csv")
+    with open(csv_path, "w") as f:
+        f.write(CSV)
+
+    cols = load_columns(csv_path, POD_INT_COLUMNS, POD_STR_COLUMNS)
+    assert cols["name"].tolist() == ["pod-a", "pod-b", "pod-c"]
+    assert cols["cpu_milli"].dtype == np.int64
+    assert cols["gpu_spec"].tolist() == ["", "V100M16", ""]
+    # 缺失的时间列记为 -1
+    assert cols["deletion_time"].tolist() == [100, 50, -1]
+    assert os.path.exists(csv_path + COLUMN_CACHE_SUFFIX)
+
+    # 清掉进程内缓存后从 .npz 加载，结果一致
+    _columns_memo.clear()
+    cached = load_columns(csv_path, POD_INT_COLUMNS, POD_STR_COLUMNS)
+    for c in POD_INT_COLUMNS + POD_STR_COLUMNS:
+        assert cached[c].tolist() == cols[c].tolist()
+
+
+def test_trace_pod_iterator_creation_order():
+    cols = {
+        "name": np.array(["a", "b", "c", "d"]),
+        "cpu_milli": np.array([1, 2, 3, 4]),
+        "memory_mib": np.array([1, 1, 1, 1]),
+        "num_gpu": np.array([0, 0, 0, 0]),
+        "gpu_milli": np.array([0, 0, 0, 0]),
+        "creation_time": np.array([5, 1, 5, 0]),
+    }
+    rows = np.argsort(cols["creation_time"], kind="stable")
+    it = TracePodIterator(cols, rows, batch_size=3)
+    assert next(it).name == "d"
+    # 迭代器可以 pickle，恢复后从游标处继续
+    it = pickle.loads(pickle.dumps(it))
+    assert [p.name for p in it] == ["b", "a", "c"]
+
+
+def test_build_pods_with_trace_time():
+    cols = {
+        "name": np.array(["a", "b", "c"]),
+        "cpu_milli": np.array([1, 2, 3]),
+        "memory_mib": np.array([1, 1, 1]),
+        "num_gpu": np.array([0, 0, 0]),
+        "gpu_milli": np.array([0, 0, 0]),
+        "creation_time": np.array([30, 10, 10]),
+        "deletion_time": np.array([100, 50, -1]),
+    }
+    pods = _build_pods(cols, np.arange(3), use_trace_time=True)
+    assert [p.creation_time for p in pods] == [30, 10, 10]
+    # 未删除的 Pod 运行到 trace 中最晚的删除时间
+    assert [p.duration for p in pods] == [70, 40, 90]
+    assert all(p.duration == 3600 and p.creation_time == 0 for p in _build_pods(cols, np.arange(3)))
+
+
+def test_build_pods_maps_qos_to_priority():
+    cols = {
+        "name": np.array(["a", "b", "c"]),
+        "cpu_milli": np.array([1, 1, 1]),
+        "memory_mib": np.array([1, 1, 1]),
+        "num_gpu": np.array([0, 0, 0]),
+        "gpu_milli": np.array([0, 0, 0]),
+        "qos": np.array(["LS", "BE", ""]),
+    }
+    pods = _build_pods(cols, np.arange(3))
+    assert [(p.qos, p.priority) for p in pods] == [("LS", 2), ("BE", 0), ("", 0)]
+
+
+def test_eager_and_lazy_loaders_share_defaults():
+    def fields(pods):
+        return [(p.name, p.creation_time, p.duration) for p in pods]
+
+    assert fields(iter_h_pods(50)) == fields(get_h_pods(50))
+    # trace 回放：流式版本按创建时间排序，内容相同
+    eager = get_h_pods(50, use_trace_time=True)
+    assert fields(iter_h_pods(50, use_trace_time=True)) == \
+        fields(sorted(eager, key=lambda p: p.creation_time))
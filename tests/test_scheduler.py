@@ -0,0 +1,184 @@
+from simulator.core.scheduler import Scheduler
+from simulator.core.scheduling_queue import SchedulingQueue
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.models.etcd_mock import EtcdMock
+from simulator.models.node import Node
+from simulator.models.pod import Pod, PodStatus
+
+def test_scheduling_queue_unschedulable_backoff():
+    e = EtcdMock()
+    e.add_node(Node(name="n1", cpu_milli_total=2000, memory_mib_total=4096, gpu_count=1, gpu_share_enabled=True))
+    q = SchedulingQueue(QueueSortFIFO())
+
+    big = Pod(name="big", cpu_milli=1500, memory_mib=1024, creation_time=0, duration=10)
+    small = Pod(name="small", cpu_milli=1000, memory_mib=1024, creation_time=1, duration=10)
+    e.add_pod(big)
+    e.add_pod(small)
+    e.bind("big", "n1")
+
+    # small 放不下，进入 unschedulableQ
+    q.push(small)
+    assert q.pop() is small
+    q.mark_unschedulable(small)
+    assert q.pop() is None
+    assert q.unschedulable_count() == 1
+
+    # 释放 n1 后 small 回到 activeQ
+    e.unbind("big")
+    assert q.on_node_released(e.get_node("n1"), e) == 1
+    assert q.unschedulable_count() == 0
+    assert q.pop() is small
+
+
+def test_scheduling_queue_equivalence_classes():
+    import random
+    rng = random.Random(1)
+    q = SchedulingQueue(QueueSortFIFO())
+    pods = [Pod(name=f"p{k:03d}", cpu_milli=rng.choice([500, 1000]), memory_mib=1024,
+                creation_time=rng.randrange(20)) for k in range(60)]
+    for pod in pods:
+        q.push(pod)
+
+    # 分组后的出队顺序与单一堆一致
+    first = [q.pop() for _ in range(10)]
+    expected = sorted(pods, key=lambda p: (p.creation_time, p.name))
+    assert first == expected[:10]
+
+    # 整组移入 unschedulableQ 后，activeQ 只剩另一规格
+    failed = q.pop()
+    q.mark_unschedulable(failed, whole_class=True)
+    rest = []
+    while (pod := q.pop()) is not None:
+        rest.append(pod)
+    assert all(p.shape != failed.shape for p in rest)
+    assert q.unschedulable_count() == 1 + sum(1 for p in expected[11:] if p.shape == failed.shape)
+
+
+def test_scheduler_retries_pods_after_completion():
+    nodes = [Node(name="n1", cpu_milli_total=2000, memory_mib_total=4096, gpu_count=1, gpu_share_enabled=False)]
+    pods = [
+        Pod(name="p1", cpu_milli=500, memory_mib=512, num_gpu=1, gpu_milli=1000, creation_time=0, duration=10),
+        Pod(name="p2", cpu_milli=500, memory_mib=512, num_gpu=1, gpu_milli=1000, creation_time=0, duration=10),
+        Pod(name="p3", cpu_milli=500, memory_mib=512, num_gpu=0, gpu_milli=0, creation_time=5, duration=10),
+    ]
+    s = Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), ScoreKubernetes())
+    s.run()
+
+    assert all(p.status == PodStatus.Completed for p in pods)
+    assert pods[0].scheduled_time == 0
+    assert pods[1].scheduled_time == 10  # 等待 p1 完成释放 GPU
+    assert pods[2].scheduled_time == 5
+    assert s.current_time == 20
+
+
+def test_score_cache_keeps_decisions_identical():
+    import random
+    from simulator.plugins.score.binpack import ScoreBinPack
+
+    def build(cache: bool) -> Scheduler:
+        rng = random.Random(5)
+        nodes = [Node(name=f"n{i}", cpu_milli_total=8000, memory_mib_total=16384, gpu_count=2, gpu_share_enabled=True)
+                 for i in range(6)]
+        pods = [Pod(name=f"p{k:03d}", cpu_milli=rng.choice([500, 1000, 3000]), memory_mib=1024,
+                    num_gpu=rng.choice([0, 1]), gpu_milli=rng.choice([300, 1000]),
+                    creation_time=rng.randrange(50), duration=rng.randrange(5, 40)) for k in range(120)]
+        return Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), ScoreBinPack(), seed=0,
+                         cache_scores=cache)
+
+    cached, plain = build(True), build(False)
+    assert plain.score_cache is None
+    cached.run()
+    plain.run()
+    assert [(p.name, p.scheduled_time) for p in cached.all_pods] == [(p.name, p.scheduled_time) for p in plain.all_pods]
+    assert cached.score_cache.hits > 0
+    assert cached.fingerprint() == plain.fingerprint()
+
+
+def test_lazy_arrivals_match_eager():
+    import random
+    import pytest
+
+    def build_pods() -> list:
+        rng = random.Random(3)
+        pods = [Pod(name=f"p{k:03d}", cpu_milli=rng.choice([500, 1000, 3000]), memory_mib=1024,
+                    num_gpu=rng.choice([0, 1]), gpu_milli=1000,
+                    creation_time=rng.randrange(30), duration=rng.randrange(0, 20)) for k in range(80)]
+        return sorted(pods, key=lambda p: p.creation_time)
+
+    def build_nodes() -> list:
+        return [Node(name=f"n{i}", cpu_milli_total=4000, memory_mib_total=8192, gpu_count=1, gpu_share_enabled=False)
+                for i in range(3)]
+
+    eager_pods, lazy_pods = build_pods(), build_pods()
+    eager = Scheduler(build_nodes(), eager_pods, QueueSortFIFO(), FilterResourceFit(), ScoreKubernetes())
+    lazy = Scheduler(build_nodes(), iter(lazy_pods), QueueSortFIFO(), FilterResourceFit(), ScoreKubernetes(),
+                     lazy_arrivals=True)
+    random.seed(0)
+    eager.run()
+    random.seed(0)
+    lazy.run()
+    assert [(p.name, p.scheduled_time, p.bound_node) for p in eager_pods] == \
+           [(p.name, p.scheduled_time, p.bound_node) for p in lazy_pods]
+    assert lazy.arrived_pods_count == len(lazy_pods)
+
+    # 惰性模式要求到达流有序
+    unsorted = [Pod(name="a", cpu_milli=1, memory_mib=1, creation_time=5),
+                Pod(name="b", cpu_milli=1, memory_mib=1, creation_time=1)]
+    s = Scheduler(build_nodes(), unsorted, QueueSortFIFO(), FilterResourceFit(), ScoreKubernetes(), lazy_arrivals=True)
+    with pytest.raises(ValueError):
+        s.run()
+
+
+def test_compact_mode_matches_eager():
+    import random
+    from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+
+    pods = list(synthetic_pods(300, seed=7))
+    assert all(a.creation_time <= b.creation_time for a, b in zip(pods, pods[1:]))
+
+    eager = Scheduler(synthetic_nodes(4, allow_gpu_share=True), pods, QueueSortFIFO(), FilterResourceFit(),
+                      ScoreKubernetes())
+    compact = Scheduler(synthetic_nodes(4, allow_gpu_share=True), synthetic_pods(300, seed=7), QueueSortFIFO(),
+                        FilterResourceFit(), ScoreKubernetes(), lazy_arrivals=True, retain_completed=False)
+    random.seed(0)
+    eager.run()
+    random.seed(0)
+    compact.run()
+
+    # 紧凑模式不保留已完成的 Pod，只保留聚合计数
+    assert compact.etcd.pods == {} and not compact.etcd.completed_pods
+    assert compact.current_time == eager.current_time
+    for attr in ("completed_count", "completed_cpu_milli_time", "completed_gpu_milli_time"):
+        assert getattr(compact.etcd, attr) == getattr(eager.etcd, attr)
+    assert eager.etcd.completed_count == len(eager.etcd.completed_pods) == 300
+
+
+def test_scheduler_binds_gpu_placement_proposed_by_score_plugin():
+    from simulator.plugins.interface import ScorePlugin
+
+    class LastGpu(ScorePlugin):
+        """所有节点同分，提出节点上最空的 GPU（与 best-fit 相反）"""
+        cacheable_scores = True
+
+        def score_nodes(self, pod, nodes, e, state=None):
+            for node in nodes:
+                slots = e.gpu_slots[node.name]
+                gpu_ids = slots.best_fit(pod.gpu_milli, slots.count_fit(pod.gpu_milli))[-pod.num_gpu:]
+                state.propose_gpu_placement(node.name, tuple(gpu_ids))
+            return [0.0] * len(nodes)
+
+    def run(cache_scores):
+        nodes = [Node(name="n", cpu_milli_total=8000, memory_mib_total=8192, gpu_count=4, gpu_share_enabled=True)]
+        pods = [Pod(name=f"p{i}", cpu_milli=100, memory_mib=1, num_gpu=1, gpu_milli=400, creation_time=0, duration=10)
+                for i in range(3)]
+        s = Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), LastGpu(), cache_scores=cache_scores)
+        s.enable_placement_log()
+        s.run(report=False)
+        return [gpus for _, _, _, gpus in s.placement_log]
+
+    # best-fit 会把三个 Pod 依次放在 gpu0, gpu0, gpu1；打分插件的放置优先
+    expected = [((3, 400),), ((2, 400),), ((1, 400),)]
+    assert run(cache_scores=True) == expected
+    assert run(cache_scores=False) == expected
@@ -60,7 +60,120 @@ def test_score_drift():
     scorer = ScoreDrift(typical_pods)
     scorer.pick(p1, [n1, n2], e)
 
-    
+def test_score_drift_batched_matches_scalar():
+    import random
+    import numpy as np
+    from simulator.models.frag import Fragment, TypicalPodMatrix, batch_frag_amount_sum_except_q3
+    from simulator.models.resource import NodeResource
+    from simulator.plugins.interface import ScorePlugin
+
+    rng = random.Random(11)
+    shapes = [(2000, 4096, 1, 1000), (1000, 2048, 1, 460), (4000, 8192, 2, 1000), (500, 1024, 0, 0),
+              (8000, 16384, 1, 810), (1500, 2048, 1, 230), (3000, 4096, 8, 1000)]
+    pods = [Pod(name=f"t{i}", cpu_milli=c, memory_mib=m, num_gpu=g, gpu_milli=p)
+            for i, (c, m, g, p) in enumerate(rng.choice(shapes) for _ in range(60))]
+    typical_pods = get_target_pod_list_from_pods(pods)
+
+    e = EtcdMock()
+    for i in range(16):
+        e.add_node(Node(name=f"n{i}", cpu_milli_total=32000, memory_mib_total=262144,
+                        gpu_count=rng.choice([0, 1, 2, 4, 8]), gpu_share_enabled=True))
+    batched = ScoreDrift(typical_pods)
+    scalar = ScoreDrift(typical_pods, batched=False)
+    for k in range(80):
+        c, m, g, p = rng.choice(shapes)
+        pod = Pod(name=f"p{k}", cpu_milli=c, memory_mib=m, num_gpu=g, gpu_milli=p)
+        e.add_pod(pod)
+        feas = e.feasible_nodes(pod.name)
+        if not feas:
+            continue
+        # 碎片量逐位一致
+        node_res = [NodeResource(n) for n in feas]
+        gpus = np.zeros((len(feas), 8), dtype=np.int64)
+        for row, nr in enumerate(node_res):
+            gpus[row, :nr.total_gpus] = nr.free_gpus_points_list
+        frag = batch_frag_amount_sum_except_q3(np.array([nr.free_cpu for nr in node_res]), gpus,
+                                               TypicalPodMatrix(typical_pods))
+        assert frag.tolist() == [Fragment(nr, typical_pods).get_frag_amount_sum_except_q3() for nr in node_res]
+        # 打分逐位一致
+        assert batched.score_nodes(pod, feas, e) == ScorePlugin.score_nodes(scalar, pod, feas, e)
+        e.bind(pod.name, rng.choice(feas).name)
+
+def test_score_drift_frag_cache():
+    e = EtcdMock()
+    # 两个资源形状完全相同的节点共享同一个缓存条目
+    n1 = Node(name="n1", cpu_milli_total=8000, memory_mib_total=16384, gpu_count=2, gpu_share_enabled=True)
+    n2 = Node(name="n2", cpu_milli_total=8000, memory_mib_total=16384, gpu_count=2, gpu_share_enabled=True)
+    e.add_node(n1)
+    e.add_node(n2)
+    p1 = Pod(name="p1", cpu_milli=1000, memory_mib=1024, num_gpu=1, gpu_milli=300)
+    p2 = Pod(name="p2", cpu_milli=2000, memory_mib=1024, num_gpu=1, gpu_milli=1000)
+    e.add_pod(p1)
+
+    typical_pods = get_target_pod_list_from_pods([p1, p2])
+    cached = ScoreDrift(typical_pods)
+    uncached = ScoreDrift(typical_pods, frag_cache_size=0)
+
+    expected = uncached.score_nodes(p1, [n1, n2], e)
+    assert cached.score_nodes(p1, [n1, n2], e) == expected
+    assert cached.frag_cache_info()["hits"] == 0
+    # 第二轮打分（节点状态未变）全部命中
+    assert cached.score_nodes(p1, [n1, n2], e) == expected
+    info = cached.frag_cache_info()
+    assert info["hits"] > 0 and info["size"] > 0
+    # 未开启缓存时不计命中 / 未命中
+    assert uncached.frag_cache_info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 0}
+
+    # 标量路径同样命中缓存
+    hits = cached.frag_cache_hits
+    cached.score(p1, n1, e)
+    assert cached.frag_cache_hits > hits
+
+    # typical_pods 变化后缓存失效
+    cached.typical_pods = get_target_pod_list_from_pods([p2])
+    assert cached.frag_cache_info()["size"] == 0
+
+def test_score_drift_searches_multi_gpu_combinations():
+    import itertools
+    from simulator.models.resource import NodeResource, PodResource
+
+    typical_pods = get_target_pod_list_from_pods([
+        Pod(name="a", cpu_milli=1000, memory_mib=1024, num_gpu=1, gpu_milli=500),
+        Pod(name="b", cpu_milli=1000, memory_mib=1024, num_gpu=1, gpu_milli=700),
+        Pod(name="c", cpu_milli=1000, memory_mib=1024, num_gpu=2, gpu_milli=300),
+    ])
+    e = EtcdMock()
+    node = Node(name="n", cpu_milli_total=32000, memory_mib_total=65536, gpu_count=6, gpu_share_enabled=True)
+    e.add_node(node)
+    for i, milli in enumerate([500, 300, 700, 0, 300, 0]):
+        if milli:
+            e.add_pod(Pod(name=f"r{i}", cpu_milli=100, memory_mib=1, num_gpu=1, gpu_milli=milli))
+            e.bind(f"r{i}", "n", gpu_ids=(i,))
+    pod = Pod(name="p", cpu_milli=1000, memory_mib=1024, num_gpu=2, gpu_milli=300)
+    e.add_pod(pod)
+
+    scorer = ScoreDrift(typical_pods, frag_cache_size=0)
+    node_res, pod_res = NodeResource(node), PodResource(pod)
+    base = scorer.node_gpu_share_frag_amount_score(node_res)
+    # 穷举全部 GPU 组合得到的最高分
+    best = 0
+    for gpu_ids in itertools.combinations(node_res.eligible_gpus(pod_res.gpu_points), 2):
+        new_res = node_res.copy()
+        new_res.free_cpu -= pod_res.cpu_request
+        new_res.free_memory -= pod_res.memory_request
+        new_res.free_gpus_points_list = node_res.free_gpus_points_list.copy()
+        for gid in gpu_ids:
+            new_res.free_gpus_points_list[gid] -= pod_res.gpu_points
+        best = max(best, int(scorer.sigmoid((base - scorer.node_gpu_share_frag_amount_score(new_res)) / 1000) * 1000))
 
+    score, gpu_ids = scorer.calculate_gpu_share_frag_score(node_res, pod_res)
+    assert score == best and len(gpu_ids) == 2
+    assert scorer.batch_gpu_share_frag_scores([node_res], pod_res) == [(score, gpu_ids)]
 
-    
\ No newline at end of file
+    # 选定的放置记入 CycleState，bind 时使用
+    from simulator.plugins.interface import CycleState
+    state = CycleState(pod)
+    scorer.score_nodes(pod, [node], e, state)
+    assert state.gpu_placements == {"n": gpu_ids}
+    e.bind("p", "n", gpu_ids=state.gpu_placements["n"])
+    assert sorted(pod.gpu_alloc) == list(gpu_ids)
@@ -0,0 +1,53 @@
+from simulator.core.scheduler import Scheduler
+from simulator.core.sharded import ShardedScheduler
+from simulator.models.resource import get_target_pod_list_from_pods
+from simulator.models.typical_pods import TypicalPodWindow
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.plugins.score.drift import ScoreDrift
+from simulator.plugins.post_filter.preemption import DefaultPreemption
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+import pytest
+
+def workload():
+    return synthetic_nodes(9, allow_gpu_share=True, seed=7), list(synthetic_pods(300, seed=7, mean_interarrival=1.0))
+
+
+@pytest.mark.parametrize("score", ["k8s", "drift", "drift-online"])
+def test_sharded_scheduler_matches_single_process(score):
+    def score_plugin(pods):
+        if score == "k8s":
+            return ScoreKubernetes()
+        # 在线模式：到达转发给各分片，分片上的 typical pods 与单进程同步更新
+        window = TypicalPodWindow(size=50, refresh_every=20, top_k=4) if score == "drift-online" else None
+        return ScoreDrift(get_target_pod_list_from_pods(pods), window=window)
+
+    nodes, pods = workload()
+    single = Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), score_plugin(pods), seed=3)
+    single.run(report=False)
+
+    nodes, pods = workload()
+    with ShardedScheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), score_plugin(pods),
+                          workers=3, seed=3) as sharded:
+        metrics = sharded.run(report=False)
+    assert metrics.completed_pods == 300
+    assert sharded.fingerprint() == single.fingerprint()
+
+
+def test_sharded_scheduler_with_probes_completes_all_pods():
+    def run(probes):
+        nodes, pods = workload()
+        with ShardedScheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), ScoreKubernetes(),
+                              workers=3, probes=probes, seed=0) as sharded:
+            metrics = sharded.run(report=False)
+        assert metrics.completed_pods == 300
+        return sharded.shard_requests
+
+    # 采样只询问部分分片（没有可行节点时才询问其余分片）
+    assert run(probes=1) < run(probes=None)
+
+    nodes, pods = workload()
+    with pytest.raises(ValueError):
+        ShardedScheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), ScoreKubernetes(),
+                         post_filter_plugin=DefaultPreemption())
@@ -0,0 +1,56 @@
+from simulator.core.scheduler import Scheduler
+from simulator.experiments.whatif import run_branches
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.queue_sort.sjf import QueueSortShortJobFirst
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.binpack import ScoreBinPack
+from simulator.plugins.score.k8s import ScoreKubernetes
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+
+def build(lazy: bool = False) -> Scheduler:
+    pods = list(synthetic_pods(300, seed=5, mean_interarrival=3.0))
+    s = Scheduler(synthetic_nodes(6, allow_gpu_share=True, seed=1), iter(pods) if lazy else pods, QueueSortFIFO(),
+                  FilterResourceFit(), ScoreKubernetes(), vectorized=True, lazy_arrivals=lazy, seed=7)
+    s.enable_placement_log()
+    return s
+
+def finish_with_binpack_sjf(s: Scheduler):
+    s.replace_plugins(queue_sorter=QueueSortShortJobFirst(), score_plugin=ScoreBinPack())
+    return s.run(report=False).makespan, s.fingerprint()
+
+
+def test_snapshot_restore_continues_identically(tmp_path):
+    full = build(lazy=True)
+    full.run(report=False)
+
+    warm = build(lazy=True)
+    warm.run(report=False, until=400)
+    assert 0 < warm.placements_count < full.placements_count
+    path = str(tmp_path / "warm.pkl")
+    warm.save_snapshot(path)
+
+    branches = warm.fork(2) + [Scheduler.load_snapshot(path)]
+    for branch in branches:
+        branch.run(report=False)
+        assert branch.placement_log == full.placement_log
+        assert branch.fingerprint() == full.fingerprint()
+        # 分支之间、分支与原对象之间不共享状态
+        assert branch.etcd.nodes["syn-node-00000"] is branch.nodes[0] is not warm.nodes[0]
+    assert warm.placements_count < full.placements_count
+
+
+def test_what_if_branches_across_processes():
+    warm = build()
+    warm.run(report=False, until=400)
+    snapshot = warm.snapshot()
+
+    expected_branch = Scheduler.restore(snapshot)
+    expected = finish_with_binpack_sjf(expected_branch)
+    results = run_branches(snapshot, [finish_with_binpack_sjf, finish_with_binpack_sjf], max_workers=2)
+    assert results == [expected, expected]
+
+    # 更换策略后的结果与继续原策略不同，但共享相同的前缀
+    same_policy = Scheduler.restore(snapshot)
+    same_policy.run(report=False)
+    assert same_policy.placement_log[:warm.placements_count] == expected_branch.placement_log[:warm.placements_count]
+    assert same_policy.etcd.completed_count == expected_branch.etcd.completed_count == 300
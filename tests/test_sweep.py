@@ -0,0 +1,20 @@
+from simulator.experiments.sweep import grid, run_config, run_sweep, load_checkpoint
+
+def test_sweep_runs_in_parallel_and_resumes(tmp_path):
+    checkpoint = str(tmp_path / "sweep.jsonl")
+    configs = grid(["fifo", "sjf"], ["k8s", "binpack"], [4], [60], [True], [0, 1], trace="synthetic")
+    assert len(configs) == 8
+
+    results = run_sweep(configs[:5], max_workers=2, checkpoint=checkpoint)
+    assert [r.config for r in results] == configs[:5]
+    assert all(r.completed_pods == r.pods == 60 for r in results)
+    # 子进程中的结果与串行运行一致
+    serial = run_config(configs[3])
+    assert (serial.makespan, serial.cpu_utilization) == (results[3].makespan, results[3].cpu_utilization)
+
+    # 恢复：检查点中已有的配置不再运行
+    rerun = []
+    resumed = run_sweep(configs, max_workers=2, checkpoint=checkpoint, on_result=rerun.append)
+    assert sorted(r.config.key() for r in rerun) == sorted(c.key() for c in configs[5:])
+    assert resumed[:5] == results
+    assert len(load_checkpoint(checkpoint)) == 8
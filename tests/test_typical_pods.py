@@ -0,0 +1,79 @@
+from simulator.core.scheduler import Scheduler
+from simulator.models.frag import Fragment
+from simulator.models.pod import Pod
+from simulator.models.resource import NodeResource, get_target_pod_list_from_pods
+from simulator.models.typical_pods import TypicalPodWindow, compress_target_pods, quantize_shape
+from simulator.plugins.chain import ScoreChain
+from simulator.plugins.queue_sort.fifo import QueueSortFIFO
+from simulator.plugins.filter.resource_fit import FilterResourceFit
+from simulator.plugins.score.binpack import ScoreBinPack
+from simulator.plugins.score.drift import ScoreDrift
+from simulator.utils.synthetic import synthetic_nodes, synthetic_pods
+import pytest
+
+def shapes(target_pods):
+    return {(t.target_pod_resource.cpu_request, t.target_pod_resource.gpu_count,
+             t.target_pod_resource.gpu_points): t.percentage for t in target_pods}
+
+
+def test_quantize_shape_rounds_up():
+    assert quantize_shape(3152, 1, 810, cpu_quantum=1000, gpu_quantum=100) == (4000, 1, 900)
+    assert quantize_shape(4000, 1, 950, cpu_quantum=1000, gpu_quantum=200) == (4000, 1, 1000)
+    assert quantize_shape(0, 0, 0, cpu_quantum=1000, gpu_quantum=100) == (0, 0, 0)
+    assert quantize_shape(3152, 8, 1000, cpu_quantum=1000, gpu_quantum=300) == (4000, 8, 1000)
+
+
+def test_compress_without_limits_keeps_fragment_amounts():
+    pods = list(synthetic_pods(300, seed=5))
+    full = get_target_pod_list_from_pods(pods)
+    compressed = compress_target_pods(full)
+    assert sum(t.percentage for t in compressed) == pytest.approx(1.0)
+    for node in synthetic_nodes(5, allow_gpu_share=True, seed=5):
+        expected = Fragment(NodeResource(node), full).get_frag_amount_sum_except_q3()
+        assert Fragment(NodeResource(node), compressed).get_frag_amount_sum_except_q3() == pytest.approx(expected)
+
+
+def test_compress_top_k_keeps_every_gpu_class():
+    pods = ([Pod(name=f"s{i}", cpu_milli=1000 + i % 5 * 100, memory_mib=1, num_gpu=1, gpu_milli=200 + i % 5 * 100)
+             for i in range(90)]
+            + [Pod(name=f"w{i}", cpu_milli=8000, memory_mib=1, num_gpu=1, gpu_milli=1000) for i in range(9)]
+            + [Pod(name="big", cpu_milli=64000, memory_mib=1, num_gpu=8, gpu_milli=1000)])
+    compressed = shapes(compress_target_pods(get_target_pod_list_from_pods(pods), top_k=3))
+    # 罕见的 8 卡规格仍有代表；被省略的部分 GPU 规格并入同类最近的代表，总占比不变
+    assert (64000, 8, 1000) in compressed and (8000, 1, 1000) in compressed
+    assert len(compressed) == 3
+    assert compressed[(64000, 8, 1000)] == pytest.approx(0.01)
+    assert sum(compressed.values()) == pytest.approx(1.0)
+
+    # mass：代表规格覆盖到该占比即停止（每个 GPU 类至少一个）
+    assert len(compress_target_pods(get_target_pod_list_from_pods(pods), mass=0.2)) == 3
+    assert len(compress_target_pods(get_target_pod_list_from_pods(pods), mass=0.5)) == 5  # 0.28 + 2 * 0.18
+    with pytest.raises(ValueError):
+        compress_target_pods(get_target_pod_list_from_pods(pods), mass=0)
+
+
+def test_window_tracks_recent_arrivals():
+    window = TypicalPodWindow(size=4, refresh_every=3)
+    small = [Pod(name=f"a{i}", cpu_milli=1000, memory_mib=1, num_gpu=1, gpu_milli=500) for i in range(4)]
+    large = [Pod(name=f"b{i}", cpu_milli=4000, memory_mib=1, num_gpu=2, gpu_milli=1000) for i in range(3)]
+    assert [window.observe(pod) for pod in small] == [False, False, True, False]
+    assert shapes(window.target_pods()) == {(1000, 1, 500): 1.0}
+    window.observe_all(large)
+    assert len(window) == 4
+    assert shapes(window.target_pods()) == {(1000, 1, 500): 0.25, (4000, 2, 1000): 0.75}
+
+
+def test_score_drift_online_refreshes_typical_pods():
+    nodes = synthetic_nodes(8, allow_gpu_share=True, seed=6)
+    pods = list(synthetic_pods(200, seed=6, mean_interarrival=2.0))
+    drift = ScoreDrift(get_target_pod_list_from_pods(pods), window=TypicalPodWindow(size=50, refresh_every=25, top_k=4))
+    s = Scheduler(nodes, pods, QueueSortFIFO(), FilterResourceFit(), ScoreChain([(drift, 1.0), (ScoreBinPack(), 1.0)]),
+                  seed=0)
+    metrics = s.run(report=False)
+    assert metrics.completed_pods == 200
+    assert drift.typical_refreshes == 8
+    assert drift.cache_epoch() == 8
+    assert len(drift.typical_pods) <= 4
+
+    # 不开启在线模式时调度器不调用到达钩子
+    assert not ScoreChain([(ScoreDrift(get_target_pod_list_from_pods(pods)), 1.0)]).observes_arrivals